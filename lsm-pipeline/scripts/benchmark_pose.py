@@ -10,6 +10,7 @@ Usage:
     python scripts/benchmark_pose.py --video path/to/video.mp4
     python scripts/benchmark_pose.py --video-dir data/benchmark_videos/
     python scripts/benchmark_pose.py --demo  # synthetic test
+    python scripts/benchmark_pose.py --video clip.mp4 --mode both  # serial vs. pipelined
 
 Output:
     - Console report with per-model metrics
@@ -28,7 +29,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import numpy as np
 
 
-def run_mediapipe_benchmark(video_path: str, complexity: int = 2, max_frames: int = 300):
+def run_mediapipe_benchmark(
+    video_path: str,
+    complexity: int = 2,
+    max_frames: int = 300,
+    pipelined: bool = False,
+    resize: int | None = None,
+):
     """Run MediaPipe Holistic benchmark."""
     try:
         from src.perception.mediapipe_extractor import MediaPipeExtractor
@@ -36,12 +43,18 @@ def run_mediapipe_benchmark(video_path: str, complexity: int = 2, max_frames: in
         print(f"  ⚠️  Skipping MediaPipe: {e}")
         return None
 
-    print(f"  Running MediaPipe Holistic (complexity={complexity})...")
+    mode = "pipelined" if pipelined else "serial"
+    print(f"  Running MediaPipe Holistic (complexity={complexity}, {mode})...")
 
     with MediaPipeExtractor(model_complexity=complexity) as extractor:
-        result = extractor.benchmark_video(video_path, max_frames=max_frames)
+        result = extractor.benchmark_video(
+            video_path, max_frames=max_frames, pipelined=pipelined, resize=resize
+        )
 
-    print(f"    → {result.fps:.1f} fps, hands: {result.hand_keypoint_completeness:.1f}%")
+    print(f"    → {result.throughput_fps:.1f} fps end-to-end "
+          f"(decode {result.mean_decode_ms:.1f}ms, convert {result.mean_convert_ms:.1f}ms, "
+          f"inference {result.mean_inference_ms:.1f}ms), "
+          f"hands: {result.hand_keypoint_completeness:.1f}%")
     return result
 
 
@@ -54,7 +67,7 @@ def run_synthetic_benchmark():
     print("   Testing hand feature extraction pipeline...\n")
 
     from src.perception.hand_features import (
-        extract_hand_features, match_cm, quantize_flexion
+        extract_hand_features, extract_hand_features_batch, match_cm, quantize_flexion
     )
 
     # ── Test 1: Flexion quantization ────────────────────────────────────
@@ -110,6 +123,48 @@ def run_synthetic_benchmark():
             print(f"       CM#{cm_id:3d} ({cm.cruz_aldrete_notation:15s}) "
                   f"score={score:.3f} {cm.example_sign} {marker}")
 
+    # ── Test 4: Batch feature extraction ────────────────────────────────
+    print("\n  4. Batch feature extraction (per-frame vs. vectorized):")
+    sequence = _generate_sequence([flat_hand, fist, pointing], n_frames=3000)
+
+    start = time.perf_counter()
+    per_frame = [extract_hand_features([tuple(p) for p in frame]) for frame in sequence.tolist()]
+    per_frame_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = extract_hand_features_batch(sequence)
+    batch_s = time.perf_counter() - start
+
+    mismatches = sum(batch.frame(t) != f for t, f in enumerate(per_frame))
+    print(f"     {len(sequence)} frames: per-frame {len(sequence) / per_frame_s:,.0f} fps, "
+          f"batch {len(sequence) / batch_s:,.0f} fps "
+          f"({per_frame_s / batch_s:.0f}x)")
+    print(f"     Mismatched frames: {mismatches}")
+
+    # ── Test 5: Compiled CM matcher ─────────────────────────────────────
+    print("\n  5. Compiled CM matcher (lookup table vs. match_cm):")
+    from src.perception.cm_matcher import N_FEATURE_CODES, get_cm_matcher
+
+    start = time.perf_counter()
+    matcher = get_cm_matcher()
+    print(f"     Compiled {N_FEATURE_CODES:,} feature codes in "
+          f"{(time.perf_counter() - start) * 1000:.0f} ms")
+    print(f"     Mismatched codes (every 37th): "
+          f"{matcher.validate(range(0, N_FEATURE_CODES, 37))}")
+
+    start = time.perf_counter()
+    expected = [match_cm(f, top_k=5) for f in per_frame]
+    match_cm_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cm_ids, scores = matcher.rank_batch(batch, top_k=5)
+    rank_s = time.perf_counter() - start
+
+    ranked = [list(zip(ids, s)) for ids, s in zip(cm_ids.tolist(), scores.tolist())]
+    print(f"     {len(sequence)} frames: match_cm {len(sequence) / match_cm_s:,.0f} fps, "
+          f"rank_batch {len(sequence) / rank_s:,.0f} fps, "
+          f"mismatched frames: {sum(r != e for r, e in zip(ranked, expected))}")
+
     print("\n  ✅ Synthetic benchmark complete!")
     return True
 
@@ -214,6 +269,15 @@ def _generate_pointing() -> list:
     return landmarks
 
 
+def _generate_sequence(poses: list, n_frames: int, seed: int = 0) -> np.ndarray:
+    """(n_frames, 21, 3) float32 sequence of the given poses with landmark jitter."""
+    rng = np.random.default_rng(seed)
+    poses = np.array(poses, dtype=np.float32)
+    frames = poses[rng.integers(0, len(poses), n_frames)]
+    jitter = rng.normal(scale=0.005, size=frames.shape).astype(np.float32)
+    return frames + jitter
+
+
 def generate_report(results: list, output_path: Path):
     """Generate JSON benchmark report."""
     report = {
@@ -233,6 +297,10 @@ def generate_report(results: list, output_path: Path):
             "mean_inference_ms": round(r.mean_inference_ms, 2),
             "p95_inference_ms": round(r.p95_inference_ms, 2),
             "fps": round(r.fps, 1),
+            "pipelined": r.pipelined,
+            "mean_decode_ms": round(r.mean_decode_ms, 2),
+            "mean_convert_ms": round(r.mean_convert_ms, 2),
+            "throughput_fps": round(r.throughput_fps, 1),
             "hand_keypoint_completeness": round(r.hand_keypoint_completeness, 2),
             "body_keypoint_completeness": round(r.body_keypoint_completeness, 2),
             "face_keypoint_completeness": round(r.face_keypoint_completeness, 2),
@@ -255,6 +323,10 @@ def main():
     parser.add_argument("--max-frames", type=int, default=300, help="Max frames per video")
     parser.add_argument("--demo", action="store_true", help="Run synthetic demo (no video needed)")
     parser.add_argument("--output", type=str, default=None, help="Output JSON path")
+    parser.add_argument("--mode", choices=["serial", "pipelined", "both"], default="serial",
+                        help="Decode/inference scheduling (both = compare)")
+    parser.add_argument("--resize", type=int, default=None,
+                        help="Shrink frames to this longer side before inference")
     args = parser.parse_args()
 
     print("═" * 60)
@@ -293,11 +365,15 @@ def main():
         print(f"{'─'*60}")
 
         # MediaPipe at different complexity levels
+        modes = [False, True] if args.mode == "both" else [args.mode == "pipelined"]
         for complexity in [1, 2]:
-            result = run_mediapipe_benchmark(str(video), complexity, args.max_frames)
-            if result:
-                all_results.append(result)
-                print(result.summary())
+            for pipelined in modes:
+                result = run_mediapipe_benchmark(
+                    str(video), complexity, args.max_frames, pipelined, args.resize
+                )
+                if result:
+                    all_results.append(result)
+                    print(result.summary())
 
     # Generate report
     if all_results:
@@ -312,10 +388,11 @@ def main():
         print(f"\n{'═'*60}")
         print("  COMPARISON SUMMARY")
         print(f"{'═'*60}")
-        print(f"{'Model':<40} {'FPS':>6} {'Hands%':>7} {'iOS':>4}")
-        print(f"{'─'*40} {'─'*6} {'─'*7} {'─'*4}")
+        print(f"{'Model':<51} {'FPS':>6} {'E2E':>6} {'Hands%':>7} {'iOS':>4}")
+        print(f"{'─'*51} {'─'*6} {'─'*6} {'─'*7} {'─'*4}")
         for r in sorted(all_results, key=lambda x: x.hand_keypoint_completeness, reverse=True):
-            print(f"{r.model_name:<40} {r.fps:>6.1f} {r.hand_keypoint_completeness:>6.1f}% "
+            print(f"{r.model_name:<51} {r.fps:>6.1f} {r.throughput_fps:>6.1f} "
+                  f"{r.hand_keypoint_completeness:>6.1f}% "
                   f"{'✅' if r.ios_compatible else '❌':>4}")
 
 
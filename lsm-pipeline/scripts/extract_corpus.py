@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+Corpus Keypoint Extraction Script
+
+Runs MediaPipe Holistic over every local video of the sources listed in
+data/video_source_inventory.json, spread across a process pool (one
+Holistic instance per worker), and writes one keypoint file per video.
+
+Where the videos are:
+    The inventory catalogs sources, not files. Each source's videos are
+    looked up under <corpus-root>/<source slug>/ (e.g. data/corpus/dielseme/),
+    or under the entry's "local_path" if it has one. Sources without
+    local videos are listed and skipped. --video-dir adds ad-hoc folders.
+
+Resuming:
+    <output>/manifest.jsonl gets one line per finished video (status,
+    frame counts, stage timings, error). A rerun skips videos whose
+    latest entry is "done" and whose output still exists, so an
+    interrupted run picks up where it stopped. Failed videos are retried
+    unless --skip-failed is given. Videos in flight when a worker
+    process dies outright (segfault, OOM kill) are recorded as failed
+    and the run carries on with a fresh pool.
+
+Usage:
+    python scripts/extract_corpus.py --list                 # what would run
+    python scripts/extract_corpus.py --workers 8
+    python scripts/extract_corpus.py --video-dir clips/ --max-frames 300
+
+Output (per video, <output>/<source>/<relative path>.npz, e.g. clips/a.mp4.npz):
+    body (T, 33, 4), hands (T, 2, 21, 3), face (T, 478, 3)   float32
+    body_present (T,), hand_present (T, 2), face_count (T,), frame_index (T,), confidence (T,)
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_INVENTORY = PROJECT_ROOT / "data" / "video_source_inventory.json"
+DEFAULT_CORPUS_ROOT = PROJECT_ROOT / "data" / "corpus"
+DEFAULT_OUTPUT = PROJECT_ROOT / "data" / "keypoints"
+
+VIDEO_SUFFIXES = {".mp4", ".mov", ".avi", ".mkv", ".webm"}
+MANIFEST_NAME = "manifest.jsonl"
+
+
+# ── Video Discovery ──────────────────────────────────────────────────────────
+
+def source_slug(name: str) -> str:
+    """'Spread the Sign (LSM)' → 'spread_the_sign_lsm'."""
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "_", ascii_name.lower()).strip("_")
+
+
+def _find_videos(root: Path) -> list[Path]:
+    return sorted(p for p in root.rglob("*") if p.suffix.lower() in VIDEO_SUFFIXES and p.is_file())
+
+
+def discover_videos(
+    inventory_path: Path,
+    corpus_root: Path,
+    extra_dirs: list[str],
+) -> tuple[list[dict], list[str]]:
+    """
+    Collect the videos to process.
+
+    Keys keep the video's extension (clips/a.mp4 and clips/a.mov are two
+    videos), and each --video-dir gets a slug of its own (a second
+    "clips" folder becomes "clips_2").
+
+    Returns:
+        (jobs, missing) — jobs are {key, source, path, output_rel, size}
+        dicts; missing lists inventory sources with no local videos
+
+    Raises:
+        ValueError: if two videos map to the same key (e.g. two
+            inventory sources with the same slug)
+    """
+    roots = []
+    if inventory_path.exists():
+        with open(inventory_path) as f:
+            inventory = json.load(f)
+        for source in inventory.get("sources", []):
+            slug = source_slug(source["name"])
+            local = source.get("local_path")
+            root = (PROJECT_ROOT / local) if local else (corpus_root / slug)
+            roots.append((slug, root, source["name"]))
+    slugs = {slug for slug, _, _ in roots}
+    for extra in extra_dirs:
+        path = Path(extra)
+        base = source_slug(path.resolve().name) or "videos"
+        slug, n = base, 1
+        while slug in slugs:
+            n += 1
+            slug = f"{base}_{n}"
+        slugs.add(slug)
+        roots.append((slug, path, str(path)))
+
+    jobs, missing, paths = [], [], {}
+    for slug, root, label in roots:
+        videos = _find_videos(root) if root.is_dir() else []
+        if not videos:
+            missing.append(f"{label} ({root})")
+            continue
+        for video in videos:
+            key = f"{slug}/{video.relative_to(root).as_posix()}"
+            if key in paths:
+                raise ValueError(f"Duplicate video key {key!r}: {paths[key]} and {video}")
+            paths[key] = video
+            jobs.append({
+                "key": key,
+                "source": slug,
+                "path": str(video),
+                "output_rel": f"{key}.npz",
+                "size": video.stat().st_size,
+            })
+    return jobs, missing
+
+
+# ── Manifest ─────────────────────────────────────────────────────────────────
+
+def load_manifest(path: Path) -> dict[str, dict]:
+    """Latest entry per video key. A torn last line (interrupted write) is ignored."""
+    entries = {}
+    if not path.exists():
+        return entries
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            entries[entry["key"]] = entry
+    return entries
+
+
+def open_manifest(path: Path):
+    """
+    Open the manifest for appending. If the last line was torn, end it
+    first so the next entry starts on a line of its own.
+    """
+    torn = False
+    if path.exists() and path.stat().st_size > 0:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            torn = f.read(1) != b"\n"
+    manifest = open(path, "a")
+    if torn:
+        manifest.write("\n")
+    return manifest
+
+
+def pending_jobs(
+    jobs: list[dict], manifest: dict[str, dict], output_dir: Path, skip_failed: bool
+) -> tuple[list[dict], int, int]:
+    """Jobs still to run → (pending, already_done, skipped_failed)."""
+    pending, done, failed = [], 0, 0
+    for job in jobs:
+        entry = manifest.get(job["key"])
+        if entry and entry["status"] == "done" and entry.get("size") == job["size"] \
+                and (output_dir / job["output_rel"]).exists():
+            done += 1
+        elif entry and entry["status"] == "failed" and skip_failed:
+            failed += 1
+        else:
+            pending.append(job)
+    return pending, done, failed
+
+
+# ── Worker ───────────────────────────────────────────────────────────────────
+
+# One extractor per worker process, created on its first video
+_extractor = None
+_worker_options: dict = {}
+
+
+def _init_worker(options: dict):
+    global _worker_options
+    _worker_options = options
+    # One process per core: keep OpenCV from adding its own thread pool
+    try:
+        import cv2
+        cv2.setNumThreads(1)
+    except ImportError:
+        pass
+
+
+def extract_video(job: dict) -> dict:
+    """Extract one video; returns its manifest entry (never raises)."""
+    global _extractor
+    options = _worker_options
+    entry = {
+        "key": job["key"],
+        "source": job["source"],
+        "path": job["path"],
+        "output": job["output_rel"],
+        "size": job["size"],
+        "worker": os.getpid(),
+    }
+    start = time.perf_counter()
+    try:
+        from src.perception.mediapipe_extractor import MediaPipeExtractor
+
+        if _extractor is None:
+            _extractor = MediaPipeExtractor(
+                model_complexity=options["complexity"],
+                refine_face_landmarks=options["refine_face"],
+            )
+        else:
+            _extractor.reset()
+
+        keypoints = _KeypointArrays()
+        decode_ms = convert_ms = inference_ms = 0.0
+        # One KeypointResult refilled per frame; append() copies it out
+        for result in _extractor.process_video(
+            job["path"],
+            max_frames=options["max_frames"],
+            skip_frames=options["skip_frames"],
+            reuse_result=True,
+            pipelined=options["pipelined"],
+            resize=options["resize"],
+        ):
+            keypoints.append(result)
+            decode_ms += result.decode_time_ms
+            convert_ms += result.convert_time_ms
+            inference_ms += result.inference_time_ms
+        arrays = keypoints.arrays()
+        _save_keypoints(Path(options["output_dir"]) / job["output_rel"], arrays,
+                        compress=options["compress"])
+
+        entry.update(
+            status="done",
+            frames=len(keypoints),
+            hand_frames=int(arrays["hand_present"].any(axis=1).sum()),
+            decode_ms=round(decode_ms, 1),
+            convert_ms=round(convert_ms, 1),
+            inference_ms=round(inference_ms, 1),
+            error=None,
+        )
+    except Exception as e:
+        entry.update(status="failed", frames=0, error=f"{type(e).__name__}: {e}")
+
+    entry["wall_s"] = round(time.perf_counter() - start, 3)
+    entry["fps"] = round(entry["frames"] / entry["wall_s"], 2) if entry["wall_s"] > 0 else 0.0
+    entry["finished_at"] = datetime.now().isoformat(timespec="seconds")
+    return entry
+
+
+def _failed_entry(job: dict, error: str) -> dict:
+    """Manifest entry for a job whose worker never reported back."""
+    return {
+        "key": job["key"],
+        "source": job["source"],
+        "path": job["path"],
+        "output": job["output_rel"],
+        "size": job["size"],
+        "worker": None,
+        "status": "failed",
+        "frames": 0,
+        "error": error,
+        "wall_s": 0.0,
+        "fps": 0.0,
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def run_jobs(
+    jobs: list[dict],
+    workers: int,
+    options: dict,
+    fn: Callable[[dict], dict] = extract_video,
+) -> Iterator[dict]:
+    """
+    Run fn(job) for every job on a spawn process pool; yield the manifest
+    entries as they finish.
+
+    At most `workers` jobs are submitted at once, so the jobs in flight
+    are known when a worker dies outright and the pool breaks: each gets
+    a "failed" entry, and the remaining jobs continue on a fresh pool.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    todo = deque(jobs)
+    while todo:
+        in_flight = {}
+        with ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_worker,
+                                 initargs=(options,)) as pool:
+            try:
+                while todo or in_flight:
+                    while todo and len(in_flight) < workers:
+                        future = pool.submit(fn, todo[0])
+                        in_flight[future] = todo.popleft()
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        entry = future.result()
+                        del in_flight[future]
+                        yield entry
+            except BrokenProcessPool as e:
+                for job in in_flight.values():
+                    yield _failed_entry(job, f"BrokenProcessPool: {e}")
+
+
+# Per-frame shape and dtype of each array in a keypoint file
+KEYPOINT_FIELDS = {
+    "body": ((33, 4), np.float32),
+    "hands": ((2, 21, 3), np.float32),
+    "face": ((478, 3), np.float32),
+    "body_present": ((), bool),
+    "hand_present": ((2,), bool),
+    "face_count": ((), np.int16),
+    "frame_index": ((), np.int32),
+    "confidence": ((), np.float32),
+}
+
+
+class _KeypointArrays:
+    """
+    One video's keypoints, copied frame by frame out of a reused
+    KeypointResult. Capacity doubles as frames come in.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self._n = 0
+        self._data = {
+            name: np.zeros((capacity, *shape), dtype=dtype)
+            for name, (shape, dtype) in KEYPOINT_FIELDS.items()
+        }
+
+    def __len__(self) -> int:
+        return self._n
+
+    def append(self, result):
+        """Copy one KeypointResult's buffers in."""
+        if self._n == len(self._data["body"]):
+            for name, array in self._data.items():
+                grown = np.zeros((2 * len(array), *array.shape[1:]), dtype=array.dtype)
+                grown[:self._n] = array
+                self._data[name] = grown
+        i = self._n
+        for name in KEYPOINT_FIELDS:
+            self._data[name][i] = getattr(result, name)
+        self._n += 1
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        """(T, ...) views of the frames appended so far."""
+        return {name: array[:self._n] for name, array in self._data.items()}
+
+
+def _save_keypoints(path: Path, arrays: dict[str, np.ndarray], compress: bool = False):
+    """Write a video's (T, ...) keypoint arrays atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        (np.savez_compressed if compress else np.savez)(f, **arrays)
+    os.replace(tmp, path)
+
+
+# ── Main ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Corpus keypoint extraction for LSM Pipeline")
+    parser.add_argument("--inventory", type=str, default=str(DEFAULT_INVENTORY),
+                        help="Video source inventory JSON")
+    parser.add_argument("--corpus-root", type=str, default=str(DEFAULT_CORPUS_ROOT),
+                        help="Folder holding one subfolder of videos per source")
+    parser.add_argument("--video-dir", action="append", default=[],
+                        help="Extra folder of videos (repeatable)")
+    parser.add_argument("--output", type=str, default=str(DEFAULT_OUTPUT),
+                        help="Output folder (keypoints + manifest.jsonl)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: all cores)")
+    parser.add_argument("--complexity", type=int, default=2, choices=[0, 1, 2],
+                        help="Holistic model complexity")
+    parser.add_argument("--max-frames", type=int, default=None, help="Max frames per video")
+    parser.add_argument("--skip-frames", type=int, default=0, help="Process every Nth+1 frame")
+    parser.add_argument("--resize", type=int, default=None,
+                        help="Shrink frames to this longer side before inference")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="Threaded decode/convert inside each worker")
+    parser.add_argument("--refine-face", action="store_true", help="478 face landmarks (iris)")
+    parser.add_argument("--compress", action="store_true", help="Write compressed .npz")
+    parser.add_argument("--skip-failed", action="store_true",
+                        help="Don't retry videos that failed in an earlier run")
+    parser.add_argument("--list", action="store_true", help="List sources and pending videos, then exit")
+    args = parser.parse_args()
+
+    print("═" * 60)
+    print("  LSM Pipeline — Corpus Keypoint Extraction")
+    print("═" * 60)
+
+    output_dir = Path(args.output)
+    manifest_path = output_dir / MANIFEST_NAME
+    try:
+        jobs, missing = discover_videos(Path(args.inventory), Path(args.corpus_root), args.video_dir)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    pending, done, skipped = pending_jobs(jobs, load_manifest(manifest_path), output_dir, args.skip_failed)
+
+    print(f"\n📹 {len(jobs)} video(s) found: {done} already done, "
+          f"{skipped} failed earlier (skipped), {len(pending)} to process")
+    if missing:
+        print(f"\n⚠️  {len(missing)} source(s) without local videos:")
+        for label in missing:
+            print(f"     {label}")
+
+    if args.list:
+        for job in pending:
+            print(f"     {job['key']}  ({job['size'] / 1e6:.1f} MB)")
+        return
+    if not pending:
+        print("\n✅ Nothing to do")
+        return
+
+    from src.perception.mediapipe_extractor import HAS_CV2, HAS_MEDIAPIPE
+    if not (HAS_CV2 and HAS_MEDIAPIPE):
+        print("❌ Needs mediapipe and opencv-python: pip install -e '.[perception]'")
+        sys.exit(1)
+
+    options = {
+        "output_dir": str(output_dir),
+        "complexity": args.complexity,
+        "max_frames": args.max_frames,
+        "skip_frames": args.skip_frames,
+        "resize": args.resize,
+        "pipelined": args.pipelined,
+        "refine_face": args.refine_face,
+        "compress": args.compress,
+    }
+    # Largest files first, so one long video doesn't finish alone at the end
+    pending.sort(key=lambda job: job["size"], reverse=True)
+    workers = max(1, min(args.workers, len(pending)))
+    print(f"\n🚀 {workers} worker(s), complexity={args.complexity}\n")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    counts = {"done": 0, "failed": 0}
+    total_frames = 0
+    start = time.perf_counter()
+
+    with open_manifest(manifest_path) as manifest:
+        for i, entry in enumerate(run_jobs(pending, workers, options), 1):
+            manifest.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            manifest.flush()
+            counts[entry["status"]] += 1
+            total_frames += entry["frames"]
+            if entry["status"] == "done":
+                print(f"  [{i}/{len(pending)}] ✅ {entry['key']}: {entry['frames']} frames "
+                      f"in {entry['wall_s']:.1f}s ({entry['fps']:.1f} fps)")
+            else:
+                print(f"  [{i}/{len(pending)}] ❌ {entry['key']}: {entry['error']}")
+
+    elapsed = time.perf_counter() - start
+    print(f"\n{'═' * 60}")
+    print(f"  Done: {counts['done']}, failed: {counts['failed']}, "
+          f"{total_frames} frames in {elapsed:.1f}s "
+          f"({total_frames / elapsed if elapsed > 0 else 0:.1f} fps across {workers} workers)")
+    print(f"  Manifest: {manifest_path}")
+    print(f"{'═' * 60}")
+
+
+if __name__ == "__main__":
+    main()
@@ -133,12 +133,13 @@ class BodyPoseAnalyzer:
             "DISTANT": 1.0,
         }
 
-    def compute_body_anchors(self, body_landmarks: list) -> dict[str, BodyAnchorPosition]:
+    def compute_body_anchors(self, body_landmarks) -> dict[str, BodyAnchorPosition]:
         """
         Compute named body anchor positions from MediaPipe body landmarks.
 
         Args:
-            body_landmarks: List of 33 (x, y, z, visibility) tuples
+            body_landmarks: (33, 4) array (e.g. KeypointResult.body_landmarks)
+                or list of 33 (x, y, z, visibility) tuples
 
         Returns:
             Dict of anchor_name → BodyAnchorPosition
@@ -146,8 +147,9 @@ class BodyPoseAnalyzer:
         if len(body_landmarks) < 33:
             return {}
 
-        pts = np.array([(lm[0], lm[1], lm[2]) for lm in body_landmarks], dtype=np.float32)
-        vis = np.array([lm[3] for lm in body_landmarks], dtype=np.float32)
+        body = np.asarray(body_landmarks, dtype=np.float32)
+        pts = body[:, :3].copy()  # anchors keep positions; don't alias a reused buffer
+        vis = body[:, 3]
 
         anchors = {}
 
@@ -232,7 +234,7 @@ class BodyPoseAnalyzer:
         self,
         hand_position: np.ndarray,
         body_anchors: dict[str, BodyAnchorPosition],
-        body_landmarks: list,
+        body_landmarks,
         dominant_side: str = "RIGHT",
     ) -> LocationPrediction:
         """
@@ -241,7 +243,7 @@ class BodyPoseAnalyzer:
         Args:
             hand_position: (3,) hand position (wrist or palm center)
             body_anchors: Computed body anchor positions
-            body_landmarks: Raw 33-landmark list
+            body_landmarks: Raw (33, 4) landmarks (array or list of tuples)
             dominant_side: "LEFT" or "RIGHT"
 
         Returns:
@@ -255,7 +257,7 @@ class BodyPoseAnalyzer:
                 confidence=0.3,
             )
 
-        pts = np.array([(lm[0], lm[1], lm[2]) for lm in body_landmarks], dtype=np.float32)
+        pts = np.asarray(body_landmarks, dtype=np.float32)[:, :3]
 
         # Compute shoulder width for scale reference
         shoulder_width = np.linalg.norm(
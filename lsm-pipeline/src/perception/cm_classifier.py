@@ -29,7 +29,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
-from .hand_features import HandFeatures, extract_hand_features, match_cm
+from .cm_matcher import get_cm_matcher
+from .hand_features import HandFeatures, HandFeaturesBatch, extract_hand_features
 
 
 # ── Data Structures ──────────────────────────────────────────────────────────
@@ -68,9 +69,11 @@ class FeatureBasedCMClassifier:
 
     def __init__(self, top_k: int = 5):
         self.top_k = top_k
-        # Pre-load CM inventory for fast matching
+        # Pre-load CM inventory and the compiled match_cm() lookup table
         from ..phonology.cm_inventory import CM_INVENTORY
         self._inventory = CM_INVENTORY
+        self._entries = {entry.cm_id: entry for entry in CM_INVENTORY}
+        self._matcher = get_cm_matcher()
 
     def predict(self, hand_features: HandFeatures) -> CMClassifierResult:
         """
@@ -82,8 +85,27 @@ class FeatureBasedCMClassifier:
         Returns:
             CMClassifierResult with top-k predictions
         """
-        matches = match_cm(hand_features, top_k=self.top_k)
+        matches = self._matcher.match(hand_features, top_k=self.top_k)
+        return self._result(matches, hand_features)
 
+    def predict_batch(self, batch: HandFeaturesBatch) -> list[CMClassifierResult]:
+        """
+        Classify every frame of a HandFeaturesBatch, ranking all frames
+        in one lookup.
+
+        Args:
+            batch: Output of extract_hand_features_batch()
+
+        Returns:
+            One CMClassifierResult per frame
+        """
+        cm_ids, scores = self._matcher.rank_batch(batch, top_k=self.top_k)
+        return [
+            self._result(zip(cm_ids[t].tolist(), scores[t].tolist()), batch.frame(t))
+            for t in range(len(batch))
+        ]
+
+    def _result(self, matches, hand_features: HandFeatures) -> CMClassifierResult:
         predictions = []
         for cm_id, score in matches:
             entry = self._get_entry(cm_id)
@@ -116,10 +138,7 @@ class FeatureBasedCMClassifier:
 
     def _get_entry(self, cm_id: int):
         """Get CM inventory entry by ID."""
-        for entry in self._inventory:
-            if entry.cm_id == cm_id:
-                return entry
-        return None
+        return self._entries.get(cm_id)
 
 
 # ── Keypoint-Based Classifier (Architecture) ─────────────────────────────────
@@ -0,0 +1,230 @@
+"""
+Compiled CM Matcher — match_cm() as a lookup table.
+
+match_cm() scores a hand's CM search vector against all 101 inventory
+entries. The search vector is fully discrete, though:
+
+    4 finger levels × 4 fingers, thumb flexion (4), thumb opposition (3),
+    spread (3), thumb contact (2)  →  18,432 possible vectors
+
+so every ranking can be computed once. CompiledCMMatcher packs each
+search vector into an integer feature code (mixed radix over
+FEATURE_DIMS) and stores, per code, the inventory ranked by score. A
+match is then an array lookup, and whole frame batches
+(HandFeaturesBatch) are ranked with one fancy-indexing call.
+
+Scores are kept as integer half-points (every weight and partial credit
+in match_cm() is a multiple of 0.5), so the similarities are
+bit-identical to match_cm()'s, and ties keep inventory order as its
+stable sort does. validate() re-checks every code against match_cm().
+
+Usage:
+    matcher = get_cm_matcher()          # built on first call, ~3.7 MB
+    matcher.match(hand_features, top_k=5)
+    cm_ids, scores = matcher.rank_batch(extract_hand_features_batch(seq))
+"""
+import threading
+from typing import Optional
+
+import numpy as np
+
+from .hand_features import (
+    FINGER_ORDER,
+    FLEXION_LEVELS,
+    SPREAD_LEVELS,
+    THUMB_OPPOSITIONS,
+    HandFeatures,
+    HandFeaturesBatch,
+    _flexion_distance,
+    match_cm,
+)
+
+
+# ── Feature Code Layout ──────────────────────────────────────────────────────
+
+# (name, values) per search-vector field; the code is np.ravel_multi_index
+# over these dimensions, in this order.
+FEATURE_FIELDS = (
+    ("index", FLEXION_LEVELS),
+    ("middle", FLEXION_LEVELS),
+    ("ring", FLEXION_LEVELS),
+    ("pinky", FLEXION_LEVELS),
+    ("thumb_flexion", FLEXION_LEVELS),
+    ("thumb_opposition", THUMB_OPPOSITIONS),
+    ("spread", SPREAD_LEVELS),
+    ("thumb_contact", (False, True)),
+)
+FEATURE_DIMS = tuple(len(values) for _, values in FEATURE_FIELDS)
+N_FEATURE_CODES = int(np.prod(FEATURE_DIMS))
+
+# match_cm() weights, in half-points
+_FINGER_WEIGHT = 20        # 10.0, adjacent level 5.0
+_OPPOSITION_WEIGHT = 16    # 8.0
+_THUMB_FLEXION_WEIGHT = 10  # 5.0, adjacent level 2.5
+_SPREAD_WEIGHT = 6         # 3.0
+_CONTACT_WEIGHT = 6        # 3.0
+_TOTAL_WEIGHT = (4 * _FINGER_WEIGHT + _OPPOSITION_WEIGHT + _THUMB_FLEXION_WEIGHT
+                 + _SPREAD_WEIGHT + _CONTACT_WEIGHT) * 0.5
+
+
+def _level_credit(level: str, entry_level: str, weight: int) -> int:
+    """Full weight on an exact level match, half for an adjacent level."""
+    if level == entry_level:
+        return weight
+    if _flexion_distance(level, entry_level) == 1:
+        return weight // 2
+    return 0
+
+
+# ── Compiled Matcher ─────────────────────────────────────────────────────────
+
+class CompiledCMMatcher:
+    """
+    Precomputed match_cm() rankings for every discrete search vector.
+
+    Per feature code it stores the inventory order (uint8 indices, best
+    first) and the matching scores in half-points (uint8).
+    """
+
+    def __init__(self, inventory: Optional[list] = None):
+        if inventory is None:
+            from ..phonology.cm_inventory import CM_INVENTORY
+            inventory = CM_INVENTORY
+        if len(inventory) > 256:
+            raise ValueError(f"Inventory too large for uint8 ranks: {len(inventory)} entries")
+        self.inventory = list(inventory)
+        self.cm_ids = np.array([entry.cm_id for entry in self.inventory], dtype=np.int16)
+
+        half_points = self._score_table()  # (N_FEATURE_CODES, n_entries)
+        order = np.argsort(-half_points, axis=1, kind="stable")
+        self._order = order.astype(np.uint8)
+        self._half_points = np.take_along_axis(half_points, order, axis=1).astype(np.uint8)
+
+    def _score_table(self) -> np.ndarray:
+        """Half-point score of every (feature code, entry) pair, by broadcasting."""
+        n_entries = len(self.inventory)
+        per_field = []
+        for name, values in FEATURE_FIELDS:
+            table = np.zeros((len(values), n_entries), dtype=np.int16)
+            for v, value in enumerate(values):
+                for e, entry in enumerate(self.inventory):
+                    if name in ("index", "middle", "ring", "pinky"):
+                        table[v, e] = _level_credit(value, getattr(entry, name).value, _FINGER_WEIGHT)
+                    elif name == "thumb_flexion":
+                        table[v, e] = _level_credit(value, entry.thumb_flexion.value, _THUMB_FLEXION_WEIGHT)
+                    elif name == "thumb_opposition":
+                        table[v, e] = _OPPOSITION_WEIGHT if value == entry.thumb_opposition.value else 0
+                    elif name == "spread":
+                        table[v, e] = _SPREAD_WEIGHT if value == entry.spread.value else 0
+                    elif name == "thumb_contact":
+                        table[v, e] = _CONTACT_WEIGHT if value == entry.thumb_contact else 0
+            per_field.append(table)
+
+        scores = np.zeros(FEATURE_DIMS + (n_entries,), dtype=np.int16)
+        for axis, table in enumerate(per_field):
+            shape = [1] * len(FEATURE_DIMS) + [n_entries]
+            shape[axis] = FEATURE_DIMS[axis]
+            scores += table.reshape(shape)
+        return scores.reshape(N_FEATURE_CODES, n_entries)
+
+    # ── Encoding ────────────────────────────────────────────────────────
+
+    @staticmethod
+    def encode(hand_features: HandFeatures) -> int:
+        """Feature code of one hand's CM search vector."""
+        search = hand_features.to_cm_search_vector()
+        fields = dict(search["finger_states"], **search)
+        code = 0
+        for name, values in FEATURE_FIELDS:  # np.ravel_multi_index, without the array overhead
+            code = code * len(values) + values.index(fields[name])
+        return code
+
+    @staticmethod
+    def encode_batch(batch: HandFeaturesBatch) -> np.ndarray:
+        """(T,) feature codes for a HandFeaturesBatch."""
+        columns = [batch.levels[:, FINGER_ORDER.index(name)]
+                   for name in ("index", "middle", "ring", "pinky", "thumb")]
+        columns += [batch.thumb_opposition, batch.spread, batch.thumb_contact.astype(np.int8)]
+        return np.ravel_multi_index(tuple(c.astype(np.intp) for c in columns), FEATURE_DIMS)
+
+    @staticmethod
+    def decode(code: int) -> dict:
+        """Search-vector fields for a feature code ({name: value})."""
+        index = np.unravel_index(code, FEATURE_DIMS)
+        return {name: values[i] for (name, values), i in zip(FEATURE_FIELDS, index)}
+
+    # ── Lookup ──────────────────────────────────────────────────────────
+
+    def match_code(self, code: int, top_k: int = 3) -> list[tuple[int, float]]:
+        """match_cm() result for a feature code."""
+        order = self._order[code, :top_k]
+        half_points = self._half_points[code, :top_k]
+        return [
+            (int(self.cm_ids[i]), (int(h) * 0.5) / _TOTAL_WEIGHT)
+            for i, h in zip(order, half_points)
+        ]
+
+    def match(self, hand_features: HandFeatures, top_k: int = 3) -> list[tuple[int, float]]:
+        """Drop-in replacement for match_cm(hand_features, top_k)."""
+        return self.match_code(self.encode(hand_features), top_k)
+
+    def rank_batch(self, batch, top_k: int = 3) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Rank many frames at once.
+
+        Args:
+            batch: HandFeaturesBatch, or an array of feature codes
+            top_k: Matches per frame
+
+        Returns:
+            (cm_ids, similarity): (T, top_k) int16 and float64 arrays,
+            row t equal to match_cm() for frame t
+        """
+        codes = self.encode_batch(batch) if isinstance(batch, HandFeaturesBatch) else np.asarray(batch)
+        cm_ids = self.cm_ids[self._order[codes, :top_k]]
+        similarity = (self._half_points[codes, :top_k] * 0.5) / _TOTAL_WEIGHT
+        return cm_ids, similarity
+
+    # ── Validation ──────────────────────────────────────────────────────
+
+    def validate(self, codes=None) -> int:
+        """
+        Compare the full ranking of every feature code (or just `codes`)
+        with match_cm(). Returns the number of codes whose ranking or
+        scores differ. All codes take ~15 s.
+        """
+        mismatches = 0
+        n_entries = len(self.inventory)
+        for code in (range(N_FEATURE_CODES) if codes is None else codes):
+            fields = self.decode(code)
+            features = HandFeatures(
+                thumb_flexion=0.0, index_flexion=0.0, middle_flexion=0.0,
+                ring_flexion=0.0, pinky_flexion=0.0,
+                thumb_level=fields["thumb_flexion"],
+                index_level=fields["index"],
+                middle_level=fields["middle"],
+                ring_level=fields["ring"],
+                pinky_level=fields["pinky"],
+                thumb_opposition=fields["thumb_opposition"],
+                thumb_contact=fields["thumb_contact"],
+                spread=fields["spread"],
+                interaction="NONE",
+                landmarks=[],
+                confidence=1.0,
+            )
+            if self.match_code(code, n_entries) != match_cm(features, top_k=n_entries):
+                mismatches += 1
+        return mismatches
+
+
+_matcher: Optional[CompiledCMMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def get_cm_matcher() -> CompiledCMMatcher:
+    """The shared matcher for CM_INVENTORY (compiled on first call)."""
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            _matcher = CompiledCMMatcher()
+        return _matcher
@@ -135,11 +135,11 @@ def extract_eyebrow_features(landmarks: np.ndarray) -> EyebrowFeatures:
     Compares eyebrow height relative to eye positions.
     """
     # Left eyebrow mean height vs left eye top
-    left_brow_y = np.mean([landmarks[i][1] for i in FaceLandmarkIdx.LEFT_EYEBROW])
+    left_brow_y = np.mean(landmarks[FaceLandmarkIdx.LEFT_EYEBROW, 1])
     left_eye_y = landmarks[FaceLandmarkIdx.LEFT_EYE_TOP][1]
 
     # Right eyebrow mean height vs right eye top
-    right_brow_y = np.mean([landmarks[i][1] for i in FaceLandmarkIdx.RIGHT_EYEBROW])
+    right_brow_y = np.mean(landmarks[FaceLandmarkIdx.RIGHT_EYEBROW, 1])
     right_eye_y = landmarks[FaceLandmarkIdx.RIGHT_EYE_TOP][1]
 
     # Face height reference (forehead to chin)
@@ -338,14 +338,15 @@ def extract_eye_gaze(landmarks: np.ndarray) -> EyeGazeFeatures:
 # ── Main Extraction ──────────────────────────────────────────────────────────
 
 def extract_non_manual_features(
-    face_landmarks: list,
+    face_landmarks,
     confidence: float = 1.0,
 ) -> NonManualFeatures:
     """
     Extract all non-manual features from MediaPipe Face Mesh landmarks.
 
     Args:
-        face_landmarks: List of 468+ (x, y, z) tuples
+        face_landmarks: (468+, 3) array (e.g. KeypointResult.face_landmarks)
+            or list of 468+ (x, y, z) tuples
         confidence: Face detection confidence
 
     Returns:
@@ -361,7 +362,7 @@ def extract_non_manual_features(
             confidence=0.0,
         )
 
-    pts = np.array(face_landmarks, dtype=np.float32)
+    pts = np.asarray(face_landmarks, dtype=np.float32)
 
     eyebrows = extract_eyebrow_features(pts)
     mouth = extract_mouth_features(pts)
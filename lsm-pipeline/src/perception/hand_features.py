@@ -11,9 +11,12 @@ Converts raw 21-landmark hand keypoints into LSM-PN relevant features:
 These features directly map to the ParsedCM dataclass in cruz_aldrete_parser.py,
 enabling automatic CM classification from video.
 
+extract_hand_features() handles one frame; extract_hand_features_batch()
+computes the same features for a whole (T, 21, 3) sequence at once and
+returns them column-wise (HandFeaturesBatch).
+
 Reference: Cruz Aldrete (2008) §4.2.5 — notation system for finger postures
 """
-import math
 import numpy as np
 from dataclasses import dataclass
 from typing import Optional
@@ -56,7 +59,7 @@ class HandFeatures:
     interaction: str       # "NONE", "SPREAD", "STACKED", "CROSSED"
 
     # Raw data
-    landmarks: list        # 21 (x, y, z) tuples
+    landmarks: list        # 21 (x, y, z) tuples or a (21, 3) array, as given
     confidence: float
 
     def to_cm_search_vector(self) -> dict:
@@ -81,11 +84,25 @@ class HandFeatures:
 
 # ── Geometry Helpers ─────────────────────────────────────────────────────────
 
+# The helpers below work on single (3,) vectors and on stacks of vectors
+# (..., 3) alike, with the same element-wise arithmetic in both cases, so
+# extract_hand_features() and extract_hand_features_batch() agree bit for bit.
+
+def _dot(v1: np.ndarray, v2: np.ndarray) -> np.ndarray:
+    """Dot product of 3D vectors along the last axis."""
+    return v1[..., 0] * v2[..., 0] + v1[..., 1] * v2[..., 1] + v1[..., 2] * v2[..., 2]
+
+
+def _norm(v: np.ndarray) -> np.ndarray:
+    """Euclidean length of 3D vectors along the last axis."""
+    return np.sqrt(_dot(v, v))
+
+
 def _angle_between(v1: np.ndarray, v2: np.ndarray) -> float:
-    """Angle between two 3D vectors in degrees."""
-    cos_angle = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2) + 1e-8)
+    """Angle between two 3D vectors (or stacks of them) in degrees."""
+    cos_angle = _dot(v1, v2) / (_norm(v1) * _norm(v2) + 1e-8)
     cos_angle = np.clip(cos_angle, -1.0, 1.0)
-    return math.degrees(math.acos(cos_angle))
+    return np.degrees(np.arccos(np.asarray(cos_angle, dtype=np.float64)))
 
 
 def _joint_angle(p1: np.ndarray, p2: np.ndarray, p3: np.ndarray) -> float:
@@ -99,9 +116,9 @@ def _joint_angle(p1: np.ndarray, p2: np.ndarray, p3: np.ndarray) -> float:
     return 180.0 - angle  # Convert: 0° = extended, 180° = closed
 
 
-def _landmarks_to_array(landmarks: list) -> np.ndarray:
-    """Convert list of (x, y, z) tuples to numpy array."""
-    return np.array(landmarks, dtype=np.float32)
+def _landmarks_to_array(landmarks) -> np.ndarray:
+    """(21, 3) float32 array of landmarks; float32 arrays pass through uncopied."""
+    return np.asarray(landmarks, dtype=np.float32)
 
 
 # ── Flexion Level Quantization ───────────────────────────────────────────────
@@ -119,6 +136,8 @@ FLEXION_THRESHOLDS = {
     "CLOSED": (130, 180),
 }
 
+FLEXION_LEVELS = tuple(FLEXION_THRESHOLDS)  # level codes: FLEXION_LEVELS[code]
+
 
 def quantize_flexion(angle: float) -> str:
     """Convert a flexion angle to a FlexionLevel string."""
@@ -150,14 +169,14 @@ def compute_thumb_opposition(landmarks: np.ndarray) -> str:
     v_index = index_mcp - wrist
     v_pinky = pinky_mcp - wrist
     palm_normal = np.cross(v_index, v_pinky)
-    palm_normal = palm_normal / (np.linalg.norm(palm_normal) + 1e-8)
+    palm_normal = palm_normal / (_norm(palm_normal) + 1e-8)
 
     # Thumb direction
     thumb_dir = thumb_tip - thumb_cmc
-    thumb_dir = thumb_dir / (np.linalg.norm(thumb_dir) + 1e-8)
+    thumb_dir = thumb_dir / (_norm(thumb_dir) + 1e-8)
 
     # Dot product with palm normal
-    dot = abs(np.dot(thumb_dir, palm_normal))
+    dot = abs(_dot(thumb_dir, palm_normal))
 
     if dot > 0.6:
         return "OPPOSED"
@@ -249,7 +268,7 @@ def compute_thumb_contact(landmarks: np.ndarray) -> bool:
     middle_tip = landmarks[HandLandmark.MIDDLE_TIP.value]
 
     # Hand span = wrist to middle fingertip distance
-    hand_span = np.linalg.norm(middle_tip - wrist)
+    hand_span = _norm(middle_tip - wrist)
     contact_threshold = hand_span * 0.12  # 12% of hand span
 
     finger_tips = [
@@ -266,7 +285,7 @@ def compute_thumb_contact(landmarks: np.ndarray) -> bool:
     ]
 
     for tip_idx in finger_tips + finger_pips:
-        dist = np.linalg.norm(thumb_tip - landmarks[tip_idx])
+        dist = _norm(thumb_tip - landmarks[tip_idx])
         if dist < contact_threshold:
             return True
 
@@ -275,12 +294,12 @@ def compute_thumb_contact(landmarks: np.ndarray) -> bool:
 
 # ── Main Feature Extraction ──────────────────────────────────────────────────
 
-def extract_hand_features(landmarks: list, confidence: float = 1.0) -> HandFeatures:
+def extract_hand_features(landmarks, confidence: float = 1.0) -> HandFeatures:
     """
     Extract LSM-PN relevant features from 21 hand landmarks.
 
     Args:
-        landmarks: List of 21 (x, y, z) tuples (MediaPipe hand landmarks)
+        landmarks: (21, 3) array or list of 21 (x, y, z) tuples (MediaPipe hand landmarks)
         confidence: Detection confidence (0-1)
 
     Returns:
@@ -346,6 +365,156 @@ def extract_hand_features(landmarks: list, confidence: float = 1.0) -> HandFeatu
     )
 
 
+# ── Batch Feature Extraction ─────────────────────────────────────────────────
+
+# Category codes stored by HandFeaturesBatch (value i ↔ names[i])
+THUMB_OPPOSITIONS = ("OPPOSED", "PARALLEL", "CROSSED")
+SPREAD_LEVELS = ("CLOSED", "NEUTRAL", "SPREAD")
+INTERACTIONS = ("NONE", "SPREAD", "STACKED", "CROSSED")
+
+# Column order of HandFeaturesBatch.flexion / .levels
+FINGER_ORDER = tuple(FINGER_JOINTS)  # thumb, index, middle, ring, pinky
+
+_TIPS = [HandLandmark.INDEX_TIP.value, HandLandmark.MIDDLE_TIP.value,
+         HandLandmark.RING_TIP.value, HandLandmark.PINKY_TIP.value]
+_MCPS = [HandLandmark.INDEX_MCP.value, HandLandmark.MIDDLE_MCP.value,
+         HandLandmark.RING_MCP.value, HandLandmark.PINKY_MCP.value]
+_PIPS = [HandLandmark.INDEX_PIP.value, HandLandmark.MIDDLE_PIP.value,
+         HandLandmark.RING_PIP.value, HandLandmark.PINKY_PIP.value]
+
+
+@dataclass
+class HandFeaturesBatch:
+    """
+    Features for T frames of one hand, stored column-wise.
+
+    Categorical columns hold int8 codes into FLEXION_LEVELS,
+    THUMB_OPPOSITIONS, SPREAD_LEVELS and INTERACTIONS.
+    """
+    flexion: np.ndarray           # (T, 5) float64 degrees, columns in FINGER_ORDER
+    levels: np.ndarray            # (T, 5) int8 → FLEXION_LEVELS
+    thumb_opposition: np.ndarray  # (T,) int8 → THUMB_OPPOSITIONS
+    thumb_contact: np.ndarray     # (T,) bool
+    spread: np.ndarray            # (T,) int8 → SPREAD_LEVELS
+    interaction: np.ndarray       # (T,) int8 → INTERACTIONS
+    keypoints: np.ndarray         # (T, 21, 3) float32
+    confidence: np.ndarray        # (T,) float64
+
+    def __len__(self) -> int:
+        return len(self.flexion)
+
+    def frame(self, t: int) -> HandFeatures:
+        """Frame t as a HandFeatures, equal to extract_hand_features() on it."""
+        flexion = {name: float(self.flexion[t, i]) for i, name in enumerate(FINGER_ORDER)}
+        levels = {name: FLEXION_LEVELS[self.levels[t, i]] for i, name in enumerate(FINGER_ORDER)}
+        return HandFeatures(
+            thumb_flexion=flexion["thumb"],
+            index_flexion=flexion["index"],
+            middle_flexion=flexion["middle"],
+            ring_flexion=flexion["ring"],
+            pinky_flexion=flexion["pinky"],
+            thumb_level=levels["thumb"],
+            index_level=levels["index"],
+            middle_level=levels["middle"],
+            ring_level=levels["ring"],
+            pinky_level=levels["pinky"],
+            thumb_opposition=THUMB_OPPOSITIONS[self.thumb_opposition[t]],
+            thumb_contact=bool(self.thumb_contact[t]),
+            spread=SPREAD_LEVELS[self.spread[t]],
+            interaction=INTERACTIONS[self.interaction[t]],
+            landmarks=[tuple(p) for p in self.keypoints[t].tolist()],
+            confidence=float(self.confidence[t]),
+        )
+
+
+def quantize_flexion_codes(angles: np.ndarray) -> np.ndarray:
+    """Vectorized quantize_flexion(): angles → int8 codes into FLEXION_LEVELS."""
+    angles = np.asarray(angles)
+    codes = np.full(angles.shape, FLEXION_LEVELS.index("CLOSED"), dtype=np.int8)
+    # Reverse order so the first matching range wins, as in quantize_flexion()
+    for code, (lo, hi) in reversed(list(enumerate(FLEXION_THRESHOLDS.values()))):
+        codes[(lo <= angles) & (angles < hi)] = code
+    return codes
+
+
+def extract_hand_features_batch(keypoints: np.ndarray, confidence=1.0) -> HandFeaturesBatch:
+    """
+    Extract hand features for every frame of a sequence in one pass.
+
+    Args:
+        keypoints: (T, 21, 3) array of hand landmarks (cast to float32)
+        confidence: Detection confidence, scalar or (T,)
+
+    Returns:
+        HandFeaturesBatch whose row t matches extract_hand_features(keypoints[t])
+        exactly (see HandFeaturesBatch.frame()).
+    """
+    pts = np.asarray(keypoints, dtype=np.float32)
+    if pts.ndim != 3 or pts.shape[1:] != (21, 3):
+        raise ValueError(f"Expected keypoints of shape (T, 21, 3), got {pts.shape}")
+    n_frames = len(pts)
+
+    # ── Per-finger flexion ──────────────────────────────────────────────
+    flexion = np.empty((n_frames, len(FINGER_ORDER)), dtype=np.float64)
+    for col, finger_name in enumerate(FINGER_ORDER):
+        if finger_name == "thumb":
+            flexion[:, col] = _joint_angle(
+                pts[:, HandLandmark.THUMB_CMC.value],
+                pts[:, HandLandmark.THUMB_MCP.value],
+                pts[:, HandLandmark.THUMB_TIP.value],
+            )
+        else:
+            chain = pts[:, [j.value for j in FINGER_JOINTS[finger_name]]]  # (T, 4, 3)
+            angles = _joint_angle(chain[:, :-2], chain[:, 1:-1], chain[:, 2:])  # (T, 2)
+            flexion[:, col] = angles.mean(axis=1)
+
+    levels = quantize_flexion_codes(flexion)
+
+    # ── Thumb opposition ────────────────────────────────────────────────
+    wrist = pts[:, HandLandmark.WRIST.value]
+    palm_normal = np.cross(pts[:, HandLandmark.INDEX_MCP.value] - wrist,
+                           pts[:, HandLandmark.PINKY_MCP.value] - wrist)
+    palm_normal = palm_normal / (_norm(palm_normal) + 1e-8)[:, None]
+    thumb_dir = pts[:, HandLandmark.THUMB_TIP.value] - pts[:, HandLandmark.THUMB_CMC.value]
+    thumb_dir = thumb_dir / (_norm(thumb_dir) + 1e-8)[:, None]
+    opposed = np.abs(_dot(thumb_dir, palm_normal)) > 0.6
+    thumb_opp = np.where(opposed, THUMB_OPPOSITIONS.index("OPPOSED"),
+                         THUMB_OPPOSITIONS.index("PARALLEL")).astype(np.int8)
+
+    # ── Finger spread ───────────────────────────────────────────────────
+    finger_dirs = pts[:, _TIPS] - pts[:, _MCPS]  # (T, 4, 3)
+    mean_angle = _angle_between(finger_dirs[:, :-1], finger_dirs[:, 1:]).mean(axis=1)
+    spread = np.full(n_frames, SPREAD_LEVELS.index("NEUTRAL"), dtype=np.int8)
+    spread[mean_angle < 8] = SPREAD_LEVELS.index("CLOSED")
+    spread[mean_angle > 20] = SPREAD_LEVELS.index("SPREAD")
+
+    # ── Finger interaction ──────────────────────────────────────────────
+    idx_offset = pts[:, HandLandmark.INDEX_TIP.value, 0] - pts[:, HandLandmark.INDEX_MCP.value, 0]
+    mid_offset = pts[:, HandLandmark.MIDDLE_TIP.value, 0] - pts[:, HandLandmark.MIDDLE_MCP.value, 0]
+    crossed = ((idx_offset > 0) & (mid_offset < 0)) | ((idx_offset < 0) & (mid_offset > 0))
+    interaction = np.full(n_frames, INTERACTIONS.index("NONE"), dtype=np.int8)
+    interaction[crossed] = INTERACTIONS.index("CROSSED")
+    interaction[spread == SPREAD_LEVELS.index("SPREAD")] = INTERACTIONS.index("SPREAD")
+
+    # ── Thumb contact ───────────────────────────────────────────────────
+    thumb_tip = pts[:, HandLandmark.THUMB_TIP.value]
+    hand_span = _norm(pts[:, HandLandmark.MIDDLE_TIP.value] - wrist)
+    contact_threshold = hand_span * 0.12
+    dists = _norm(thumb_tip[:, None] - pts[:, _TIPS + _PIPS])  # (T, 8)
+    thumb_contact = (dists < contact_threshold[:, None]).any(axis=1)
+
+    return HandFeaturesBatch(
+        flexion=flexion,
+        levels=levels,
+        thumb_opposition=thumb_opp,
+        thumb_contact=thumb_contact,
+        spread=spread,
+        interaction=interaction,
+        keypoints=pts,
+        confidence=np.broadcast_to(np.asarray(confidence, dtype=np.float64), (n_frames,)).copy(),
+    )
+
+
 # ── CM Matching ──────────────────────────────────────────────────────────────
 
 def match_cm(hand_features: HandFeatures, top_k: int = 3) -> list[tuple[int, float]]:
@@ -12,10 +12,14 @@ Features:
   - Confidence-based occlusion handling
   - Output: frame-indexed arrays for classifier training
 
+Keypoints stay float32 ndarrays end to end: the (21, 3) hand views of a
+KeypointResult go in, and HandKeypoints.normalized is a (21, 3) array
+that extract_hand_features() takes as-is.
+
 Usage:
     pipeline = HandPipeline()
-    for frame in video_frames:
-        result = pipeline.process(frame)
+    for keypoints in extractor.process_video(path, reuse_result=True):
+        result = pipeline.process_result(keypoints)
         if result.dominant_hand:
             features = extract_hand_features(result.dominant_hand.normalized)
 """
@@ -24,7 +28,7 @@ from collections import deque
 from dataclasses import dataclass, field
 from typing import Optional
 
-from .keypoint_schema import HandLandmark, FINGER_JOINTS
+from .keypoint_schema import HandLandmark, FINGER_JOINTS, KeypointResult
 
 
 # ── Data Structures ──────────────────────────────────────────────────────────
@@ -33,7 +37,7 @@ from .keypoint_schema import HandLandmark, FINGER_JOINTS
 class HandKeypoints:
     """Processed keypoints for a single hand."""
     raw: np.ndarray              # (21, 3) raw landmark positions
-    normalized: list             # [(x,y,z), ...] × 21 — normalized for classifier
+    normalized: np.ndarray       # (21, 3) float32 — normalized for classifier
     confidence: float            # detection confidence 0-1
     handedness: str              # "LEFT" or "RIGHT"
     handedness_score: float      # confidence in handedness assignment
@@ -97,8 +101,8 @@ class TemporalSmoother:
         """
         if self._last_smoothed is None:
             self._last_smoothed = landmarks.copy()
-            self._history.append(landmarks.copy())
-            return landmarks
+            self._history.append(self._last_smoothed)
+            return self._last_smoothed.copy()  # never hand back the caller's buffer
 
         # Adaptive alpha: trust confident detections more
         adaptive_alpha = self.alpha * confidence + (1 - confidence) * 0.3
@@ -123,7 +127,7 @@ class TemporalSmoother:
 
 # ── Normalization ────────────────────────────────────────────────────────────
 
-def normalize_hand_keypoints(landmarks: np.ndarray) -> tuple[list, float]:
+def normalize_hand_keypoints(landmarks: np.ndarray) -> tuple[np.ndarray, float]:
     """
     Normalize hand keypoints to be size-invariant and position-invariant.
 
@@ -136,7 +140,7 @@ def normalize_hand_keypoints(landmarks: np.ndarray) -> tuple[list, float]:
         landmarks: (21, 3) raw hand landmarks
 
     Returns:
-        (normalized_list, palm_scale) where normalized_list is [(x,y,z), ...] × 21
+        (normalized, palm_scale) where normalized is a new (21, 3) array
     """
     wrist = landmarks[HandLandmark.WRIST.value]
     middle_mcp = landmarks[HandLandmark.MIDDLE_MCP.value]
@@ -150,10 +154,7 @@ def normalize_hand_keypoints(landmarks: np.ndarray) -> tuple[list, float]:
         palm_scale = 1.0  # avoid division by zero
     scaled = centered / palm_scale
 
-    # Convert to list of tuples for compatibility with hand_features
-    normalized = [(float(p[0]), float(p[1]), float(p[2])) for p in scaled]
-
-    return normalized, float(palm_scale)
+    return scaled, float(palm_scale)
 
 
 # ── Handedness Detection ─────────────────────────────────────────────────────
@@ -254,18 +255,24 @@ class HandPipeline:
         self._left_trajectory: list[TrajectoryPoint] = []
         self._right_trajectory: list[TrajectoryPoint] = []
 
+    def process_result(self, keypoints: KeypointResult) -> HandPipelineResult:
+        """Process both hands of an extractor KeypointResult (no copies)."""
+        return self.process_keypoints(
+            keypoints.left_hand, keypoints.right_hand, keypoints.inference_time_ms
+        )
+
     def process_keypoints(
         self,
-        left_hand_raw: Optional[list],
-        right_hand_raw: Optional[list],
+        left_hand_raw: Optional[np.ndarray | list],
+        right_hand_raw: Optional[np.ndarray | list],
         inference_time_ms: float = 0.0,
     ) -> HandPipelineResult:
         """
         Process raw hand keypoints from MediaPipe through the full pipeline.
 
         Args:
-            left_hand_raw: List of 21 (x,y,z) tuples for left hand, or None
-            right_hand_raw: List of 21 (x,y,z) tuples for right hand, or None
+            left_hand_raw: (21, 3) array (or 21 (x,y,z) tuples) for left hand, or None
+            right_hand_raw: (21, 3) array (or 21 (x,y,z) tuples) for right hand, or None
             inference_time_ms: Time spent on keypoint extraction
 
         Returns:
@@ -276,10 +283,11 @@ class HandPipeline:
 
         left_kp = None
         right_kp = None
+        left_arr = _as_hand_array(left_hand_raw)
+        right_arr = _as_hand_array(right_hand_raw)
 
         # Process left hand
-        if left_hand_raw and len(left_hand_raw) == 21:
-            left_arr = np.array(left_hand_raw, dtype=np.float32)
+        if left_arr is not None:
             smoothed = self._left_smoother.smooth(left_arr, confidence=0.9)
             normalized, palm_scale = normalize_hand_keypoints(smoothed)
 
@@ -309,8 +317,7 @@ class HandPipeline:
             self._left_smoother.reset()
 
         # Process right hand
-        if right_hand_raw and len(right_hand_raw) == 21:
-            right_arr = np.array(right_hand_raw, dtype=np.float32)
+        if right_arr is not None:
             smoothed = self._right_smoother.smooth(right_arr, confidence=0.9)
             normalized, palm_scale = normalize_hand_keypoints(smoothed)
 
@@ -412,6 +419,13 @@ class HandPipeline:
         self._frame_count = 0
 
 
+def _as_hand_array(landmarks) -> Optional[np.ndarray]:
+    """(21, 3) float32 view of a hand (no copy for float32 arrays), or None if absent."""
+    if landmarks is None or len(landmarks) != 21:
+        return None
+    return np.asarray(landmarks, dtype=np.float32)
+
+
 # ── Export Utilities ─────────────────────────────────────────────────────────
 
 def export_keypoints_to_numpy(
@@ -438,7 +452,7 @@ def export_keypoints_to_numpy(
         kp = result.dominant_hand if hand == "dominant" else result.non_dominant_hand
 
         if kp is not None:
-            keypoints[i] = np.array(kp.normalized, dtype=np.float32)
+            keypoints[i] = kp.normalized
             confidence[i] = kp.confidence
             valid_mask[i] = True
 
@@ -17,6 +17,8 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
 
+import numpy as np
+
 
 # ── Hand Landmark Indices (21 per hand) ──────────────────────────────────────
 
@@ -119,16 +121,96 @@ UB_CRITICAL_LANDMARKS = {
 
 # ── Evaluation Metrics ───────────────────────────────────────────────────────
 
+# Array-backed KeypointResult buffers (MediaPipe Holistic layout)
+BODY_BUFFER_SHAPE = (33, 4)      # x, y, z, visibility
+HANDS_BUFFER_SHAPE = (2, 21, 3)  # [LEFT, RIGHT] × 21 × (x, y, z)
+FACE_BUFFER_SHAPE = (478, 3)     # 468 mesh + 10 iris (refined) landmarks
+LEFT_HAND, RIGHT_HAND = 0, 1     # slots in KeypointResult.hands
+
+
 @dataclass
 class KeypointResult:
-    """Result of extracting keypoints from a single frame."""
-    body_landmarks: list        # [(x, y, z, visibility), ...] × 33
-    left_hand_landmarks: list   # [(x, y, z), ...] × 21
-    right_hand_landmarks: list  # [(x, y, z), ...] × 21
-    face_landmarks: list        # [(x, y, z), ...] × 468
+    """
+    Result of extracting keypoints from a single frame.
+
+    Landmarks live in fixed-size float32 arrays that an extractor fills in
+    place; body_present / hand_present / face_count say which rows hold
+    this frame's detections (the rest are stale). The *_landmarks
+    properties are views of just the detected rows, empty when a part is
+    missing, so len(), iteration and indexing work as they did on the
+    former lists of tuples.
+    """
+    body: np.ndarray            # (33, 4) float32 — x, y, z, visibility
+    hands: np.ndarray           # (2, 21, 3) float32 — [LEFT_HAND, RIGHT_HAND]
+    face: np.ndarray            # (478, 3) float32
+    body_present: bool
+    hand_present: np.ndarray    # (2,) bool — [LEFT_HAND, RIGHT_HAND]
+    face_count: int             # face rows detected: 0, 468 or 478 (with iris)
     inference_time_ms: float
     frame_index: int
     confidence: float           # overall detection confidence
+    decode_time_ms: float = 0.0   # grab/retrieve, incl. skipped grabs before it
+    convert_time_ms: float = 0.0  # resize + BGR→RGB
+
+    @classmethod
+    def empty(cls) -> "KeypointResult":
+        """Allocate buffers for one frame, with nothing detected."""
+        return cls(
+            body=np.zeros(BODY_BUFFER_SHAPE, dtype=np.float32),
+            hands=np.zeros(HANDS_BUFFER_SHAPE, dtype=np.float32),
+            face=np.zeros(FACE_BUFFER_SHAPE, dtype=np.float32),
+            body_present=False,
+            hand_present=np.zeros(2, dtype=bool),
+            face_count=0,
+            inference_time_ms=0.0,
+            frame_index=0,
+            confidence=0.0,
+        )
+
+    def copy(self) -> "KeypointResult":
+        """Independent copy (keep one of these when the extractor reuses buffers)."""
+        return KeypointResult(
+            body=self.body.copy(),
+            hands=self.hands.copy(),
+            face=self.face.copy(),
+            body_present=self.body_present,
+            hand_present=self.hand_present.copy(),
+            face_count=self.face_count,
+            inference_time_ms=self.inference_time_ms,
+            frame_index=self.frame_index,
+            confidence=self.confidence,
+            decode_time_ms=self.decode_time_ms,
+            convert_time_ms=self.convert_time_ms,
+        )
+
+    @property
+    def body_landmarks(self) -> np.ndarray:
+        """(33, 4) view, or (0, 4) if no body was detected."""
+        return self.body if self.body_present else self.body[:0]
+
+    @property
+    def left_hand_landmarks(self) -> np.ndarray:
+        """(21, 3) view, or (0, 3) if the left hand was not detected."""
+        return self.hands[LEFT_HAND, :21 if self.hand_present[LEFT_HAND] else 0]
+
+    @property
+    def right_hand_landmarks(self) -> np.ndarray:
+        """(21, 3) view, or (0, 3) if the right hand was not detected."""
+        return self.hands[RIGHT_HAND, :21 if self.hand_present[RIGHT_HAND] else 0]
+
+    @property
+    def face_landmarks(self) -> np.ndarray:
+        """(face_count, 3) view."""
+        return self.face[:self.face_count]
+
+    @property
+    def left_hand(self) -> Optional[np.ndarray]:
+        """(21, 3) view, or None — the form HandPipeline.process_keypoints() takes."""
+        return self.hands[LEFT_HAND] if self.hand_present[LEFT_HAND] else None
+
+    @property
+    def right_hand(self) -> Optional[np.ndarray]:
+        return self.hands[RIGHT_HAND] if self.hand_present[RIGHT_HAND] else None
 
 
 @dataclass
@@ -148,6 +230,11 @@ class BenchmarkResult:
     ios_compatible: bool
     license: str
     notes: str = ""
+    # Per-stage means and end-to-end rate (fps above is inference-only)
+    mean_decode_ms: float = 0.0
+    mean_convert_ms: float = 0.0
+    throughput_fps: float = 0.0
+    pipelined: bool = False
 
     def summary(self) -> str:
         return (
@@ -159,6 +246,11 @@ class BenchmarkResult:
             f"({100*self.hand_detected_frames/max(self.total_frames,1):.1f}%)\n"
             f"  Speed: {self.fps:.1f} fps "
             f"(mean {self.mean_inference_ms:.1f}ms, p95 {self.p95_inference_ms:.1f}ms)\n"
+            f"  Stages: decode {self.mean_decode_ms:.1f}ms, "
+            f"convert {self.mean_convert_ms:.1f}ms, "
+            f"inference {self.mean_inference_ms:.1f}ms per frame → "
+            f"{self.throughput_fps:.1f} fps end-to-end"
+            f"{' (pipelined)' if self.pipelined else ''}\n"
             f"  Completeness — Hand: {self.hand_keypoint_completeness:.1f}%, "
             f"Body: {self.body_keypoint_completeness:.1f}%, "
             f"Face: {self.face_keypoint_completeness:.1f}%\n"
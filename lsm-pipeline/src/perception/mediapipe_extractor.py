@@ -5,16 +5,29 @@ Extracts body, hand, and face landmarks from video frames using
 Google's MediaPipe framework. This is the primary candidate for
 the LSM pipeline due to its real-time speed and iOS/CoreML path.
 
+Landmarks are copied straight into the float32 buffers of an
+array-backed KeypointResult; pass reuse_result=True to process_video() to
+refill one result every frame instead of allocating a new one.
+
+process_video(pipelined=True) overlaps the stages: a decoder thread
+fills a bounded prefetch queue and a converter thread resizes and
+colour-converts, so the calling thread only runs Holistic inference.
+Skipped frames are only grab()bed, never retrieve()d.
+
 Usage:
     extractor = MediaPipeExtractor()
     results = extractor.process_video("path/to/video.mp4")
     for frame_result in results:
         print(frame_result.inference_time_ms)
 """
+import functools
+import itertools
+import queue
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Generator
+from typing import Callable, Iterator, Optional, Generator
 
 try:
     import cv2
@@ -30,7 +43,161 @@ except ImportError:
 
 import numpy as np
 
-from .keypoint_schema import KeypointResult, BenchmarkResult
+from .keypoint_schema import KeypointResult, BenchmarkResult, LEFT_HAND, RIGHT_HAND
+
+
+def _fill_landmarks(out: np.ndarray, landmark_list, with_visibility: bool = False) -> int:
+    """
+    Copy a MediaPipe landmark list into the rows of `out` (in place).
+
+    Returns the number of landmarks written; 0 if landmark_list is None.
+    """
+    if landmark_list is None:
+        return 0
+    landmarks = landmark_list.landmark
+    n = min(len(landmarks), len(out))
+    if with_visibility:
+        values = ((lm.x, lm.y, lm.z, lm.visibility) for lm in itertools.islice(landmarks, n))
+    else:
+        values = ((lm.x, lm.y, lm.z) for lm in itertools.islice(landmarks, n))
+    out[:n] = np.fromiter(itertools.chain.from_iterable(values), dtype=np.float32,
+                          count=n * out.shape[1]).reshape(n, out.shape[1])
+    return n
+
+
+# ── Frame Decoding ───────────────────────────────────────────────────────────
+
+def _decode_frames(
+    cap, max_frames: Optional[int], skip_frames: int
+) -> Iterator[tuple[int, np.ndarray, float]]:
+    """
+    Yield (frame_index, bgr_frame, decode_ms) for the frames to process.
+
+    Every frame is grab()bed; only kept frames are retrieve()d, which is
+    where OpenCV converts and copies the pixels. decode_ms covers the
+    kept frame and the skipped grabs before it.
+    """
+    frame_idx = 0
+    processed = 0
+    t0 = time.perf_counter()
+    while not (max_frames and processed >= max_frames):
+        if not cap.grab():
+            break
+        if skip_frames > 0 and frame_idx % (skip_frames + 1) != 0:
+            frame_idx += 1
+            continue
+        ret, frame = cap.retrieve()
+        if not ret:
+            break
+        t1 = time.perf_counter()
+        yield frame_idx, frame, (t1 - t0) * 1000.0
+        processed += 1
+        frame_idx += 1
+        t0 = time.perf_counter()
+
+
+def _convert_frames(frames, convert) -> Iterator[tuple[int, np.ndarray, float, float]]:
+    """Serial counterpart of _FramePipeline: convert on the calling thread."""
+    for frame_idx, frame, decode_ms in frames:
+        rgb, convert_ms = convert(frame)
+        yield frame_idx, rgb, decode_ms, convert_ms
+
+
+_END_OF_STREAM = object()
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Blocking put that gives up (returns False) once stop is set."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+class _FramePipeline:
+    """
+    Decode, and optionally convert, frames on background threads.
+
+        decoder ──[decoded]──▶ converter ──[ready]──▶ consumer (inference)
+
+    Queues are bounded by `prefetch`, so decoding never runs far ahead of
+    inference. One thread per stage plus FIFO queues keep frames in order.
+    Without the converter thread, the consumer converts each frame itself.
+    Errors in a stage are re-raised in the consumer; close() stops and
+    joins the threads (call it before releasing the capture).
+    """
+
+    def __init__(
+        self,
+        frames: Iterator[tuple[int, np.ndarray, float]],
+        convert: Callable[[np.ndarray], tuple[np.ndarray, float]],
+        prefetch: int = 8,
+        convert_thread: bool = True,
+    ):
+        self._convert = convert
+        self._stop = threading.Event()
+        self._decoded: queue.Queue = queue.Queue(maxsize=max(1, prefetch))
+        self._ready: Optional[queue.Queue] = (
+            queue.Queue(maxsize=max(1, prefetch)) if convert_thread else None
+        )
+        self._threads = [threading.Thread(
+            target=self._decode_loop, args=(frames,), name="frame-decode", daemon=True,
+        )]
+        if convert_thread:
+            self._threads.append(threading.Thread(
+                target=self._convert_loop, name="frame-convert", daemon=True,
+            ))
+        for thread in self._threads:
+            thread.start()
+
+    def _decode_loop(self, frames):
+        try:
+            for item in frames:
+                if not _put(self._decoded, item, self._stop):
+                    return
+            _put(self._decoded, _END_OF_STREAM, self._stop)
+        except Exception as e:
+            _put(self._decoded, e, self._stop)
+
+    def _convert_loop(self):
+        while not self._stop.is_set():
+            try:
+                item = self._decoded.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _END_OF_STREAM or isinstance(item, Exception):
+                _put(self._ready, item, self._stop)
+                return
+            frame_idx, frame, decode_ms = item
+            try:
+                rgb, convert_ms = self._convert(frame)
+            except Exception as e:
+                _put(self._ready, e, self._stop)
+                return
+            if not _put(self._ready, (frame_idx, rgb, decode_ms, convert_ms), self._stop):
+                return
+
+    def __iter__(self) -> Iterator[tuple[int, np.ndarray, float, float]]:
+        """Yield (frame_index, rgb_frame, decode_ms, convert_ms) in frame order."""
+        source = self._ready if self._ready is not None else self._decoded
+        while True:
+            item = source.get()
+            if item is _END_OF_STREAM:
+                return
+            if isinstance(item, Exception):
+                raise item
+            if self._ready is None:
+                yield from _convert_frames([item], self._convert)
+            else:
+                yield item
+
+    def close(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
 
 
 class MediaPipeExtractor:
@@ -54,6 +221,7 @@ class MediaPipeExtractor:
         model_complexity: int = 2,
         min_detection_confidence: float = 0.5,
         min_tracking_confidence: float = 0.5,
+        refine_face_landmarks: bool = False,
     ):
         if not HAS_MEDIAPIPE:
             raise ImportError(
@@ -70,81 +238,107 @@ class MediaPipeExtractor:
             model_complexity=model_complexity,
             min_detection_confidence=min_detection_confidence,
             min_tracking_confidence=min_tracking_confidence,
+            refine_face_landmarks=refine_face_landmarks,  # +10 iris landmarks (478)
         )
         self.mp_drawing = mp.solutions.drawing_utils
         self._model_complexity = model_complexity
 
-    def process_frame(self, frame: np.ndarray, frame_index: int = 0) -> KeypointResult:
+    def process_frame(
+        self,
+        frame: np.ndarray,
+        frame_index: int = 0,
+        out: Optional[KeypointResult] = None,
+    ) -> KeypointResult:
         """
         Process a single BGR frame and return keypoints.
 
         Args:
             frame: BGR image (OpenCV format)
             frame_index: Frame number in the video
+            out: KeypointResult to fill in place (None = allocate a new one)
 
         Returns:
             KeypointResult with all detected landmarks
         """
+        rgb, convert_ms = self._convert_frame(frame)
+        return self._infer(rgb, frame_index, out, convert_time_ms=convert_ms)
+
+    @staticmethod
+    def _convert_frame(frame: np.ndarray, resize: Optional[int] = None) -> tuple[np.ndarray, float]:
+        """
+        BGR frame → RGB for MediaPipe, first shrinking it so its longer side
+        is at most `resize` pixels (landmarks are normalized, so unaffected).
+
+        Returns:
+            (rgb_frame, convert_ms)
+        """
+        t0 = time.perf_counter()
+        h, w = frame.shape[:2]
+        if resize and max(h, w) > resize:
+            scale = resize / max(h, w)
+            frame = cv2.resize(
+                frame, (max(1, round(w * scale)), max(1, round(h * scale))),
+                interpolation=cv2.INTER_AREA,
+            )
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        return rgb, (time.perf_counter() - t0) * 1000.0
 
+    def _infer(
+        self,
+        rgb: np.ndarray,
+        frame_index: int,
+        out: Optional[KeypointResult] = None,
+        decode_time_ms: float = 0.0,
+        convert_time_ms: float = 0.0,
+    ) -> KeypointResult:
+        """Run Holistic on an RGB frame and fill a KeypointResult."""
         t0 = time.perf_counter()
         results = self.holistic.process(rgb)
         t1 = time.perf_counter()
 
-        inference_ms = (t1 - t0) * 1000.0
-
-        # Extract body landmarks
-        body = []
-        if results.pose_landmarks:
-            for lm in results.pose_landmarks.landmark:
-                body.append((lm.x, lm.y, lm.z, lm.visibility))
-
-        # Extract hand landmarks
-        left_hand = []
-        if results.left_hand_landmarks:
-            for lm in results.left_hand_landmarks.landmark:
-                left_hand.append((lm.x, lm.y, lm.z))
-
-        right_hand = []
-        if results.right_hand_landmarks:
-            for lm in results.right_hand_landmarks.landmark:
-                right_hand.append((lm.x, lm.y, lm.z))
-
-        # Extract face landmarks
-        face = []
-        if results.face_landmarks:
-            for lm in results.face_landmarks.landmark:
-                face.append((lm.x, lm.y, lm.z))
+        result = out if out is not None else KeypointResult.empty()
+        result.inference_time_ms = (t1 - t0) * 1000.0
+        result.decode_time_ms = decode_time_ms
+        result.convert_time_ms = convert_time_ms
+        result.frame_index = frame_index
+        self._fill_result(result, results)
+        return result
+
+    @staticmethod
+    def _fill_result(result: KeypointResult, results) -> None:
+        """Copy Holistic output into result's buffers and set presence/confidence."""
+        result.body_present = _fill_landmarks(
+            result.body, results.pose_landmarks, with_visibility=True
+        ) == len(result.body)
+        result.hand_present[LEFT_HAND] = _fill_landmarks(
+            result.hands[LEFT_HAND], results.left_hand_landmarks
+        ) == 21
+        result.hand_present[RIGHT_HAND] = _fill_landmarks(
+            result.hands[RIGHT_HAND], results.right_hand_landmarks
+        ) == 21
+        result.face_count = _fill_landmarks(result.face, results.face_landmarks)
 
         # Compute overall confidence
         confidence = 0.0
         n = 0
-        if body:
-            confidence += sum(lm[3] for lm in body) / len(body)
-            n += 1
-        if left_hand:
-            confidence += 1.0  # hand presence = confident
+        if result.body_present:
+            confidence += float(result.body[:, 3].mean())
             n += 1
-        if right_hand:
-            confidence += 1.0
-            n += 1
-        confidence = confidence / max(n, 1)
-
-        return KeypointResult(
-            body_landmarks=body,
-            left_hand_landmarks=left_hand,
-            right_hand_landmarks=right_hand,
-            face_landmarks=face,
-            inference_time_ms=inference_ms,
-            frame_index=frame_index,
-            confidence=confidence,
-        )
+        n_hands = int(result.hand_present.sum())
+        confidence += n_hands  # hand presence = confident
+        n += n_hands
+        result.confidence = confidence / max(n, 1)
 
     def process_video(
         self,
         video_path: str | Path,
         max_frames: Optional[int] = None,
         skip_frames: int = 0,
+        reuse_result: bool = False,
+        pipelined: bool = False,
+        prefetch: int = 8,
+        convert_thread: bool = True,
+        resize: Optional[int] = None,
     ) -> Generator[KeypointResult, None, None]:
         """
         Process a video file frame by frame.
@@ -153,44 +347,61 @@ class MediaPipeExtractor:
             video_path: Path to video file
             max_frames: Maximum frames to process (None = all)
             skip_frames: Process every Nth frame (0 = every frame)
+            reuse_result: Yield the same KeypointResult, refilled each frame
+                (no per-frame allocation; .copy() any frame you keep)
+            pipelined: Decode (and convert) on background threads while
+                this thread runs inference; results still come in order
+            prefetch: Frames buffered between pipeline stages
+            convert_thread: With pipelined, resize/convert on its own
+                thread rather than the inference thread
+            resize: Shrink frames so the longer side is at most this many
+                pixels before inference (None = full resolution)
 
         Yields:
-            KeypointResult for each processed frame
+            KeypointResult for each processed frame, with decode, convert
+            and inference times
         """
         cap = cv2.VideoCapture(str(video_path))
         if not cap.isOpened():
             raise FileNotFoundError(f"Cannot open video: {video_path}")
 
-        frame_idx = 0
-        processed = 0
+        out = KeypointResult.empty() if reuse_result else None
+        frames = _decode_frames(cap, max_frames, skip_frames)
+        convert = functools.partial(self._convert_frame, resize=resize)
 
-        try:
-            while cap.isOpened():
-                ret, frame = cap.read()
-                if not ret:
-                    break
-
-                if skip_frames > 0 and frame_idx % (skip_frames + 1) != 0:
-                    frame_idx += 1
-                    continue
+        if pipelined:
+            stream = _FramePipeline(frames, convert, prefetch=prefetch, convert_thread=convert_thread)
+        else:
+            stream = _convert_frames(frames, convert)
 
-                yield self.process_frame(frame, frame_idx)
-                processed += 1
-                frame_idx += 1
-
-                if max_frames and processed >= max_frames:
-                    break
+        try:
+            for frame_idx, rgb, decode_ms, convert_ms in stream:
+                yield self._infer(rgb, frame_idx, out, decode_ms, convert_ms)
         finally:
+            stream.close()  # stop the decoder before releasing the capture
             cap.release()
 
-    def benchmark_video(self, video_path: str | Path, max_frames: Optional[int] = None) -> BenchmarkResult:
+    def benchmark_video(
+        self,
+        video_path: str | Path,
+        max_frames: Optional[int] = None,
+        pipelined: bool = False,
+        resize: Optional[int] = None,
+    ) -> BenchmarkResult:
         """
         Run a full benchmark on a video file.
 
+        Args:
+            pipelined: Use process_video(pipelined=True) (threaded decode/convert)
+            resize: Longer-side limit passed to process_video()
+
         Returns:
-            BenchmarkResult with aggregated statistics
+            BenchmarkResult with aggregated statistics, including mean
+            decode / convert / inference time and end-to-end throughput
         """
         inference_times = []
+        decode_times = []
+        convert_times = []
         total_frames = 0
         detected_frames = 0
         hand_detected_frames = 0
@@ -198,14 +409,20 @@ class MediaPipeExtractor:
         hand_completeness = []
         face_completeness = []
 
-        for result in self.process_video(video_path, max_frames=max_frames):
+        start = time.perf_counter()
+        for result in self.process_video(
+            video_path, max_frames=max_frames, reuse_result=True,
+            pipelined=pipelined, resize=resize,
+        ):
             total_frames += 1
             inference_times.append(result.inference_time_ms)
+            decode_times.append(result.decode_time_ms)
+            convert_times.append(result.convert_time_ms)
 
             # Frame detection
-            has_body = len(result.body_landmarks) > 0
-            has_hands = len(result.left_hand_landmarks) > 0 and len(result.right_hand_landmarks) > 0
-            has_any = has_body or has_hands or len(result.face_landmarks) > 0
+            has_body = result.body_present
+            has_hands = bool(result.hand_present.all())
+            has_any = has_body or has_hands or result.face_count > 0
 
             if has_any:
                 detected_frames += 1
@@ -217,7 +434,9 @@ class MediaPipeExtractor:
             hand_completeness.append(
                 (len(result.left_hand_landmarks) + len(result.right_hand_landmarks)) / 42 * 100
             )
-            face_completeness.append(len(result.face_landmarks) / 468 * 100)
+            face_completeness.append(min(result.face_count, 468) / 468 * 100)
+
+        wall_s = time.perf_counter() - start
 
         if total_frames == 0:
             raise ValueError(f"No frames processed from {video_path}")
@@ -232,7 +451,10 @@ class MediaPipeExtractor:
         model_size = size_map.get(self._model_complexity, 26.0)
 
         return BenchmarkResult(
-            model_name=f"MediaPipe Holistic (complexity={self._model_complexity})",
+            model_name=(
+                f"MediaPipe Holistic (complexity={self._model_complexity}"
+                f"{', pipelined' if pipelined else ''})"
+            ),
             total_frames=total_frames,
             detected_frames=detected_frames,
             hand_detected_frames=hand_detected_frames,
@@ -246,6 +468,10 @@ class MediaPipeExtractor:
             ios_compatible=True,
             license="Apache-2.0",
             notes="Supports CoreML via MediaPipe Tasks API. Real-time on iPhone/iPad.",
+            mean_decode_ms=float(np.mean(decode_times)),
+            mean_convert_ms=float(np.mean(convert_times)),
+            throughput_fps=total_frames / wall_s if wall_s > 0 else 0.0,
+            pipelined=pipelined,
         )
 
     def draw_landmarks(self, frame: np.ndarray, result: KeypointResult) -> np.ndarray:
@@ -277,6 +503,10 @@ class MediaPipeExtractor:
 
         return annotated
 
+    def reset(self):
+        """Start a new sequence: drop Holistic's tracking state from the last video."""
+        self.holistic.reset()
+
     def close(self):
         """Release resources."""
         self.holistic.close()
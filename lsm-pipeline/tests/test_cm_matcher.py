@@ -0,0 +1,41 @@
+"""
+Tests for CompiledCMMatcher against the reference match_cm().
+
+The full validate() sweep takes ~15 s, so a fixed random sample of
+feature codes is checked instead, plus the first and last code.
+"""
+import numpy as np
+import pytest
+
+from src.perception.cm_matcher import N_FEATURE_CODES, CompiledCMMatcher
+from src.perception.hand_features import extract_hand_features, extract_hand_features_batch, match_cm
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return CompiledCMMatcher()
+
+
+def test_validate_sample_of_codes(matcher):
+    rng = np.random.default_rng(22)
+    codes = [0, N_FEATURE_CODES - 1, *rng.choice(N_FEATURE_CODES, size=500, replace=False).tolist()]
+    assert matcher.validate(codes=codes) == 0
+
+
+def test_validate_reports_corrupted_rankings():
+    matcher = CompiledCMMatcher()
+    matcher._order[42, [0, 1]] = matcher._order[42, [1, 0]]
+    matcher._half_points[42, 0] += 1
+    assert matcher.validate(codes=[41, 42, 43]) == 1
+
+
+def test_match_and_rank_batch_agree_with_match_cm(matcher):
+    rng = np.random.default_rng(5)
+    keypoints = rng.uniform(0.0, 1.0, size=(100, 21, 3)).astype(np.float32)
+    cm_ids, similarity = matcher.rank_batch(extract_hand_features_batch(keypoints), top_k=5)
+
+    for t in range(len(keypoints)):
+        features = extract_hand_features(keypoints[t])
+        expected = match_cm(features, top_k=5)
+        assert matcher.match(features, top_k=5) == expected
+        assert [(int(i), float(s)) for i, s in zip(cm_ids[t], similarity[t])] == expected
@@ -0,0 +1,192 @@
+"""
+Tests for video discovery, per-video extraction, the resumable manifest
+and process pool of extract_corpus.py.
+"""
+import json
+import os
+
+import numpy as np
+import pytest
+
+from scripts import extract_corpus as ec
+from src.perception.keypoint_schema import LEFT_HAND, RIGHT_HAND, KeypointResult
+
+
+def _job(key: str, size: int = 100) -> dict:
+    return {"key": key, "source": key.split("/")[0], "path": f"/videos/{key}.mp4",
+            "output_rel": f"{key}.npz", "size": size}
+
+
+def _entry(job: dict, status: str) -> dict:
+    return {"key": job["key"], "output": job["output_rel"], "size": job["size"], "status": status}
+
+
+def _write_manifest(path, entries, torn: str = ""):
+    with open(path, "w") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+        f.write(torn)
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"video")
+
+
+def test_discover_keeps_extensions(tmp_path):
+    clips = tmp_path / "clips"
+    for name in ("a.mp4", "a.mov", "sub/a.mp4", "notes.txt"):
+        _touch(clips / name)
+
+    jobs, missing = ec.discover_videos(tmp_path / "none.json", tmp_path, [str(clips)])
+    assert [(job["key"], job["output_rel"]) for job in jobs] == [
+        ("clips/a.mov", "clips/a.mov.npz"),
+        ("clips/a.mp4", "clips/a.mp4.npz"),
+        ("clips/sub/a.mp4", "clips/sub/a.mp4.npz"),
+    ]
+    assert missing == []
+
+
+def test_discover_gives_same_named_dirs_their_own_slug(tmp_path):
+    first, second = tmp_path / "one" / "clips", tmp_path / "two" / "clips"
+    _touch(first / "a.mp4")
+    _touch(second / "a.mp4")
+
+    jobs, _ = ec.discover_videos(tmp_path / "none.json", tmp_path, [str(first), str(second)])
+    assert [(job["key"], job["path"]) for job in jobs] == [
+        ("clips/a.mp4", str(first / "a.mp4")),
+        ("clips_2/a.mp4", str(second / "a.mp4")),
+    ]
+
+
+def test_discover_rejects_duplicate_keys(tmp_path):
+    inventory = tmp_path / "inventory.json"
+    inventory.write_text(json.dumps({"sources": [{"name": "Señas MX"}, {"name": "senas mx"}]}))
+    _touch(tmp_path / "corpus" / "senas_mx" / "a.mp4")
+
+    with pytest.raises(ValueError, match="senas_mx/a.mp4"):
+        ec.discover_videos(inventory, tmp_path / "corpus", [])
+
+
+class FakeExtractor:
+    """MediaPipeExtractor stand-in that refills one KeypointResult per frame."""
+
+    def __init__(self, n_frames: int):
+        self.n_frames = n_frames
+        self.kwargs = None
+
+    def reset(self):
+        pass
+
+    def process_video(self, path, **kwargs):
+        self.kwargs = kwargs
+        result = KeypointResult.empty()
+        for i in range(self.n_frames):
+            result.frame_index = i
+            result.body[:] = i
+            result.hands[:] = -i
+            result.face[:] = 2 * i
+            result.body_present = i % 2 == 0
+            result.hand_present[:] = [i % 3 == 0, i % 5 == 0]
+            result.face_count = 478 if i % 4 else 0
+            result.confidence = i / self.n_frames
+            result.decode_time_ms, result.convert_time_ms, result.inference_time_ms = 0.5, 0.25, 2.0
+            yield result
+
+
+def test_extract_video_copies_reused_results(tmp_path, monkeypatch):
+    n = 300  # past the initial capacity, so the arrays grow
+    extractor = FakeExtractor(n)
+    monkeypatch.setattr(ec, "_extractor", extractor)
+    monkeypatch.setattr(ec, "_worker_options", {
+        "output_dir": str(tmp_path), "max_frames": None, "skip_frames": 0,
+        "pipelined": False, "resize": None, "compress": False,
+    })
+    job = _job("src/clip.mp4")
+    entry = ec.extract_video(job)
+
+    assert entry["status"] == "done", entry["error"]
+    assert extractor.kwargs["reuse_result"] is True
+    frames = np.arange(n)
+    assert entry["frames"] == n
+    assert entry["hand_frames"] == int(((frames % 3 == 0) | (frames % 5 == 0)).sum())
+    assert (entry["decode_ms"], entry["convert_ms"], entry["inference_ms"]) == (150.0, 75.0, 600.0)
+
+    with np.load(tmp_path / job["output_rel"]) as data:
+        assert {name: data[name].shape[1:] for name in data} == {
+            name: shape for name, (shape, _) in ec.KEYPOINT_FIELDS.items()
+        }
+        np.testing.assert_array_equal(data["frame_index"], frames)
+        np.testing.assert_array_equal(data["body"][:, 0, 0], frames)
+        np.testing.assert_array_equal(data["hands"][:, RIGHT_HAND, 20, 2], -frames)
+        np.testing.assert_array_equal(data["face"][:, 477, 1], 2 * frames)
+        np.testing.assert_array_equal(data["body_present"], frames % 2 == 0)
+        np.testing.assert_array_equal(data["hand_present"][:, LEFT_HAND], frames % 3 == 0)
+        np.testing.assert_array_equal(data["face_count"], np.where(frames % 4, 478, 0))
+        np.testing.assert_allclose(data["confidence"], frames / n)
+
+
+def test_resume_from_manifest(tmp_path):
+    done, missing_output, resized, failed, retried, torn = (
+        _job(f"src/{name}") for name in ("done", "missing", "resized", "failed", "retried", "torn")
+    )
+    jobs = [done, missing_output, resized, failed, retried, torn]
+    for job in (done, resized, retried):
+        path = tmp_path / job["output_rel"]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"npz")
+
+    manifest_path = tmp_path / ec.MANIFEST_NAME
+    _write_manifest(manifest_path, [
+        _entry(done, "done"),
+        _entry(missing_output, "done"),
+        _entry(resized, "done"),
+        _entry(failed, "failed"),
+        _entry(retried, "failed"),
+        _entry(retried, "done"),  # the latest entry wins
+    ], torn=json.dumps(_entry(torn, "done"))[:25])
+    resized["size"] = 200  # the video changed since it was extracted
+
+    manifest = ec.load_manifest(manifest_path)
+    assert sorted(manifest) == sorted(job["key"] for job in (done, missing_output, resized,
+                                                              failed, retried))
+
+    pending, n_done, n_skipped = ec.pending_jobs(jobs, manifest, tmp_path, skip_failed=False)
+    assert [job["key"] for job in pending] == [missing_output["key"], resized["key"],
+                                               failed["key"], torn["key"]]
+    assert (n_done, n_skipped) == (2, 0)
+
+    pending, n_done, n_skipped = ec.pending_jobs(jobs, manifest, tmp_path, skip_failed=True)
+    assert failed not in pending
+    assert (n_done, n_skipped) == (2, 1)
+
+
+def test_append_after_torn_line(tmp_path):
+    torn, job = _job("src/torn"), _job("src/next")
+    manifest_path = tmp_path / ec.MANIFEST_NAME
+    _write_manifest(manifest_path, [], torn=json.dumps(_entry(torn, "done"))[:25])
+
+    with ec.open_manifest(manifest_path) as manifest:
+        manifest.write(json.dumps(_entry(job, "done")) + "\n")
+    with ec.open_manifest(manifest_path) as manifest:  # intact file: nothing added
+        pass
+
+    assert list(ec.load_manifest(manifest_path)) == [job["key"]]
+    assert manifest_path.read_text().count("\n") == 2
+
+
+def _echo_or_crash(job: dict) -> dict:
+    """Worker stand-in: dies outright on the "crash" job."""
+    if job["key"].endswith("crash"):
+        os._exit(1)
+    return {"key": job["key"], "status": "done", "frames": 1}
+
+
+def test_run_jobs_survives_a_dead_worker():
+    jobs = [_job("src/first"), _job("src/crash"), _job("src/last")]
+    entries = list(ec.run_jobs(jobs, workers=1, options={}, fn=_echo_or_crash))
+
+    assert [(e["key"], e["status"]) for e in entries] == [
+        ("src/first", "done"), ("src/crash", "failed"), ("src/last", "done"),
+    ]
+    assert entries[1]["error"].startswith("BrokenProcessPool")
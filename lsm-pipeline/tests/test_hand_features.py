@@ -0,0 +1,41 @@
+"""
+Parity tests: extract_hand_features_batch() against extract_hand_features().
+"""
+import numpy as np
+import pytest
+
+from src.perception.hand_features import (
+    FLEXION_LEVELS,
+    extract_hand_features,
+    extract_hand_features_batch,
+)
+
+
+def _sequence(n_frames: int = 400, seed: int = 7) -> np.ndarray:
+    """Random (T, 21, 3) hands plus degenerate frames (collapsed and zero)."""
+    rng = np.random.default_rng(seed)
+    keypoints = rng.uniform(0.0, 1.0, size=(n_frames, 21, 3)).astype(np.float32)
+    keypoints[::50] = 0.0
+    keypoints[1::50] = keypoints[1::50, :1]  # every landmark on the wrist
+    return keypoints
+
+
+def test_batch_matches_per_frame():
+    keypoints = _sequence()
+    confidence = np.linspace(0.0, 1.0, len(keypoints))
+    batch = extract_hand_features_batch(keypoints, confidence)
+
+    assert len(batch) == len(keypoints)
+    for t in range(len(keypoints)):
+        landmarks = [tuple(p) for p in keypoints[t].tolist()]
+        assert batch.frame(t) == extract_hand_features(landmarks, float(confidence[t])), t
+
+
+def test_batch_covers_every_flexion_level():
+    batch = extract_hand_features_batch(_sequence())
+    assert set(np.unique(batch.levels)) == set(range(len(FLEXION_LEVELS)))
+
+
+def test_batch_rejects_wrong_shape():
+    with pytest.raises(ValueError, match=r"\(T, 21, 3\)"):
+        extract_hand_features_batch(np.zeros((4, 20, 3)))
@@ -0,0 +1,212 @@
+"""
+Tests for the array-backed KeypointResult and its consumers.
+
+The extractor fills one set of buffers in place and (with reuse_result)
+refills them on the next frame, so these check the presence flags, the
+views of missing parts, and that downstream features don't keep
+references into a buffer that is about to be overwritten.
+"""
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.perception.body_features import BodyPoseAnalyzer
+from src.perception.face_features import extract_non_manual_features
+from src.perception.hand_pipeline import HandPipeline, TemporalSmoother
+from src.perception.keypoint_schema import LEFT_HAND, RIGHT_HAND, KeypointResult
+from src.perception.mediapipe_extractor import MediaPipeExtractor, _fill_landmarks
+
+
+def _landmarks(points: np.ndarray) -> SimpleNamespace:
+    """MediaPipe-style landmark list from an (n, 3) or (n, 4) array."""
+    rows = [
+        SimpleNamespace(x=p[0], y=p[1], z=p[2], visibility=p[3] if len(p) > 3 else 0.0)
+        for p in points.tolist()
+    ]
+    return SimpleNamespace(landmark=rows)
+
+
+def _holistic(body=None, left=None, right=None, face=None) -> SimpleNamespace:
+    """Holistic output with the given parts (None = not detected)."""
+    return SimpleNamespace(
+        pose_landmarks=None if body is None else _landmarks(body),
+        left_hand_landmarks=None if left is None else _landmarks(left),
+        right_hand_landmarks=None if right is None else _landmarks(right),
+        face_landmarks=None if face is None else _landmarks(face),
+    )
+
+
+def _points(shape, seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).uniform(0.1, 0.9, size=shape).astype(np.float32)
+
+
+# ── _fill_landmarks / _fill_result ───────────────────────────────────────────
+
+def test_fill_landmarks_writes_rows_in_place():
+    out = np.full((5, 3), -1.0, dtype=np.float32)
+    points = _points((3, 3), seed=0)
+    assert _fill_landmarks(out, _landmarks(points)) == 3
+    np.testing.assert_array_equal(out[:3], points)
+    assert (out[3:] == -1.0).all()  # rows past the detection are left alone
+    assert _fill_landmarks(out, None) == 0
+
+
+def test_fill_landmarks_truncates_to_buffer():
+    out = np.zeros((2, 4), dtype=np.float32)
+    points = _points((4, 4), seed=1)
+    assert _fill_landmarks(out, _landmarks(points), with_visibility=True) == 2
+    np.testing.assert_array_equal(out, points[:2])
+
+
+def test_fill_result_sets_presence_and_confidence():
+    body = _points((33, 4), seed=2)
+    right = _points((21, 3), seed=3)
+    face = _points((478, 3), seed=4)
+    result = KeypointResult.empty()
+    MediaPipeExtractor._fill_result(result, _holistic(body=body, right=right, face=face))
+
+    assert result.body_present
+    assert result.hand_present.tolist() == [False, True]
+    assert result.face_count == 478
+    np.testing.assert_array_equal(result.body, body)
+    np.testing.assert_array_equal(result.hands[RIGHT_HAND], right)
+    np.testing.assert_array_equal(result.face, face)
+    assert np.isclose(result.confidence, (float(body[:, 3].mean()) + 1) / 2)
+
+
+def test_fill_result_clears_presence_of_parts_that_disappear():
+    result = KeypointResult.empty()
+    MediaPipeExtractor._fill_result(result, _holistic(
+        body=_points((33, 4), seed=5),
+        left=_points((21, 3), seed=6),
+        right=_points((21, 3), seed=7),
+        face=_points((478, 3), seed=8),
+    ))
+    # Next frame: only a face without iris rows; the old rows stay in the buffers
+    face = _points((468, 3), seed=9)
+    MediaPipeExtractor._fill_result(result, _holistic(face=face))
+
+    assert not result.body_present
+    assert not result.hand_present.any()
+    assert result.face_count == 468
+    assert result.confidence == 0.0
+    assert result.body_landmarks.shape == (0, 4)
+    assert result.left_hand_landmarks.shape == (0, 3)
+    assert result.right_hand_landmarks.shape == (0, 3)
+    assert result.left_hand is None and result.right_hand is None
+    np.testing.assert_array_equal(result.face_landmarks, face)
+
+
+def test_fill_result_rejects_partial_body_and_hands():
+    result = KeypointResult.empty()
+    MediaPipeExtractor._fill_result(result, _holistic(
+        body=_points((20, 4), seed=10), left=_points((5, 3), seed=11),
+    ))
+    assert not result.body_present
+    assert not result.hand_present[LEFT_HAND]
+
+
+# ── Views ────────────────────────────────────────────────────────────────────
+
+def test_views_of_an_empty_result():
+    result = KeypointResult.empty()
+    assert len(result.body_landmarks) == 0
+    assert len(result.left_hand_landmarks) == 0
+    assert len(result.right_hand_landmarks) == 0
+    assert len(result.face_landmarks) == 0
+    assert result.left_hand is None and result.right_hand is None
+
+
+def test_views_share_the_buffers_and_copy_does_not():
+    result = KeypointResult.empty()
+    result.hand_present[LEFT_HAND] = True
+    assert result.left_hand.shape == (21, 3)
+    assert np.shares_memory(result.left_hand, result.hands)
+    assert result.left_hand_landmarks.shape == (21, 3)
+    assert result.right_hand is None
+
+    kept = result.copy()
+    result.hands[:] = 1.0
+    result.hand_present[:] = False
+    assert kept.hand_present[LEFT_HAND]
+    assert (kept.left_hand == 0.0).all()
+
+
+# ── Consumers ────────────────────────────────────────────────────────────────
+
+def _assert_same_hands(a, b):
+    for hand_a, hand_b in [(a.dominant_hand, b.dominant_hand),
+                           (a.non_dominant_hand, b.non_dominant_hand)]:
+        assert (hand_a is None) == (hand_b is None)
+        if hand_a is None:
+            continue
+        assert hand_a.handedness == hand_b.handedness
+        assert np.isclose(hand_a.handedness_score, hand_b.handedness_score)
+        np.testing.assert_allclose(hand_a.raw, hand_b.raw, rtol=1e-6)
+        np.testing.assert_allclose(hand_a.normalized, hand_b.normalized, rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(hand_a.wrist_position, hand_b.wrist_position, rtol=1e-6)
+    assert a.both_hands_detected == b.both_hands_detected
+
+
+def test_process_result_matches_list_input():
+    array_pipeline = HandPipeline()
+    list_pipeline = HandPipeline()
+    result = KeypointResult.empty()
+    for t in range(6):
+        left = _points((21, 3), seed=20 + t) if t != 3 else None
+        right = _points((21, 3), seed=40 + t)
+        MediaPipeExtractor._fill_result(result, _holistic(left=left, right=right))
+
+        from_array = array_pipeline.process_result(result)
+        from_lists = list_pipeline.process_keypoints(
+            None if left is None else [tuple(p) for p in left.tolist()],
+            [tuple(p) for p in right.tolist()],
+        )
+        _assert_same_hands(from_array, from_lists)
+
+
+def test_smoother_does_not_alias_a_refilled_buffer():
+    buffer = _points((21, 3), seed=50)
+    first = buffer.copy()
+    smoother = TemporalSmoother()
+    smoothed = smoother.smooth(buffer)
+
+    buffer[:] = 0.0  # the extractor refills it with the next frame
+    np.testing.assert_array_equal(smoothed, first)
+    np.testing.assert_array_equal(smoother._last_smoothed, first)
+
+
+def test_body_anchors_do_not_alias_a_refilled_buffer():
+    result = KeypointResult.empty()
+    MediaPipeExtractor._fill_result(result, _holistic(body=_points((33, 4), seed=51)))
+    anchors = BodyPoseAnalyzer().compute_body_anchors(result.body_landmarks)
+    positions = {name: anchor.position.copy() for name, anchor in anchors.items()}
+
+    MediaPipeExtractor._fill_result(result, _holistic(body=_points((33, 4), seed=52)))
+    for name, anchor in anchors.items():
+        np.testing.assert_array_equal(anchor.position, positions[name], err_msg=name)
+
+
+def test_body_anchors_for_a_missing_body():
+    assert BodyPoseAnalyzer().compute_body_anchors(KeypointResult.empty().body_landmarks) == {}
+
+
+def test_non_manual_features_with_refined_face():
+    face = _points((478, 3), seed=60)
+    result = KeypointResult.empty()
+    MediaPipeExtractor._fill_result(result, _holistic(face=face))
+
+    features = extract_non_manual_features(result.face_landmarks)
+    assert features.eye_gaze.has_iris_data
+    assert features.confidence == 1.0
+    from_lists = extract_non_manual_features([tuple(p) for p in face.tolist()])
+    assert features.eyebrows == from_lists.eyebrows
+    assert features.mouth == from_lists.mouth
+    assert features.head_pose == from_lists.head_pose
+    assert features.eye_gaze.gaze_direction == from_lists.eye_gaze.gaze_direction
+    np.testing.assert_allclose(features.eye_gaze.left_iris_offset,
+                               from_lists.eye_gaze.left_iris_offset, rtol=1e-6)
+
+    # Without iris rows gaze falls back; with no face the defaults come back
+    assert not extract_non_manual_features(face[:468]).eye_gaze.has_iris_data
+    assert extract_non_manual_features(KeypointResult.empty().face_landmarks).confidence == 0.0
@@ -0,0 +1,233 @@
+"""
+Tests for the frame decode pipeline in mediapipe_extractor.
+
+OpenCV and MediaPipe are not needed: a fake capture stands in for
+cv2.VideoCapture and a fake Holistic for mp.solutions.holistic, so the
+threading and frame bookkeeping are tested on their own. Each fake
+frame is filled with its frame index, which the fake Holistic reports
+back as a landmark coordinate.
+"""
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.perception import mediapipe_extractor as mpe
+from src.perception.keypoint_schema import LEFT_HAND
+
+
+class FakeCapture:
+    """cv2.VideoCapture over n_frames (< 256) in-memory frames; fail_at raises on that grab."""
+
+    def __init__(self, n_frames: int, fail_at: int | None = None):
+        self.frames = [np.full((4, 6, 3), i, dtype=np.uint8) for i in range(n_frames)]
+        self.fail_at = fail_at
+        self.pos = 0
+        self.grabs = 0
+        self.retrieves = 0
+        self.released = False
+
+    def isOpened(self) -> bool:
+        return True
+
+    def grab(self) -> bool:
+        if self.released:
+            raise RuntimeError("grab() after release()")
+        if self.fail_at is not None and self.pos == self.fail_at:
+            raise RuntimeError(f"decode error at frame {self.pos}")
+        if self.pos >= len(self.frames):
+            return False
+        self.pos += 1
+        self.grabs += 1
+        return True
+
+    def retrieve(self):
+        self.retrieves += 1
+        return True, self.frames[self.pos - 1].copy()
+
+    def release(self):
+        self.released = True
+
+
+class FakeHolistic:
+    """mp.solutions.holistic.Holistic: one left hand whose x is the pixel value."""
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.seen = []
+        self.closed = False
+
+    def process(self, rgb):
+        value = float(rgb[0, 0, 0])
+        self.seen.append(value)
+        hand = SimpleNamespace(landmark=[SimpleNamespace(x=value, y=0.5, z=0.0)] * 21)
+        return SimpleNamespace(
+            pose_landmarks=None,
+            left_hand_landmarks=hand,
+            right_hand_landmarks=None,
+            face_landmarks=None,
+        )
+
+    def reset(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def _identity_convert(frame):
+    return frame, 0.0
+
+
+def _indices(stream):
+    return [frame_idx for frame_idx, *_ in stream]
+
+
+@pytest.fixture
+def fake_backends(monkeypatch):
+    """Patch cv2 and mediapipe in mediapipe_extractor; returns the captures opened."""
+    captures = []
+
+    def video_capture(path):
+        captures.append(FakeCapture(int(path)))
+        return captures[-1]
+
+    fake_cv2 = SimpleNamespace(
+        VideoCapture=video_capture,
+        cvtColor=lambda frame, code: frame[..., ::-1].copy(),
+        resize=lambda frame, size, interpolation=None: frame[: size[1], : size[0]].copy(),
+        COLOR_BGR2RGB=4,
+        INTER_AREA=3,
+    )
+    fake_mp = SimpleNamespace(solutions=SimpleNamespace(
+        holistic=SimpleNamespace(Holistic=FakeHolistic),
+        drawing_utils=None,
+    ))
+    monkeypatch.setattr(mpe, "cv2", fake_cv2, raising=False)
+    monkeypatch.setattr(mpe, "mp", fake_mp, raising=False)
+    monkeypatch.setattr(mpe, "HAS_CV2", True)
+    monkeypatch.setattr(mpe, "HAS_MEDIAPIPE", True)
+    return captures
+
+
+# ── _decode_frames ───────────────────────────────────────────────────────────
+
+def test_decode_frames_grabs_skipped_frames_without_retrieving():
+    cap = FakeCapture(10)
+    frames = list(mpe._decode_frames(cap, max_frames=None, skip_frames=2))
+    assert [i for i, _, _ in frames] == [0, 3, 6, 9]
+    assert all(frame[0, 0, 0] == i for i, frame, _ in frames)
+    assert cap.grabs == 10
+    assert cap.retrieves == 4
+
+
+def test_decode_frames_stops_at_max_frames():
+    cap = FakeCapture(10)
+    frames = list(mpe._decode_frames(cap, max_frames=2, skip_frames=2))
+    assert [i for i, _, _ in frames] == [0, 3]
+    assert cap.retrieves == 2
+
+
+# ── _FramePipeline ───────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("convert_thread", [True, False])
+def test_pipeline_keeps_frame_order(convert_thread):
+    cap = FakeCapture(50)
+    pipeline = mpe._FramePipeline(
+        mpe._decode_frames(cap, None, 0), _identity_convert,
+        prefetch=2, convert_thread=convert_thread,
+    )
+    try:
+        frames = list(pipeline)
+    finally:
+        pipeline.close()
+    assert [i for i, _, _, _ in frames] == list(range(50))
+    assert all(rgb[0, 0, 0] == i for i, rgb, _, _ in frames)
+
+
+@pytest.mark.parametrize("convert_thread", [True, False])
+def test_pipeline_reraises_decode_errors(convert_thread):
+    cap = FakeCapture(20, fail_at=5)
+    pipeline = mpe._FramePipeline(
+        mpe._decode_frames(cap, None, 0), _identity_convert,
+        prefetch=2, convert_thread=convert_thread,
+    )
+    seen = []
+    try:
+        with pytest.raises(RuntimeError, match="decode error at frame 5"):
+            for frame_idx, *_ in pipeline:
+                seen.append(frame_idx)
+    finally:
+        pipeline.close()
+    assert seen == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("convert_thread", [True, False])
+def test_pipeline_reraises_convert_errors(convert_thread):
+    def convert(frame):
+        if frame[0, 0, 0] == 3:
+            raise ValueError("bad frame")
+        return frame, 0.0
+
+    pipeline = mpe._FramePipeline(
+        mpe._decode_frames(FakeCapture(10), None, 0), convert,
+        prefetch=2, convert_thread=convert_thread,
+    )
+    try:
+        with pytest.raises(ValueError, match="bad frame"):
+            list(pipeline)
+    finally:
+        pipeline.close()
+
+
+@pytest.mark.parametrize("convert_thread", [True, False])
+def test_pipeline_close_stops_threads_early(convert_thread):
+    cap = FakeCapture(200)
+    before = set(threading.enumerate())
+    pipeline = mpe._FramePipeline(
+        mpe._decode_frames(cap, None, 0), _identity_convert,
+        prefetch=2, convert_thread=convert_thread,
+    )
+    stream = iter(pipeline)
+    assert _indices([next(stream) for _ in range(3)]) == [0, 1, 2]
+    pipeline.close()
+
+    assert not any(t.is_alive() for t in set(threading.enumerate()) - before)
+    # Decoding stopped within a few prefetch buffers of the consumer
+    grabs = cap.grabs
+    assert grabs < 20
+    cap.release()  # safe: no thread touches the capture any more
+    assert cap.grabs == grabs
+
+
+# ── process_video ────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("pipelined", [False, True])
+def test_process_video_feeds_frames_in_order(fake_backends, pipelined):
+    extractor = mpe.MediaPipeExtractor()
+    results = [
+        (r.frame_index, float(r.hands[LEFT_HAND][0, 0]), bool(r.hand_present[LEFT_HAND]))
+        for r in extractor.process_video("12", skip_frames=1, pipelined=pipelined, prefetch=2)
+    ]
+    assert results == [(i, float(i), True) for i in range(0, 12, 2)]
+    assert extractor.holistic.seen == [float(i) for i in range(0, 12, 2)]
+    cap, = fake_backends
+    assert cap.grabs == 12 and cap.retrieves == 6
+    assert cap.released
+
+
+@pytest.mark.parametrize("pipelined", [False, True])
+def test_process_video_early_close_releases_capture(fake_backends, pipelined):
+    extractor = mpe.MediaPipeExtractor()
+    before = set(threading.enumerate())
+    stream = extractor.process_video("200", reuse_result=True, pipelined=pipelined, prefetch=2)
+    first = next(stream)
+    assert first.frame_index == 0
+    assert next(stream) is first  # reuse_result refills one KeypointResult
+    stream.close()
+
+    cap, = fake_backends
+    assert cap.released
+    assert cap.grabs < 20
+    assert not any(t.is_alive() for t in set(threading.enumerate()) - before)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+backrAI Brand Index Benchmark
+Compares match_code_to_brand() over a plain brand list (linear scan)
+against a prebuilt BrandIndex as the brands table grows.
+
+Checks that both return the same brand for every code, then reports
+per-code matching time and the one-off index build time.
+
+Usage:
+  python benchmark_brand_index.py
+  python benchmark_brand_index.py --sizes 100,1000,10000 --codes 500
+"""
+
+import argparse
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from code_extractor import BrandIndex, match_code_to_brand
+from synthetic_corpus import make_brands, make_codes
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark code→brand matching")
+    parser.add_argument("--sizes", type=str, default="10,100,1000,5000", help="Comma-separated brand counts")
+    parser.add_argument("--codes", type=int, default=300, help="Codes matched per size (default: 300)")
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print("📊 Brand Index Benchmark")
+    print("=" * 72)
+    print(f"  {'brands':>7}  {'linear/code':>12}  {'index/code':>11}  {'speedup':>8}  {'build':>9}")
+
+    for size in [int(s) for s in args.sizes.split(",")]:
+        brands = make_brands(size)
+        pairs = make_codes(brands, args.codes)
+
+        start = time.perf_counter()
+        index = BrandIndex(brands)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        linear = [match_code_to_brand(code, context, brands) for code, context in pairs]
+        linear_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        indexed = [index.match(code, context) for code, context in pairs]
+        index_time = time.perf_counter() - start
+
+        if any(a is not b for a, b in zip(linear, indexed)):
+            print(f"❌ BrandIndex disagrees with linear scan at {size} brands")
+            sys.exit(1)
+
+        per_linear = linear_time / len(pairs) * 1e6
+        per_index = index_time / len(pairs) * 1e6
+        print(
+            f"  {size:>7}  {per_linear:>10.1f}µs  {per_index:>9.1f}µs  "
+            f"{per_linear / per_index:>7.1f}x  {build * 1000:>7.1f}ms"
+        )
+
+    print("✅ BrandIndex matched the linear scan for every code")
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+backrAI Code Extractor Benchmark
+Compares the precompiled extractor in code_extractor.py against the
+original implementation on long synthetic podcast transcripts.
+
+Checks that both return the same codes in the same order, then reports
+timings. One intentional difference is expected and only reported:
+context is taken around the occurrence that matched, whereas the old
+code used the first substring hit anywhere in the text.
+
+Usage:
+  python benchmark_code_extractor.py
+  python benchmark_code_extractor.py --hours 4 --repeat 5
+"""
+
+import argparse
+import re
+import sys
+import os
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from code_extractor import (
+    BRAND_CODE_PREFIXES,
+    FALSE_POSITIVES,
+    _looks_like_real_code,
+    extract_codes_from_text,
+    extract_codes_with_context,
+)
+from synthetic_corpus import make_transcript
+
+
+# ---------------------------------------------------------------------------
+# Reference implementation (the original five-pass extractor)
+# ---------------------------------------------------------------------------
+def legacy_extract_codes_from_text(text: str) -> List[str]:
+    if not text:
+        return []
+
+    codes = []
+    pattern1 = re.compile(
+        r'(?:code|promo|discount|coupon)[\s:]*["\']?([A-Z0-9]{3,25})["\']?',
+        re.IGNORECASE,
+    )
+    codes.extend(pattern1.findall(text))
+    pattern2 = re.compile(
+        r'(?:use|enter|try|apply|redeem)[\s]+(?:code|promo|my\s+code)?[\s:]*["\']?([A-Z0-9]{3,25})["\']?',
+        re.IGNORECASE,
+    )
+    codes.extend(pattern2.findall(text))
+    pattern3 = re.compile(
+        r'(?:\d+%?\s*off|discount)\s+(?:with|using|code)\s+["\']?([A-Z0-9]{3,25})["\']?',
+        re.IGNORECASE,
+    )
+    codes.extend(pattern3.findall(text))
+    pattern4 = re.compile(r'\b([A-Z]{2,}[0-9]+[A-Z0-9]*)\b')
+    codes.extend(pattern4.findall(text.upper()))
+    pattern5 = re.compile(
+        r'(?:https?://)?[\w.-]+\.[\w]+/([A-Z][A-Z0-9]{3,15})\b',
+        re.IGNORECASE,
+    )
+    for code in pattern5.findall(text):
+        upper = code.upper()
+        if upper not in FALSE_POSITIVES and len(code) >= 4:
+            if not _looks_like_real_code(upper):
+                continue
+            codes.append(code)
+
+    unique_codes = set()
+    result = []
+    for code in codes:
+        cleaned = code.upper().strip().strip("'\"")
+        if not cleaned or cleaned in unique_codes or cleaned in FALSE_POSITIVES:
+            continue
+        if not (4 <= len(cleaned) <= 20):
+            continue
+        if not cleaned.isalnum():
+            continue
+        if not _looks_like_real_code(cleaned):
+            continue
+        if cleaned.isalpha() and len(cleaned) <= 6:
+            if not any(cleaned.startswith(p) for p in BRAND_CODE_PREFIXES):
+                continue
+        unique_codes.add(cleaned)
+        result.append(cleaned)
+    return result
+
+
+def legacy_guess_brand_from_code(code: str, context: str) -> Optional[str]:
+    code_upper = code.upper()
+    for prefix in BRAND_CODE_PREFIXES:
+        if code_upper.startswith(prefix):
+            return prefix.title()
+    if context:
+        brand_pattern = re.compile(
+            r'(?:at|for|from|on)\s+([A-Z][A-Za-z0-9\s]{2,20}?)(?:\s+|[,.\-!])',
+            re.IGNORECASE,
+        )
+        match = brand_pattern.search(context)
+        if match:
+            brand_guess = match.group(1).strip()
+            if brand_guess.upper() not in FALSE_POSITIVES and len(brand_guess) >= 3:
+                return brand_guess
+    return None
+
+
+def legacy_extract_codes_with_context(text: str) -> List[Dict[str, str]]:
+    if not text:
+        return []
+    codes = legacy_extract_codes_from_text(text)
+    results = []
+    text_upper = text.upper()
+    for code in codes:
+        idx = text_upper.find(code)
+        if idx == -1:
+            idx = text.upper().find(code.upper())
+        if idx >= 0:
+            start = max(0, idx - 150)
+            end = min(len(text), idx + len(code) + 150)
+            context = text[start:end].strip()
+        else:
+            context = ""
+        results.append({
+            "code": code,
+            "context": context,
+            "probable_brand": legacy_guess_brand_from_code(code, context),
+        })
+    return results
+
+
+def _best_of(fn, text: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark code extraction")
+    parser.add_argument("--hours", type=float, default=3.0, help="Transcript length in hours (default: 3)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per implementation, best is reported (default: 3)")
+    args = parser.parse_args()
+
+    text = make_transcript(args.hours)
+    print("=" * 60)
+    print("📊 Code Extractor Benchmark")
+    print(f"  Transcript: {args.hours:g}h, {len(text):,} chars")
+    print("=" * 60)
+
+    legacy = {r["code"]: r for r in legacy_extract_codes_with_context(text)}
+    current = {r["code"]: r for r in extract_codes_with_context(text)}
+    if list(legacy) != list(current):
+        print("❌ Codes differ from the reference implementation")
+        print(f"   only legacy:  {sorted(set(legacy) - set(current))}")
+        print(f"   only current: {sorted(set(current) - set(legacy))}")
+        print(f"   legacy order:  {list(legacy)}")
+        print(f"   current order: {list(current)}")
+        sys.exit(1)
+    print(f"✅ Same codes as reference ({len(current)} codes)")
+    moved = sorted(c for c in current if legacy[c]["context"] != current[c]["context"])
+    if moved:
+        print(f"   Context taken at the matched occurrence for: {', '.join(moved)}")
+
+    for label, old_fn, new_fn in [
+        ("extract_codes_from_text", legacy_extract_codes_from_text, extract_codes_from_text),
+        ("extract_codes_with_context", legacy_extract_codes_with_context, extract_codes_with_context),
+    ]:
+        old = _best_of(old_fn, text, args.repeat)
+        new = _best_of(new_fn, text, args.repeat)
+        print(f"  {label:<28} legacy {old * 1000:8.1f} ms   precompiled {new * 1000:8.1f} ms   {old / new:5.2f}x")
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+backrAI Text Pipeline Benchmark Suite
+Times the scraper's text-processing functions on the deterministic
+synthetic corpus (synthetic_corpus.py) and writes the results to JSON so
+runs from different commits can be compared.
+
+Measured:
+  - extract_codes_from_text / extract_codes_with_context on full videos
+    (title + description + transcript), one long transcript and
+    adversarial hash-heavy text
+  - extract_brand_indicators on descriptions
+  - BrandIndex build and match_code_to_brand against brand tables of 10
+    to 100k rows (plus the plain-list scan up to --linear-max brands)
+
+Each case reports best-of-N wall time, throughput (MB/s and videos/s or
+codes/s) and peak traced memory (tracemalloc, measured on a separate run).
+
+Usage:
+  python benchmark_suite.py
+  python benchmark_suite.py --quick
+  python benchmark_suite.py --compare .cache/benchmarks/<earlier run>.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from code_extractor import (
+    BrandIndex,
+    extract_brand_indicators,
+    extract_codes_from_text,
+    extract_codes_with_context,
+    match_code_to_brand,
+)
+from synthetic_corpus import (
+    make_adversarial_text,
+    make_brands,
+    make_codes,
+    make_transcript,
+    make_videos,
+)
+
+DEFAULT_OUTPUT_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".cache", "benchmarks"
+)
+
+MB = 1024 * 1024
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=10,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def measure(
+    name: str,
+    corpus: str,
+    fn: Callable[[], int],
+    repeat: int,
+    size_bytes: int = 0,
+    units: int = 0,
+    unit: str = "videos",
+) -> Dict:
+    """
+    Best-of-`repeat` timing plus one traced run for peak memory.
+    fn returns a count (codes found, matches, ...) reported as "found".
+    """
+    timings = []
+    found = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        found = fn()
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        "name": f"{name}[{corpus}]",
+        "function": name,
+        "corpus": corpus,
+        "seconds": best,
+        "mb_per_s": size_bytes / MB / best if size_bytes and best else None,
+        "units_per_s": units / best if units and best else None,
+        "unit": unit,
+        "peak_kb": peak / 1024,
+        "found": found,
+    }
+    throughput = []
+    if result["mb_per_s"] is not None:
+        throughput.append(f"{result['mb_per_s']:8.1f} MB/s")
+    if result["units_per_s"] is not None:
+        throughput.append(f"{result['units_per_s']:10.0f} {unit}/s")
+    print(
+        f"  {result['name']:<52} {best * 1000:9.1f} ms  "
+        f"{'  '.join(throughput):<32} peak {result['peak_kb']:9.0f} KB"
+    )
+    return result
+
+
+def run_suite(args) -> List[Dict]:
+    results = []
+
+    # ── Code extraction ──────────────────────────────────────────────
+    videos = make_videos(args.videos, transcript_minutes=args.transcript_minutes)
+    combined = [
+        "\n\n".join([v["title"], v["description"], v["transcript"]]) for v in videos
+    ]
+    combined_bytes = sum(len(t.encode()) for t in combined)
+    transcript = make_transcript(args.hours)
+    adversarial = make_adversarial_text(args.adversarial_kb * 1024)
+
+    print(
+        f"\n  Corpus: {len(videos)} videos ({combined_bytes / MB:.1f} MB), "
+        f"{args.hours:g}h transcript ({len(transcript) / 1024:.0f} KB), "
+        f"{args.adversarial_kb} KB adversarial text\n"
+    )
+
+    for fn in (extract_codes_from_text, extract_codes_with_context):
+        results.append(measure(
+            fn.__name__, "videos",
+            lambda fn=fn: sum(len(fn(t)) for t in combined),
+            args.repeat, combined_bytes, len(combined),
+        ))
+        results.append(measure(
+            fn.__name__, f"transcript_{args.hours:g}h",
+            lambda fn=fn: len(fn(transcript)),
+            args.repeat, len(transcript.encode()), 1,
+        ))
+        results.append(measure(
+            fn.__name__, "adversarial",
+            lambda fn=fn: len(fn(adversarial)),
+            args.repeat, len(adversarial.encode()),
+        ))
+
+    descriptions = [v["description"] for v in videos]
+    results.append(measure(
+        "extract_brand_indicators", "descriptions",
+        lambda: sum(len(extract_brand_indicators(d)) for d in descriptions),
+        args.repeat, sum(len(d.encode()) for d in descriptions), len(descriptions),
+    ))
+
+    # ── Brand matching ───────────────────────────────────────────────
+    print()
+    for size in args.brand_sizes:
+        brands = make_brands(size)
+        pairs = make_codes(brands, args.codes)
+        index = BrandIndex(brands)
+
+        results.append(measure(
+            "BrandIndex", f"brands_{size}",
+            lambda brands=brands: len(BrandIndex(brands)),
+            1, units=size, unit="brands",
+        ))
+        results.append(measure(
+            "match_code_to_brand", f"index_{size}",
+            lambda index=index, pairs=pairs: sum(
+                match_code_to_brand(code, context, index) is not None
+                for code, context in pairs
+            ),
+            args.repeat, units=len(pairs), unit="codes",
+        ))
+        if size <= args.linear_max:
+            results.append(measure(
+                "match_code_to_brand", f"list_{size}",
+                lambda brands=brands, pairs=pairs: sum(
+                    match_code_to_brand(code, context, brands) is not None
+                    for code, context in pairs
+                ),
+                args.repeat, units=len(pairs), unit="codes",
+            ))
+
+    return results
+
+
+def compare(results: List[Dict], baseline_path: str, tolerance: float) -> bool:
+    """Print time ratios against a previous run. Returns False on regressions."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    old = {r["name"]: r for r in baseline.get("results", [])}
+
+    print(f"\n  Compared with {baseline.get('commit') or '?'} ({baseline_path}):")
+    ok = True
+    for result in results:
+        before = old.get(result["name"])
+        if not before or not before["seconds"]:
+            continue
+        ratio = result["seconds"] / before["seconds"]
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  ❌ slower"
+            ok = False
+        elif ratio < 1 - tolerance:
+            flag = "  ✅ faster"
+        print(f"  {result['name']:<52} {ratio:6.2f}x time{flag}")
+    return ok
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scraper text pipeline")
+    parser.add_argument("--videos", type=int, default=200, help="Synthetic videos (default: 200)")
+    parser.add_argument("--transcript-minutes", type=float, default=20.0, help="Mean transcript length per video (default: 20)")
+    parser.add_argument("--hours", type=float, default=3.0, help="Length of the single long transcript (default: 3)")
+    parser.add_argument("--adversarial-kb", type=int, default=512, help="Size of the hash-heavy text (default: 512)")
+    parser.add_argument("--brand-sizes", type=str, default="10,100,1000,10000,100000", help="Comma-separated brand table sizes")
+    parser.add_argument("--codes", type=int, default=1000, help="Codes matched per brand table (default: 1000)")
+    parser.add_argument("--linear-max", type=int, default=1000, help="Largest table also timed as a plain list (default: 1000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case, best is reported (default: 3)")
+    parser.add_argument("--quick", action="store_true", help="Small corpus for a fast smoke run")
+    parser.add_argument("--output", type=str, default=None, help="JSON path (default: .cache/benchmarks/<time>_<commit>.json)")
+    parser.add_argument("--compare", type=str, default=None, help="Earlier JSON run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown vs --compare before failing (default: 0.2)")
+    args = parser.parse_args()
+
+    if args.quick:
+        args.videos, args.hours, args.adversarial_kb = 20, 0.5, 64
+        args.brand_sizes, args.codes, args.repeat = "10,1000", 200, 1
+    args.brand_sizes = [int(s) for s in str(args.brand_sizes).split(",") if s]
+
+    commit = _git_commit()
+    print("=" * 60)
+    print("📊 backrAI Text Pipeline Benchmark")
+    print(f"  Commit: {commit or 'unknown'}  Python: {platform.python_version()}")
+    print("=" * 60)
+
+    results = run_suite(args)
+
+    report = {
+        "suite": "scraper-text-pipeline",
+        "commit": commit,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": vars(args),
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        DEFAULT_OUTPUT_DIR,
+        f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit or 'nogit'}.json",
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n  Results written to {output}")
+
+    if args.compare and not compare(results, args.compare, args.tolerance):
+        sys.exit(1)
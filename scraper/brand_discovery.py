@@ -24,9 +24,10 @@ from typing import List, Dict, Optional, Set
 from dotenv import load_dotenv
 from playwright.async_api import async_playwright, Browser, Page
 from supabase import create_client, Client
-import requests
 from bs4 import BeautifulSoup
 
+from fast_navigation import fast_goto, NavigationMetrics
+
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
@@ -121,6 +122,7 @@ class BrandDiscovery:
         self.browser: Optional[Browser] = None
         self.existing_domains: Set[str] = set()
         self.discovered_brands: List[Dict[str, str]] = []
+        self.nav_metrics = NavigationMetrics()
 
     async def initialize(self):
         """Initialize browser and load existing brands from DB"""
@@ -151,6 +153,7 @@ class BrandDiscovery:
 
     async def close(self):
         """Close browser and Playwright"""
+        print(f"  Navigation: {self.nav_metrics.summary()}")
         if self.browser:
             await self.browser.close()
         if self._playwright:
@@ -210,8 +213,9 @@ class BrandDiscovery:
             try:
                 print(f"  🔍 Scanning {url}...")
                 page = await self._new_page()
-                await page.goto(url, wait_until="networkidle", timeout=15000)
-                await page.wait_for_timeout(2000)
+                await fast_goto(
+                    page, url, wait_for='a[href*="/view/"]', metrics=self.nav_metrics,
+                )
 
                 # Extract store links — RetailMeNot lists stores as links
                 store_data = await page.evaluate("""
@@ -273,8 +277,9 @@ class BrandDiscovery:
             try:
                 print(f"  🔍 Scanning {url}...")
                 page = await self._new_page()
-                await page.goto(url, wait_until="networkidle", timeout=15000)
-                await page.wait_for_timeout(2000)
+                await fast_goto(
+                    page, url, wait_for='a[href*="/coupon-codes/"]', metrics=self.nav_metrics,
+                )
 
                 store_data = await page.evaluate("""
                     () => {
@@ -352,10 +357,10 @@ class BrandDiscovery:
                     f"{query.replace(' ', '+')}"
                 )
                 page = await self._new_page()
-                await page.goto(
-                    search_url, wait_until="networkidle", timeout=30000
+                await fast_goto(
+                    page, search_url, wait_for="a#video-title, h3 a",
+                    timeout=30000, settle_ms=3000, metrics=self.nav_metrics,
                 )
-                await page.wait_for_timeout(3000)
 
                 # Scroll to load more results
                 for _ in range(2):
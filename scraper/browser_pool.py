@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+backrAI Browser Pool
+Fixed-size pool of isolated Playwright pages for concurrent scraping.
+
+Each slot is its own browser context (separate cookies, cache and
+storage) with one page, so a slow or broken site only ties up its own
+slot. Work is scheduled with run()/map(): a task borrows a free page,
+is cut off after task_timeout seconds, and its page is recycled
+(context closed, fresh one created) when it crashed, timed out, raised,
+or has served max_uses tasks. A dead browser is relaunched on demand.
+"""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+
+DEFAULT_POOL_SIZE = int(os.getenv("SCRAPER_POOL_SIZE", "4"))
+
+# Tasks a page serves before it is replaced (bounds leaked memory per tab)
+PAGE_MAX_USES = 25
+
+# Seconds one task may hold a page
+DEFAULT_TASK_TIMEOUT = 60.0
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+
+
+class _Slot:
+    """One pooled context + page."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.context: Optional[BrowserContext] = None
+        self.page: Optional[Page] = None
+        self.uses = 0
+        self.broken = False
+
+
+class PagePool:
+    """
+    Pool of `size` isolated pages on one headless Chromium.
+
+    Usage:
+        pool = PagePool(size=4)
+        await pool.start()
+        results = await pool.map(lambda page, url: scrape(page, url), urls)
+        await pool.close()
+    """
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        max_uses: int = PAGE_MAX_USES,
+        task_timeout: float = DEFAULT_TASK_TIMEOUT,
+        context_options: Optional[Dict[str, Any]] = None,
+    ):
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.task_timeout = task_timeout
+        self.context_options = {"user_agent": USER_AGENT, **(context_options or {})}
+        self._playwright = None
+        self.browser: Optional[Browser] = None
+        self._idle: Optional[asyncio.Queue] = None
+        self._browser_lock: Optional[asyncio.Lock] = None
+        self.stats = {
+            "tasks": 0,
+            "timeouts": 0,
+            "errors": 0,
+            "pages_created": 0,
+            "pages_recycled": 0,
+            "browser_restarts": 0,
+        }
+
+    async def start(self):
+        """Launch the browser and create the idle slots (pages open lazily)."""
+        self._playwright = await async_playwright().start()
+        self.browser = await self._playwright.chromium.launch(headless=True)
+        self._browser_lock = asyncio.Lock()
+        self._idle = asyncio.Queue()
+        for i in range(self.size):
+            self._idle.put_nowait(_Slot(i))
+
+    async def close(self):
+        """Close every page, the browser and Playwright."""
+        if self._idle is not None:
+            while not self._idle.empty():
+                await self._discard(self._idle.get_nowait())
+        if self.browser:
+            try:
+                await self.browser.close()
+            except Exception:
+                pass
+        if self._playwright:
+            await self._playwright.stop()
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+    @asynccontextmanager
+    async def page(self):
+        """Borrow a page for the duration of the block."""
+        self.stats["tasks"] += 1
+        slot = await self._idle.get()
+        try:
+            if (
+                slot.page is None
+                or slot.broken
+                or slot.page.is_closed()
+                or not self.browser.is_connected()
+            ):
+                await self._discard(slot)
+                await self._open(slot)
+            yield slot.page
+        except BaseException:
+            slot.broken = True
+            raise
+        finally:
+            slot.uses += 1
+            if slot.broken or slot.uses >= self.max_uses:
+                await self._discard(slot)
+                self.stats["pages_recycled"] += 1
+            self._idle.put_nowait(slot)
+
+    async def run(
+        self,
+        fn: Callable[[Page], Awaitable[Any]],
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Run fn(page) on a pooled page, cut off after task_timeout seconds."""
+        async with self.page() as page:
+            try:
+                return await asyncio.wait_for(fn(page), timeout or self.task_timeout)
+            except asyncio.TimeoutError:
+                self.stats["timeouts"] += 1
+                raise
+            except Exception:
+                self.stats["errors"] += 1
+                raise
+
+    async def map(
+        self,
+        fn: Callable[[Page, Any], Awaitable[Any]],
+        items: Iterable[Any],
+        timeout: Optional[float] = None,
+    ) -> List[Any]:
+        """
+        Run fn(page, item) for every item across the pool.
+        Results are in input order; a failed item yields its exception.
+        """
+        return await asyncio.gather(
+            *(self.run(lambda page, item=item: fn(page, item), timeout) for item in items),
+            return_exceptions=True,
+        )
+
+    def summary(self) -> str:
+        """One-line summary for run logs."""
+        s = self.stats
+        return (
+            f"{s['tasks']} tasks on {self.size} pages, {s['timeouts']} timeouts, "
+            f"{s['errors']} errors, {s['pages_recycled']} pages recycled, "
+            f"{s['browser_restarts']} browser restarts"
+        )
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    async def _ensure_browser(self):
+        """Relaunch the browser if it crashed or was disconnected."""
+        async with self._browser_lock:
+            if self.browser and self.browser.is_connected():
+                return
+            if self.browser:
+                try:
+                    await self.browser.close()
+                except Exception:
+                    pass
+            self.browser = await self._playwright.chromium.launch(headless=True)
+            self.stats["browser_restarts"] += 1
+
+    async def _open(self, slot: _Slot):
+        await self._ensure_browser()
+        slot.context = await self.browser.new_context(**self.context_options)
+        slot.page = await slot.context.new_page()
+        slot.page.on("crash", lambda _page: setattr(slot, "broken", True))
+        slot.uses = 0
+        slot.broken = False
+        self.stats["pages_created"] += 1
+
+    async def _discard(self, slot: _Slot):
+        if slot.context is not None:
+            try:
+                await slot.context.close()
+            except Exception:
+                pass
+        slot.context = None
+        slot.page = None
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+backrAI Checkpoint Store
+Resumable progress for long creator-discovery runs.
+
+A single SQLite file next to the video cache (so the same actions/cache
+step carries it between GitHub Actions runs) records:
+  - processed videos: finished videos are skipped on the next run
+  - channel high-water marks: the newest upload at or below which every
+    listed video has been processed, so channel scans stop there
+  - query cursors: when each search query last completed, so the next
+    run starts with the queries that are most overdue
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional
+
+DEFAULT_CHECKPOINT_PATH = os.getenv(
+    "CHECKPOINT_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "checkpoints.sqlite3"),
+)
+
+
+class CheckpointStore:
+    """
+    SQLite-backed run state.
+    Thread-safe: one connection guarded by a lock.
+    """
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS processed_videos (
+                video_id     TEXT PRIMARY KEY,
+                had_codes    INTEGER NOT NULL DEFAULT 0,
+                processed_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS channel_marks (
+                channel_url TEXT PRIMARY KEY,
+                video_id    TEXT NOT NULL,
+                updated_at  REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS query_cursors (
+                query        TEXT PRIMARY KEY,
+                completed_at REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+        self.stats = {
+            "videos_skipped": 0,
+            "videos_marked": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Processed videos
+    # ------------------------------------------------------------------
+    def is_processed(self, video_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM processed_videos WHERE video_id = ?", (video_id,)
+            ).fetchone()
+        return row is not None
+
+    def skip_processed(self, video_ids: Iterable[str]) -> List[str]:
+        """Return the video_ids not processed yet (order kept), counting skips."""
+        video_ids = list(video_ids)
+        remaining = [vid for vid in video_ids if not self.is_processed(vid)]
+        self.count_skipped(len(video_ids) - len(remaining))
+        return remaining
+
+    def mark_processed(self, video_ids: Iterable[str], had_codes: bool = False):
+        """Record finished videos. Call only once their results are saved."""
+        now = time.time()
+        rows = [(vid, int(had_codes), now) for vid in video_ids if vid]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO processed_videos "
+                "(video_id, had_codes, processed_at) VALUES (?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+            self.stats["videos_marked"] += len(rows)
+
+    def count_skipped(self, amount: int = 1):
+        with self._lock:
+            self.stats["videos_skipped"] += amount
+
+    # ------------------------------------------------------------------
+    # Channel high-water marks
+    # ------------------------------------------------------------------
+    def get_channel_mark(self, channel_url: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT video_id FROM channel_marks WHERE channel_url = ?",
+                (channel_url,),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_channel_mark(self, channel_url: str, video_id: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO channel_marks "
+                "(channel_url, video_id, updated_at) VALUES (?, ?, ?)",
+                (channel_url, video_id, time.time()),
+            )
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Search query cursors
+    # ------------------------------------------------------------------
+    def order_queries(self, queries: List[str]) -> List[str]:
+        """Never-run queries first, then least recently completed."""
+        with self._lock:
+            completed = dict(self._conn.execute(
+                "SELECT query, completed_at FROM query_cursors"
+            ).fetchall())
+        return sorted(queries, key=lambda q: completed.get(q, 0.0))
+
+    def mark_query_done(self, query: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO query_cursors (query, completed_at) VALUES (?, ?)",
+                (query, time.time()),
+            )
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    def summary(self) -> str:
+        """One-line summary for run logs."""
+        with self._lock:
+            total = self._conn.execute(
+                "SELECT COUNT(*) FROM processed_videos"
+            ).fetchone()[0]
+        return (
+            f"{self.stats['videos_skipped']} videos skipped as already processed, "
+            f"{self.stats['videos_marked']} marked this run, {total} total"
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
@@ -9,7 +9,7 @@ Extracted and enhanced from youtube_scraper.py lines 266-298.
 """
 
 import re
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
 from urllib.parse import urlparse
 
 # -------------------------------------------------------------------
@@ -132,92 +132,139 @@ def _looks_like_real_code(code: str) -> bool:
     return True
 
 
-def extract_codes_from_text(text: str) -> List[str]:
-    """
-    Extract discount codes from text using multiple regex patterns.
-    Enhanced version of YouTubeScraper._extract_codes_from_text.
+# -------------------------------------------------------------------
+# Precompiled code patterns
+# -------------------------------------------------------------------
+# The five extraction patterns, compiled once. Each is scanned with its
+# own finditer, so overlapping matches across patterns are found exactly
+# as the original findall() calls found them. ASCII text is lowercased
+# once and scanned case-sensitively (much faster than re.IGNORECASE),
+# with offsets mapping 1:1 back to the original text.
+_CODE_PATTERNS = (
+    # "code: ABC123" / "promo code ABC123" / "discount code: SAVE20"
+    r'(?:code|promo|discount|coupon)[\s:]*["\']?([a-z0-9]{3,25})["\']?',
+    # "use code ABC123" / "enter ABC123" / "try code SAVE20"
+    r'(?:use|enter|try|apply|redeem)[\s]+(?:code|promo|my\s+code)?[\s:]*["\']?([a-z0-9]{3,25})["\']?',
+    # "% off with CODE" / "$10 off with CODE"
+    r'(?:\d+%?\s*off|discount)\s+(?:with|using|code)\s+["\']?([a-z0-9]{3,25})["\']?',
+    # Standalone codes (letters then digits, e.g. NIKE20)
+    r'\b([a-z]{2,}[0-9]+[a-z0-9]*)\b',
+    # "link.com/CODE" or URL-embedded codes
+    r'(?:https?://)?[\w.-]+\.[\w]+/([a-z][a-z0-9]{3,15})\b',
+)
+_STANDALONE_INDEX = 3
+_CODE_SCANNERS = tuple(re.compile(pattern) for pattern in _CODE_PATTERNS)
+# Non-ASCII text, where case mapping can change length or match other
+# letters: the original way — re.IGNORECASE, and the standalone pattern
+# over text.upper() (its offsets are approximate if that changed length)
+_CODE_SCANNERS_IGNORECASE = tuple(
+    re.compile(pattern, re.IGNORECASE) for pattern in _CODE_PATTERNS
+)
+_STANDALONE_SCANNER_UPPER = re.compile(r'\b([A-Z]{2,}[0-9]+[A-Z0-9]*)\b')
+
+# The URL pattern, only tried where a run of [\w.-] characters starts: a
+# match from inside a run implies one from the run's start, so the other
+# positions (most of the text) are skipped. See _iter_url_matches().
+_URL_RUN_PATTERN = r'(?<![\w.-])' + _CODE_PATTERNS[-1]
+_URL_RUN_SCANNER = re.compile(_URL_RUN_PATTERN)
+_URL_RUN_SCANNER_IGNORECASE = re.compile(_URL_RUN_PATTERN, re.IGNORECASE)
+
+# First matching entry of BRAND_CODE_PREFIXES (list order preserved)
+_BRAND_PREFIX_RE = re.compile(
+    "|".join(re.escape(prefix) for prefix in BRAND_CODE_PREFIXES)
+)
+
+# "at BRAND" / "for BRAND" / "from BRAND" near a code
+_BRAND_GUESS_RE = re.compile(
+    r'(?:at|for|from|on)\s+([A-Z][A-Za-z0-9\s]{2,20}?)(?:\s+|[,.\-!])',
+    re.IGNORECASE,
+)
+
+# Characters of context captured on each side of a code
+CONTEXT_CHARS = 150
+
+
+def _is_valid_code(cleaned: str) -> bool:
+    """Filters applied to every candidate code (already uppercased)."""
+    if not cleaned or cleaned in FALSE_POSITIVES:
+        return False
+    # Length filter: real discount codes are 4-20 chars
+    if not (4 <= len(cleaned) <= 20):
+        return False
+    if not cleaned.isalnum():
+        return False
+    # Skip codes that look like random hashes/IDs
+    if not _looks_like_real_code(cleaned):
+        return False
+    # Short all-letter codes are almost always false positives
+    # unless they start with a known brand prefix
+    if cleaned.isalpha() and len(cleaned) <= 6:
+        if not _BRAND_PREFIX_RE.match(cleaned):
+            return False
+    return True
 
-    Returns deduplicated list of uppercase codes found.
+
+def _iter_url_matches(haystack: str, scanner, run_scanner) -> Iterator[re.Match]:
     """
-    if not text:
-        return []
+    Same matches as scanner.finditer(haystack) for the URL pattern.
 
-    codes = []
+    run_scanner only starts at the beginning of a run; the one run it
+    cannot see — the one continuing right where the previous match ended
+    — is tried with scanner.match() first.
+    """
+    pos = 0
+    while pos <= len(haystack):
+        match = (pos > 0 and scanner.match(haystack, pos)) or run_scanner.search(haystack, pos)
+        if match is None:
+            return
+        yield match
+        pos = match.end()
 
-    # Pattern 1: "code: ABC123" / "promo code ABC123" / "discount code: SAVE20"
-    pattern1 = re.compile(
-        r'(?:code|promo|discount|coupon)[\s:]*["\']?([A-Z0-9]{3,25})["\']?',
-        re.IGNORECASE,
-    )
-    codes.extend(pattern1.findall(text))
 
-    # Pattern 2: "use code ABC123" / "enter ABC123" / "try code SAVE20"
-    pattern2 = re.compile(
-        r'(?:use|enter|try|apply|redeem)[\s]+(?:code|promo|my\s+code)?[\s:]*["\']?([A-Z0-9]{3,25})["\']?',
-        re.IGNORECASE,
-    )
-    codes.extend(pattern2.findall(text))
+def iter_code_matches(text: str) -> Iterator[Tuple[str, int, int]]:
+    """
+    Yield (code, start, end) for each unique code, in the order
+    extract_codes_from_text() returns them. start/end are the offsets of
+    the match that found it, so callers can slice context without
+    searching again.
+    """
+    if not text:
+        return
+
+    is_ascii = text.isascii()
+    if is_ascii:
+        haystack, scanners, url_run_scanner = text.lower(), _CODE_SCANNERS, _URL_RUN_SCANNER
+    else:
+        haystack, scanners, url_run_scanner = (
+            text, _CODE_SCANNERS_IGNORECASE, _URL_RUN_SCANNER_IGNORECASE
+        )
 
-    # Pattern 3: "% off with CODE" / "$10 off with CODE"
-    pattern3 = re.compile(
-        r'(?:\d+%?\s*off|discount)\s+(?:with|using|code)\s+["\']?([A-Z0-9]{3,25})["\']?',
-        re.IGNORECASE,
-    )
-    codes.extend(pattern3.findall(text))
-
-    # Pattern 4: Standalone codes (all caps, 4-20 chars, mixed letters+digits)
-    # Only pick up codes that have both letters AND digits to reduce false positives
-    pattern4 = re.compile(r'\b([A-Z]{2,}[0-9]+[A-Z0-9]*)\b')
-    potential_codes = pattern4.findall(text.upper())
-    codes.extend(potential_codes)
-
-    # Pattern 5: "link.com/CODE" or URL-embedded codes
-    # Only match codes that look like real promo codes (letters+digits, readable)
-    # NOT random hashes or URL parameters
-    pattern5 = re.compile(
-        r'(?:https?://)?[\w.-]+\.[\w]+/([A-Z][A-Z0-9]{3,15})\b',
-        re.IGNORECASE,
-    )
-    url_codes = pattern5.findall(text)
-    for code in url_codes:
-        upper = code.upper()
-        if upper not in FALSE_POSITIVES and len(code) >= 4:
-            # Skip if it looks like a random hash (high entropy)
-            if not _looks_like_real_code(upper):
+    *other_scanners, url_scanner = scanners
+    passes = [scanner.finditer(haystack) for scanner in other_scanners]
+    if not is_ascii:
+        passes[_STANDALONE_INDEX] = _STANDALONE_SCANNER_UPPER.finditer(text.upper())
+    passes.append(_iter_url_matches(haystack, url_scanner, url_run_scanner))
+
+    seen = set()
+    for matches in passes:
+        for match in matches:
+            cleaned = match.group(1).upper()
+            if cleaned in seen:
                 continue
-            codes.append(code)
-
-    # Deduplicate, uppercase, filter
-    unique_codes = set()
-    result = []
-    for code in codes:
-        cleaned = code.upper().strip().strip("'\"")
-        if not cleaned or cleaned in unique_codes or cleaned in FALSE_POSITIVES:
-            continue
-        # Length filter: real discount codes are 4-20 chars
-        if not (4 <= len(cleaned) <= 20):
-            continue
-        if not cleaned.isalnum():
-            continue
-        # Skip codes that look like random hashes/IDs
-        if not _looks_like_real_code(cleaned):
-            continue
-        # Skip pure-letter codes from Pattern 4 (already filtered by regex, but
-        # Patterns 1-3 might still pick them up). Only skip if no digits AND
-        # not captured by a strong context pattern (Patterns 1-3).
-        # We allow pure-letter codes only if they have a known brand prefix.
-        if cleaned.isalpha() and len(cleaned) <= 6:
-            # Short all-letter codes are almost always false positives
-            # unless matched by brand prefix
-            is_brand_prefix = any(
-                cleaned.startswith(p) for p in BRAND_CODE_PREFIXES
-            )
-            if not is_brand_prefix:
-                continue
-        unique_codes.add(cleaned)
-        result.append(cleaned)
+            # Rejections are cached too — filters depend only on the code
+            seen.add(cleaned)
+            if _is_valid_code(cleaned):
+                yield cleaned, match.start(1), match.end(1)
+
+
+def extract_codes_from_text(text: str) -> List[str]:
+    """
+    Extract discount codes from text using multiple regex patterns.
+    Enhanced version of YouTubeScraper._extract_codes_from_text.
 
-    return result
+    Returns deduplicated list of uppercase codes found.
+    """
+    return [code for code, _, _ in iter_code_matches(text)]
 
 
 def extract_codes_with_context(text: str) -> List[Dict[str, str]]:
@@ -227,37 +274,28 @@ def extract_codes_with_context(text: str) -> List[Dict[str, str]]:
     The 'context' is ~150 chars around the code match.
     The 'probable_brand' is a guess from context (may be None).
     """
+    return [code_info for code_info, _ in iter_codes_with_context(text)]
+
+
+def iter_codes_with_context(text: str) -> Iterator[Tuple[Dict[str, str], int]]:
+    """
+    extract_codes_with_context() results paired with the offset of each
+    code in text, so callers can map a code back to where it was said.
+    """
     if not text:
-        return []
+        return
 
-    codes = extract_codes_from_text(text)
-    results = []
-    text_upper = text.upper()
-
-    for code in codes:
-        # Find code position in text for context extraction
-        idx = text_upper.find(code)
-        if idx == -1:
-            # Try case-insensitive search
-            idx = text.upper().find(code.upper())
-
-        if idx >= 0:
-            start = max(0, idx - 150)
-            end = min(len(text), idx + len(code) + 150)
-            context = text[start:end].strip()
-        else:
-            context = ""
+    for code, start, end in iter_code_matches(text):
+        context = text[max(0, start - CONTEXT_CHARS):end + CONTEXT_CHARS].strip()
 
         # Try to guess brand from code and context
         probable_brand = _guess_brand_from_code(code, context)
 
-        results.append({
+        yield {
             "code": code,
             "context": context,
             "probable_brand": probable_brand,
-        })
-
-    return results
+        }, start
 
 
 def extract_brand_indicators(text: str) -> List[Dict[str, str]]:
@@ -320,10 +358,190 @@ def extract_brand_indicators(text: str) -> List[Dict[str, str]]:
     return indicators
 
 
+# -------------------------------------------------------------------
+# Brand index (built once per run, used for code→brand matching)
+# -------------------------------------------------------------------
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]")
+
+# Brands added after build() are scanned linearly until there are this
+# many, then the automata are rebuilt
+BRAND_INDEX_REBUILD_THRESHOLD = 256
+
+
+def _clean_brand_name(name: str) -> str:
+    """'Athletic Greens' → 'athleticgreens' (lowercase alphanumerics only)."""
+    return _NON_ALNUM_RE.sub("", (name or "").lower())
+
+
+class _AhoCorasick:
+    """
+    Minimal Aho-Corasick automaton mapping patterns to integer priorities.
+    min_match(text) returns the lowest priority of any pattern occurring
+    in text (or None), in a single pass over text.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Optional[int]] = [None]
+
+    def add(self, pattern: str, priority: int):
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(None)
+            node = nxt
+        current = self._out[node]
+        if current is None or priority < current:
+            self._out[node] = priority
+
+    def build(self):
+        """Compute failure links (BFS) and fold outputs along them."""
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for ch, nxt in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                inherited = self._out[self._fail[nxt]]
+                if inherited is not None and (
+                    self._out[nxt] is None or inherited < self._out[nxt]
+                ):
+                    self._out[nxt] = inherited
+                queue.append(nxt)
+
+    def min_match(self, text: str) -> Optional[int]:
+        goto, fail, out = self._goto, self._fail, self._out
+        best = None
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            found = out[node]
+            if found is not None and (best is None or found < best):
+                best = found
+                if best == 0:
+                    break
+        return best
+
+
+class BrandIndex:
+    """
+    Precomputed lookup structure for match_code_to_brand().
+
+    Normalized names, domains and prefix matches are computed once; the
+    substring strategies use Aho-Corasick automata, so matching a code
+    costs O(len(code) + len(context)) instead of O(brands).
+    Brands keep their list order as priority, exactly like the linear scan.
+    """
+
+    def __init__(self, brands: Optional[List[Dict[str, str]]] = None):
+        self.brands: List[Dict[str, str]] = list(brands or [])
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self.brands)
+
+    def _build(self):
+        self._name_in_code = _AhoCorasick()     # Strategy 1
+        self._domain_in_context = _AhoCorasick()  # Strategy 2
+        self._name_in_context = _AhoCorasick()  # Strategy 3
+        # BRAND_CODE_PREFIXES entry → index of first brand it maps to
+        self._prefix_brand: Dict[str, int] = {}
+
+        for i, brand in enumerate(self.brands):
+            self._index_brand(i, brand)
+
+        self._name_in_code.build()
+        self._domain_in_context.build()
+        self._name_in_context.build()
+        self._built_count = len(self.brands)
+
+    def _index_brand(self, i: int, brand: Dict[str, str]):
+        name = brand.get("name") or ""
+        clean = _clean_brand_name(name)
+        if len(clean) >= 3:
+            self._name_in_code.add(clean, i)
+        for prefix in BRAND_CODE_PREFIXES:
+            if prefix not in self._prefix_brand and prefix.lower().startswith(clean[:4]):
+                self._prefix_brand[prefix] = i
+        domain = (brand.get("domain_pattern") or "").lower()
+        if domain:
+            self._domain_in_context.add(domain, i)
+        if len(name) >= 3:
+            self._name_in_context.add(name.lower(), i)
+
+    def add(self, brand: Dict[str, str]):
+        """
+        Add a newly created brand (lowest priority). It is matched by a
+        linear scan until enough brands pile up to warrant a rebuild.
+        """
+        self.brands.append(brand)
+        if len(self.brands) - self._built_count >= BRAND_INDEX_REBUILD_THRESHOLD:
+            self._build()
+        else:
+            name = brand.get("name") or ""
+            clean = _clean_brand_name(name)
+            for prefix in BRAND_CODE_PREFIXES:
+                if prefix not in self._prefix_brand and prefix.lower().startswith(clean[:4]):
+                    self._prefix_brand[prefix] = len(self.brands) - 1
+
+    def match(self, code: str, context: str) -> Optional[Dict[str, str]]:
+        """Same result as match_code_to_brand(code, context, self.brands)."""
+        if not self.brands:
+            return None
+
+        code_lower = code.lower()
+        code_upper = code.upper()
+        context_lower = context.lower() if context else ""
+        extras = self.brands[self._built_count:]
+
+        # Strategy 1: Code contains brand name
+        found = self._name_in_code.min_match(code_lower)
+        if found is not None:
+            return self.brands[found]
+        for brand in extras:
+            clean = _clean_brand_name(brand.get("name"))
+            if len(clean) >= 3 and clean in code_lower:
+                return brand
+
+        # Also check known brand code prefixes
+        for prefix in BRAND_CODE_PREFIXES:
+            if code_upper.startswith(prefix) and prefix in self._prefix_brand:
+                return self.brands[self._prefix_brand[prefix]]
+
+        # Strategy 2: Context mentions a brand domain
+        found = self._domain_in_context.min_match(context_lower)
+        if found is not None:
+            return self.brands[found]
+        for brand in extras:
+            domain = (brand.get("domain_pattern") or "").lower()
+            if domain and domain in context_lower:
+                return brand
+
+        # Strategy 3: Context mentions a brand name (case-insensitive)
+        found = self._name_in_context.min_match(context_lower)
+        if found is not None:
+            return self.brands[found]
+        for brand in extras:
+            name = brand.get("name") or ""
+            if len(name) >= 3 and name.lower() in context_lower:
+                return brand
+
+        return None
+
+
 def match_code_to_brand(
     code: str,
     context: str,
-    known_brands: List[Dict[str, str]],
+    known_brands,
 ) -> Optional[Dict[str, str]]:
     """
     Given a code and its surrounding context, determine which brand it belongs to.
@@ -336,31 +554,32 @@ def match_code_to_brand(
     Args:
         code: The discount code (e.g., "NIKE20")
         context: ~150 chars surrounding the code in source text
-        known_brands: List of dicts with 'id', 'name', 'domain_pattern'
+        known_brands: BrandIndex, or list of dicts with 'id', 'name',
+                      'domain_pattern' (build a BrandIndex when matching
+                      many codes against the same brands)
 
     Returns:
         Matched brand dict or None
     """
+    if isinstance(known_brands, BrandIndex):
+        return known_brands.match(code, context)
     if not known_brands:
         return None
 
     code_upper = code.upper()
+    code_lower = code.lower()
     context_lower = context.lower() if context else ""
+    clean_names = [_clean_brand_name(brand.get("name", "")) for brand in known_brands]
 
     # Strategy 1: Code contains brand name
-    for brand in known_brands:
-        brand_name = brand.get("name", "")
-        brand_name_clean = re.sub(r"[^a-z0-9]", "", brand_name.lower())
-        if len(brand_name_clean) >= 3 and brand_name_clean in code_upper.lower():
+    for brand, brand_name_clean in zip(known_brands, clean_names):
+        if len(brand_name_clean) >= 3 and brand_name_clean in code_lower:
             return brand
 
     # Also check known brand code prefixes
     for prefix in BRAND_CODE_PREFIXES:
         if code_upper.startswith(prefix):
-            for brand in known_brands:
-                brand_name_clean = re.sub(
-                    r"[^a-z0-9]", "", brand.get("name", "").lower()
-                )
+            for brand, brand_name_clean in zip(known_brands, clean_names):
                 if prefix.lower().startswith(brand_name_clean[:4]):
                     return brand
 
@@ -384,21 +603,14 @@ def _guess_brand_from_code(code: str, context: str) -> Optional[str]:
     Heuristic: guess a brand name from a discount code and its context.
     Returns a brand name string or None.
     """
-    code_upper = code.upper()
-
     # Check known prefixes
-    for prefix in BRAND_CODE_PREFIXES:
-        if code_upper.startswith(prefix):
-            return prefix.title()
+    prefix = _BRAND_PREFIX_RE.match(code.upper())
+    if prefix:
+        return prefix.group(0).title()
 
     # Try to extract brand from context around the code
     if context:
-        # Look for "at BRAND" / "for BRAND" / "from BRAND" near the code
-        brand_pattern = re.compile(
-            r'(?:at|for|from|on)\s+([A-Z][A-Za-z0-9\s]{2,20}?)(?:\s+|[,.\-!])',
-            re.IGNORECASE,
-        )
-        match = brand_pattern.search(context)
+        match = _BRAND_GUESS_RE.search(context)
         if match:
             brand_guess = match.group(1).strip()
             # Filter out generic words
@@ -15,19 +15,31 @@ Three Discovery Strategies:
   B) SponsorBlock Pre-filter — only process videos confirmed to have sponsors
   C) Channel Snowball — scrape known creators' recent videos for codes
 
+Videos are processed concurrently by a bounded worker pool; outbound
+requests are paced per host by a token-bucket rate limiter. Metadata and
+transcripts are cached on disk (video_cache.py) so repeat runs skip the
+network for videos already seen, and checkpoints (checkpoint_store.py)
+let the next run skip videos it already finished. A full run streams every strategy
+through discovery_pipeline.py and saves results in batches as it goes.
+
 Usage:
   python creator_discovery.py
   python creator_discovery.py --strategies search,channel --max-results 15
   python creator_discovery.py --strategies channel --seed-only
+  python creator_discovery.py --workers 8
+  python creator_discovery.py --no-cache
+  python creator_discovery.py --no-checkpoints
 """
 
 import argparse
+import hashlib
 import os
 import re
 import sys
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, Dict, List, Set, Tuple
+from typing import Iterator, Optional, Dict, List, Set, Tuple
 
 from dotenv import load_dotenv
 from supabase import create_client, Client
@@ -36,11 +48,21 @@ from supabase import create_client, Client
 from code_extractor import (
     extract_codes_from_text,
     extract_codes_with_context,
+    iter_codes_with_context,
     extract_brand_indicators,
     match_code_to_brand,
+    BrandIndex,
 )
 from transcript_service import TranscriptService
+from transcript_segments import extract_codes_in_windows
 from sponsorblock_service import SponsorBlockService
+from checkpoint_store import CheckpointStore, DEFAULT_CHECKPOINT_PATH
+from creator_index import CreatorIndex, MIN_NAME_LENGTH, normalize_creator_name
+from discovery_pipeline import DiscoveryPipeline
+from metrics import METRICS_ENABLED, StageMetrics
+from video_registry import VideoRegistry
+from rate_limiter import HostRateLimiter, YOUTUBE_HOST
+from video_cache import VideoCache, DEFAULT_CACHE_PATH, MISS
 
 
 # ---------------------------------------------------------------------------
@@ -61,6 +83,73 @@ def _get_supabase() -> Client:
     return create_client(SUPABASE_URL, SUPABASE_KEY)
 
 
+# Default number of videos processed concurrently
+DEFAULT_MAX_WORKERS = 4
+
+# Rows per batched write / IN (...) filter when saving, and rows per page
+# when reading back (PostgREST caps response size)
+SAVE_BATCH_SIZE = 100
+SELECT_PAGE_SIZE = 1000
+
+# Videos at least this long (seconds) get their SponsorBlock segments looked
+# up so transcript extraction can target the sponsor reads
+TARGETED_MIN_DURATION = 20 * 60
+
+
+def _chunks(items: List, size: int):
+    """Yield successive slices of items with at most size elements."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _creator_key(disc: Dict) -> str:
+    """Identity of a discovery's creator: channel ID, else display name."""
+    channel_id = disc.get("creator_channel_id")
+    if channel_id:
+        return f"channel:{channel_id}"
+    return f"name:{disc.get('creator_name') or ''}"
+
+
+def _offer_key(offer: Dict) -> Tuple[str, Optional[str], str]:
+    """(creator_id, brand_id, code) of an offer row."""
+    return offer["creator_id"], offer.get("brand_id"), offer["code"]
+
+
+def _username_from_url(channel_url: Optional[str]) -> Optional[str]:
+    """Extract username from channel URL (@username)."""
+    if channel_url:
+        username_match = re.search(r"@([A-Za-z0-9_-]+)", channel_url)
+        if username_match:
+            return username_match.group(1)
+    return None
+
+
+def _new_creator_row(
+    channel_id: Optional[str],
+    channel_name: Optional[str],
+    channel_url: Optional[str],
+) -> Dict[str, Optional[str]]:
+    """Build the insert payload for a newly discovered creator."""
+    display_name = channel_name or "Unknown"
+
+    # Generate ref code from channel name
+    ref_code = re.sub(r"[^a-z0-9]", "", display_name.lower())[:20]
+
+    return {
+        "display_name": display_name,
+        "youtube_channel_id": channel_id or None,
+        "youtube_username": _username_from_url(channel_url),
+        "youtube_channel_url": channel_url or None,
+        "affiliate_ref_code": ref_code,
+    }
+
+
+def _disambiguated_ref_code(ref_code: str, seed: str) -> str:
+    """ref_code with a stable suffix from seed (channel ID or name), still <= 20 chars."""
+    suffix = hashlib.sha1(seed.encode()).hexdigest()[:6]
+    return f"{ref_code[:14]}{suffix}"
+
+
 # ---------------------------------------------------------------------------
 # Creator-centric search queries (Strategy A)
 # ---------------------------------------------------------------------------
@@ -155,12 +244,33 @@ class CreatorDiscovery:
     Finds creators → extracts their codes → links to brands → saves to DB.
     """
 
-    def __init__(self, supabase_client: Optional[Client] = None):
+    def __init__(
+        self,
+        supabase_client: Optional[Client] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        video_cache: Optional[VideoCache] = None,
+        checkpoints: Optional[CheckpointStore] = None,
+        metrics: Optional[StageMetrics] = None,
+    ):
         self.supabase = supabase_client or _get_supabase()
         self.transcript_svc = TranscriptService
-        self.sponsorblock_svc = SponsorBlockService()
-        self._known_brands_cache: Optional[List[Dict]] = None
-        self._known_creator_ids: Optional[Set[str]] = None
+        self.video_cache = video_cache
+        self.checkpoints = checkpoints
+        if video_cache is not None:
+            self.transcript_svc.use_cache(video_cache)
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.sponsorblock_svc = SponsorBlockService(rate_limiter=self.rate_limiter)
+        self._brand_index: Optional[BrandIndex] = None
+        self._creator_index: Optional[CreatorIndex] = None
+        self._brands_lock = threading.Lock()
+        self._creators_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._channel_listings: Dict[str, List[str]] = {}  # channel_url -> new video IDs
+        # Every video picked up this run, by any strategy (no double fetches)
+        self.registry = VideoRegistry()
+        self.metrics = metrics or StageMetrics()
 
         # Stats
         self.stats = {
@@ -169,52 +279,150 @@ class CreatorDiscovery:
             "creators_new": 0,
             "codes_found": 0,
             "codes_saved": 0,
+            "transcripts_targeted": 0,
             "brands_matched": 0,
             "brands_created": 0,
             "errors": 0,
         }
 
+    def _bump(self, key: str, amount: int = 1):
+        """Increment a stats counter (safe to call from worker threads)."""
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _execute(self, stage: str, query):
+        """query.execute(), timed as metrics stage "db.<stage>"."""
+        with self.metrics.timer(f"db.{stage}"):
+            return query.execute()
+
     # ------------------------------------------------------------------
-    # Brand cache (loaded once, used for code→brand matching)
+    # Concurrency helpers
     # ------------------------------------------------------------------
-    def _load_known_brands(self) -> List[Dict]:
-        """Load all brands from DB for code matching."""
-        if self._known_brands_cache is not None:
-            return self._known_brands_cache
+    def _run_concurrently(self, fn, items: List) -> List:
+        """
+        Apply fn to every item on the worker pool.
+        Results come back in input order; fn must handle its own errors.
+        """
+        if self.max_workers <= 1 or len(items) <= 1:
+            return [fn(item) for item in items]
+        workers = min(self.max_workers, len(items))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="discovery"
+        ) as pool:
+            return list(pool.map(fn, items))
+
+    def _process_videos(
+        self,
+        videos: List[Tuple[str, Optional[Dict]]],
+        strategy: str,
+    ) -> List[Optional[Dict]]:
+        """
+        Run _process_video over (video_id, search_metadata) pairs concurrently.
+        Returns one result (discovery or None) per input, in input order.
+
+        Metadata for the whole batch is prefetched first with a few batched
+        yt-dlp calls (one per worker) instead of one process per video.
+        Videos another strategy already picked up this run (see
+        video_registry.py) only get `strategy` tagged onto their record,
+        and videos finished in an earlier run (see checkpoint_store.py) are
+        skipped; both return None.
+        """
+        pending = [vid for vid, _ in videos if self.registry.claim(vid, strategy)]
+        if self.checkpoints is not None:
+            pending = self.checkpoints.skip_processed(pending)
+        pending_ids = set(pending)
+        metadata = self._prefetch_metadata(pending)
+        return self._run_concurrently(
+            lambda item: self._process_video(
+                item[0], item[1], metadata.get(item[0], MISS)
+            ) if item[0] in pending_ids else None,
+            videos,
+        )
+
+    def _mark_processed(self, video_ids: List[str], had_codes: bool = False):
+        """Checkpoint finished videos so the next run skips them."""
+        if self.checkpoints is not None:
+            self.checkpoints.mark_processed(video_ids, had_codes=had_codes)
+
+    def _prefetch_metadata(self, video_ids: List[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Fetch yt-dlp metadata for video_ids, split into one chunk per worker.
+        Each chunk reserves one rate-limiter token per uncached video before
+        its yt-dlp process starts, so pacing matches the per-video path.
+        """
+        video_ids = list(dict.fromkeys(video_ids))
+        if not video_ids:
+            return {}
+        chunk_count = min(self.max_workers, len(video_ids))
+        chunks = [video_ids[i::chunk_count] for i in range(chunk_count)]
+
+        metadata: Dict[str, Optional[Dict]] = {}
+        for result in self._run_concurrently(self._fetch_metadata_chunk, chunks):
+            metadata.update(result)
+        return metadata
+
+    def _fetch_metadata_chunk(self, chunk: List[str]) -> Dict[str, Optional[Dict]]:
+        """One batched yt-dlp call for chunk, paced per uncached video."""
+        uncached = sum(
+            1 for vid in chunk
+            if not self.transcript_svc.is_cached(vid, "metadata")
+        )
+        if uncached:
+            with self.metrics.timer("rate_limit_wait"):
+                self.rate_limiter.acquire(YOUTUBE_HOST, tokens=uncached)
         try:
-            result = (
-                self.supabase.table("brands")
-                .select("id, name, domain_pattern")
-                .execute()
-            )
-            self._known_brands_cache = result.data or []
-            print(f"   Loaded {len(self._known_brands_cache)} known brands from DB")
+            with self.metrics.timer("metadata"):
+                return self.transcript_svc.get_video_metadata_many(chunk)
         except Exception as e:
-            print(f"   Warning: Could not load brands: {e}")
-            self._known_brands_cache = []
-        return self._known_brands_cache
+            print(f"    Metadata prefetch failed: {e}")
+            self.metrics.count_error("metadata")
+            return {}
+
+    # ------------------------------------------------------------------
+    # Brand index (loaded once, used for code→brand matching)
+    # ------------------------------------------------------------------
+    def _load_brand_index(self) -> BrandIndex:
+        """Load all brands from DB into a BrandIndex for code matching."""
+        if self._brand_index is not None:
+            return self._brand_index
+        with self._brands_lock:
+            # Another worker may have loaded it while we waited
+            if self._brand_index is not None:
+                return self._brand_index
+            try:
+                result = self._execute(
+                    "brands.select",
+                    self.supabase.table("brands").select("id, name, domain_pattern"),
+                )
+                self._brand_index = BrandIndex(result.data or [])
+                print(f"   Loaded {len(self._brand_index)} known brands from DB")
+            except Exception as e:
+                print(f"   Warning: Could not load brands: {e}")
+                self._brand_index = BrandIndex()
+        return self._brand_index
+
+    def _load_creator_index(self) -> CreatorIndex:
+        """Load every creator once (paged) into the run-scoped CreatorIndex."""
+        with self._creators_lock:
+            if self._creator_index is not None:
+                return self._creator_index
+            try:
+                rows = self._select_paged(
+                    "creators",
+                    lambda: self.supabase.table("creators")
+                    .select("id, display_name, youtube_channel_id, youtube_username")
+                    .order("id")
+                )
+                self._creator_index = CreatorIndex(rows)
+                print(f"   Loaded {len(self._creator_index)} known creators from DB")
+            except Exception as e:
+                print(f"   Warning: Could not load creators: {e}")
+                self._creator_index = CreatorIndex()
+        return self._creator_index
 
     def _load_known_creator_channel_ids(self) -> Set[str]:
-        """Load known creator YouTube channel IDs for dedup."""
-        if self._known_creator_ids is not None:
-            return self._known_creator_ids
-        try:
-            result = (
-                self.supabase.table("creators")
-                .select("youtube_channel_id")
-                .not_.is_("youtube_channel_id", "null")
-                .execute()
-            )
-            self._known_creator_ids = {
-                row["youtube_channel_id"]
-                for row in (result.data or [])
-                if row.get("youtube_channel_id")
-            }
-            print(f"   Loaded {len(self._known_creator_ids)} known creator channel IDs")
-        except Exception as e:
-            print(f"   Warning: Could not load creators: {e}")
-            self._known_creator_ids = set()
-        return self._known_creator_ids
+        """Known creator YouTube channel IDs for dedup."""
+        return self._load_creator_index().channel_ids()
 
     # ==================================================================
     # STRATEGY A — YouTube Search Discovery
@@ -230,7 +438,6 @@ class CreatorDiscovery:
         """
         queries = queries or CREATOR_SEARCH_QUERIES
         all_discoveries = []
-        seen_video_ids: Set[str] = set()
 
         print(f"\n{'='*60}")
         print(f"Strategy A: YouTube Search Discovery")
@@ -241,18 +448,16 @@ class CreatorDiscovery:
         for i, query in enumerate(queries):
             print(f"\n  [{i+1}/{len(queries)}] Searching: \"{query}\"")
             try:
+                self.rate_limiter.acquire(YOUTUBE_HOST)
                 videos = self.transcript_svc.search_videos(
                     query, max_results=max_results_per_query
                 )
                 print(f"    Found {len(videos)} videos")
 
-                for video in videos:
-                    video_id = video.get("video_id", "")
-                    if not video_id or video_id in seen_video_ids:
-                        continue
-                    seen_video_ids.add(video_id)
-
-                    discovery = self._process_video(video_id, video)
+                batch = [
+                    (video["video_id"], video) for video in videos if video.get("video_id")
+                ]
+                for discovery in self._process_videos(batch, "search"):
                     if discovery and discovery.get("codes"):
                         all_discoveries.append(discovery)
                         print(
@@ -261,12 +466,9 @@ class CreatorDiscovery:
                             f"({', '.join(c['code'] for c in discovery['codes'][:3])})"
                         )
 
-                # Be respectful with rate limiting
-                time.sleep(0.5)
-
             except Exception as e:
                 print(f"    Error on query '{query}': {e}")
-                self.stats["errors"] += 1
+                self._bump("errors")
 
         print(f"\n  Search complete: {len(all_discoveries)} videos with codes")
         return all_discoveries
@@ -289,21 +491,28 @@ class CreatorDiscovery:
 
         # Batch check for sponsor segments
         print("  Checking SponsorBlock for sponsor segments...")
-        sponsor_map = self.sponsorblock_svc.batch_check_videos(video_ids)
-        sponsored_ids = [vid for vid, has in sponsor_map.items() if has]
-        print(f"  {len(sponsored_ids)}/{len(video_ids)} have sponsor segments")
+        with self.metrics.timer("sponsorblock"):
+            sponsor_map = self.sponsorblock_svc.batch_check_videos(video_ids)
+        # Videos SponsorBlock couldn't answer for are processed anyway
+        sponsored_ids = [vid for vid in video_ids if sponsor_map.get(vid, True)]
+        for vid, has in sponsor_map.items():
+            if has:
+                self.registry.flag(vid, "had_sponsor_segments")
+        unknown = len(video_ids) - len(sponsor_map)
+        print(f"  {len(sponsored_ids) - unknown}/{len(video_ids)} have sponsor segments")
+        if unknown:
+            print(f"  {unknown} lookups failed — processing those without the pre-filter")
 
         all_discoveries = []
-        for i, video_id in enumerate(sponsored_ids):
-            print(f"\n  [{i+1}/{len(sponsored_ids)}] Processing sponsored video: {video_id}")
-            discovery = self._process_video(video_id)
+        results = self._process_videos([(vid, None) for vid in sponsored_ids], "sponsorblock")
+        for i, (video_id, discovery) in enumerate(zip(sponsored_ids, results)):
             if discovery and discovery.get("codes"):
                 all_discoveries.append(discovery)
                 print(
-                    f"    ✅ {discovery['creator_name']}: "
+                    f"  [{i+1}/{len(sponsored_ids)}] {video_id} ✅ "
+                    f"{discovery['creator_name']}: "
                     f"{len(discovery['codes'])} codes"
                 )
-            time.sleep(0.3)
 
         print(f"\n  SponsorBlock strategy: {len(all_discoveries)} videos with codes")
         return all_discoveries
@@ -320,35 +529,102 @@ class CreatorDiscovery:
         """
         Scrape a known creator's channel for codes in their recent videos.
         """
+        video_ids = self._list_channel_videos(channel_url, channel_name, max_videos)
+        if not video_ids:
+            return []
+
+        all_discoveries = []
+        results = self._process_videos([(vid, None) for vid in video_ids], "channel")
+        for i, discovery in enumerate(results):
+            if discovery and discovery.get("codes"):
+                all_discoveries.append(discovery)
+                codes_str = ", ".join(c["code"] for c in discovery["codes"][:5])
+                print(f"    [{i+1}] ✅ {len(discovery['codes'])} codes: {codes_str}")
+
+        print(f"  Channel total: {len(all_discoveries)} videos with codes")
+        return all_discoveries
+
+    def _list_channel_videos(
+        self,
+        channel_url: str,
+        channel_name: str = "",
+        max_videos: int = 20,
+    ) -> List[str]:
+        """
+        Fetch a channel's recent video IDs (rate-limited). Returns [] on error.
+
+        With checkpoints, the newest-first listing is streamed and stopped
+        at the channel's high-water mark, so a channel with no new uploads
+        costs one listing page and nothing else.
+        """
         print(f"\n  Channel: {channel_name or channel_url}")
         print(f"  Fetching up to {max_videos} recent videos...")
 
+        mark = None
+        if self.checkpoints is not None:
+            mark = self.checkpoints.get_channel_mark(channel_url)
+
+        video_ids = []
+        reached_mark = False
         try:
-            video_ids = self.transcript_svc.get_channel_video_ids(
+            self.rate_limiter.acquire(YOUTUBE_HOST)
+            listing = self.transcript_svc.iter_channel_video_ids(
                 channel_url, max_videos=max_videos
             )
+            try:
+                for video_id in listing:
+                    if video_id == mark:
+                        reached_mark = True
+                        break
+                    video_ids.append(video_id)
+            finally:
+                listing.close()
         except Exception as e:
             print(f"  Error fetching channel videos: {e}")
-            self.stats["errors"] += 1
+            self._bump("errors")
             return []
 
-        if not video_ids:
+        if reached_mark:
+            print(f"  {len(video_ids)} new since last scan")
+        elif not video_ids:
             print(f"  No videos found for channel")
             return []
+        else:
+            print(f"  Found {len(video_ids)} videos")
 
-        print(f"  Found {len(video_ids)} videos")
+        if self.checkpoints is not None and video_ids:
+            video_ids = self._advance_channel_mark(channel_url, video_ids)
+            self._channel_listings[channel_url] = video_ids
+        return video_ids
 
-        all_discoveries = []
-        for i, video_id in enumerate(video_ids):
-            discovery = self._process_video(video_id)
-            if discovery and discovery.get("codes"):
-                all_discoveries.append(discovery)
-                codes_str = ", ".join(c["code"] for c in discovery["codes"][:5])
-                print(f"    [{i+1}] ✅ {len(discovery['codes'])} codes: {codes_str}")
-            time.sleep(0.3)
+    def _advance_channel_mark(self, channel_url: str, video_ids: List[str]) -> List[str]:
+        """
+        Advance the channel's mark over the oldest listed uploads that are
+        all processed, and drop them. The mark only ever covers a
+        contiguous processed run, so videos a killed run never got to are
+        picked up next time.
+        """
+        new_mark = None
+        for video_id in reversed(video_ids):
+            if not self.checkpoints.is_processed(video_id):
+                break
+            new_mark = video_id
+        if new_mark:
+            self.checkpoints.set_channel_mark(channel_url, new_mark)
+            video_ids = video_ids[:video_ids.index(new_mark)]
+        return video_ids
 
-        print(f"  Channel total: {len(all_discoveries)} videos with codes")
-        return all_discoveries
+    def advance_channel_marks(self):
+        """
+        After a run, move each listed channel's mark over the uploads this
+        run processed, so the next scan stops right above them.
+        """
+        if self.checkpoints is None:
+            return
+        for channel_url, video_ids in list(self._channel_listings.items()):
+            self._channel_listings[channel_url] = self._advance_channel_mark(
+                channel_url, video_ids
+            )
 
     def discover_from_seed_creators(
         self,
@@ -364,26 +640,91 @@ class CreatorDiscovery:
         print(f"{'='*60}")
 
         known_ids = self._load_known_creator_channel_ids()
-        all_discoveries = []
-
-        for i, creator in enumerate(SEED_CREATORS):
-            name = creator["name"]
-            url = creator["channel_url"]
-            print(f"\n  [{i+1}/{len(SEED_CREATORS)}] {name}")
 
-            discoveries = self.discover_from_channel(
-                channel_url=url,
-                channel_name=name,
+        # List every channel first (concurrently), then fan all videos out
+        # over one pool so workers never idle at channel boundaries.
+        channel_video_ids = self._run_concurrently(
+            lambda creator: self._list_channel_videos(
+                channel_url=creator["channel_url"],
+                channel_name=creator["name"],
                 max_videos=max_videos_per_creator,
-            )
-            all_discoveries.extend(discoveries)
+            ),
+            SEED_CREATORS,
+        )
+
+        batch = [
+            (video_id, None)
+            for video_ids in channel_video_ids for video_id in video_ids
+        ]
 
-            # Rate limit between creators
-            time.sleep(1.0)
+        print(f"\n  Processing {len(batch)} videos from {len(SEED_CREATORS)} channels "
+              f"({self.max_workers} workers)...")
+
+        all_discoveries = []
+        for discovery in self._process_videos(batch, "channel"):
+            if discovery and discovery.get("codes"):
+                all_discoveries.append(discovery)
+                codes_str = ", ".join(c["code"] for c in discovery["codes"][:5])
+                print(f"    ✅ {discovery['creator_name']}: "
+                      f"{len(discovery['codes'])} codes: {codes_str}")
 
         print(f"\n  Seed creators complete: {len(all_discoveries)} videos with codes")
         return all_discoveries
 
+    # ==================================================================
+    # VIDEO SOURCES — streaming inputs for DiscoveryPipeline
+    # ==================================================================
+    def iter_search_videos(
+        self,
+        queries: Optional[List[str]] = None,
+        max_results_per_query: int = 10,
+    ) -> Iterator[Tuple[str, Optional[Dict]]]:
+        """Yield (video_id, search_metadata) for Strategy A, query by query."""
+        queries = queries or CREATOR_SEARCH_QUERIES
+        if self.checkpoints is not None:
+            # Resume with the queries the last (possibly interrupted) runs didn't reach
+            queries = self.checkpoints.order_queries(queries)
+        for i, query in enumerate(queries):
+            print(f"\n  [search {i+1}/{len(queries)}] \"{query}\"")
+            try:
+                self.rate_limiter.acquire(YOUTUBE_HOST)
+                videos = self.transcript_svc.search_videos(
+                    query, max_results=max_results_per_query
+                )
+            except Exception as e:
+                print(f"    Error on query '{query}': {e}")
+                self._bump("errors")
+                continue
+            for video in videos:
+                if video.get("video_id"):
+                    yield video["video_id"], video
+            if self.checkpoints is not None:
+                self.checkpoints.mark_query_done(query)
+
+    def iter_seed_channel_videos(
+        self,
+        max_videos_per_creator: int = 10,
+    ) -> Iterator[Tuple[str, Optional[Dict]]]:
+        """
+        Yield (video_id, None) for Strategy C. Channels are listed on the
+        worker pool; videos stream out as each listing completes, in seed order.
+        """
+        workers = min(self.max_workers, len(SEED_CREATORS)) or 1
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="channels"
+        ) as pool:
+            listings = pool.map(
+                lambda creator: self._list_channel_videos(
+                    channel_url=creator["channel_url"],
+                    channel_name=creator["name"],
+                    max_videos=max_videos_per_creator,
+                ),
+                SEED_CREATORS,
+            )
+            for video_ids in listings:
+                for video_id in video_ids:
+                    yield video_id, None
+
     # ==================================================================
     # CORE: Video Processing Pipeline
     # ==================================================================
@@ -391,6 +732,7 @@ class CreatorDiscovery:
         self,
         video_id: str,
         search_metadata: Optional[Dict] = None,
+        prefetched_metadata=MISS,
     ) -> Optional[Dict]:
         """
         Core processing pipeline for a single video:
@@ -401,79 +743,184 @@ class CreatorDiscovery:
         5. Match codes to brands
 
         Returns a discovery dict or None if no codes found.
-        """
-        self.stats["videos_processed"] += 1
+        Safe to run on worker threads: network calls are rate-limited and
+        stats go through _bump(). Pass prefetched_metadata (dict or None)
+        to skip the per-video yt-dlp call.
 
+        Each step is also exposed on its own (_fetch_video,
+        _extract_from_video, _match_video_codes) for DiscoveryPipeline.
+        """
         try:
-            # Step 1: Get video metadata
-            metadata = self.transcript_svc.get_video_metadata(video_id)
-            if not metadata:
-                # Fall back to search metadata if available
-                if search_metadata:
-                    metadata = {
-                        "title": search_metadata.get("title", ""),
-                        "description": "",
-                        "channel_id": search_metadata.get("channel_id", ""),
-                        "channel_name": search_metadata.get("channel_name", ""),
-                        "channel_url": search_metadata.get("channel_url", ""),
-                        "upload_date": "",
-                        "view_count": search_metadata.get("view_count", 0),
-                        "duration": search_metadata.get("duration", 0),
-                        "tags": [],
-                    }
-                else:
-                    return None
+            fetched = self._fetch_video(video_id, search_metadata, prefetched_metadata)
+            extracted = self._extract_from_video(fetched) if fetched else None
+            return self._match_video_codes(extracted) if extracted else None
+        except Exception as e:
+            print(f"    Error processing video {video_id}: {e}")
+            self._bump("errors")
+            return None
 
+    def _fetch_video(
+        self,
+        video_id: str,
+        search_metadata: Optional[Dict] = None,
+        prefetched_metadata=MISS,
+        sponsor_segments: Optional[List[Dict]] = None,
+    ) -> Optional[Dict]:
+        """
+        Steps 1-2: metadata and transcript (network).
+        Returns {video_id, metadata, transcript, segments, sponsor_segments,
+        definitive} or None if there is nothing to extract from. Sponsor
+        segments are looked up here for long videos unless the caller
+        passes them. definitive is False when the transcript or metadata
+        fetch failed transiently; such videos are not checkpointed, so a
+        later run tries them again.
+        """
+        self._bump("videos_processed")
+
+        # Step 1: Get video metadata (only pace real network fetches)
+        if prefetched_metadata is not MISS:
+            metadata = prefetched_metadata
+        else:
+            if not self.transcript_svc.is_cached(video_id, "metadata"):
+                with self.metrics.timer("rate_limit_wait"):
+                    self.rate_limiter.acquire(YOUTUBE_HOST)
+            with self.metrics.timer("metadata"):
+                metadata = self.transcript_svc.get_video_metadata(video_id)
+        # A missing result is only final if the video is known to be unavailable
+        definitive = bool(metadata) or self.transcript_svc.is_cached(video_id, "metadata")
+        if not metadata:
+            # Fall back to search metadata if available
+            if search_metadata:
+                metadata = {
+                    "title": search_metadata.get("title", ""),
+                    "description": "",
+                    "channel_id": search_metadata.get("channel_id", ""),
+                    "channel_name": search_metadata.get("channel_name", ""),
+                    "channel_url": search_metadata.get("channel_url", ""),
+                    "upload_date": "",
+                    "view_count": search_metadata.get("view_count", 0),
+                    "duration": search_metadata.get("duration", 0),
+                    "tags": [],
+                }
+            else:
+                return None
+
+        # Step 2: Get transcript (timed segments)
+        if not self.transcript_svc.is_cached(video_id, "segments"):
+            with self.metrics.timer("rate_limit_wait"):
+                self.rate_limiter.acquire(YOUTUBE_HOST)
+        with self.metrics.timer("transcript"):
+            segments, transcript_definitive = self.transcript_svc.lookup_transcript_segments(video_id)
+
+        if sponsor_segments is None and self._wants_sponsor_windows(metadata):
+            with self.metrics.timer("sponsorblock"):
+                sponsor_segments = self.sponsorblock_svc.get_sponsor_segments(video_id)
+
+        return {
+            "video_id": video_id,
+            "metadata": metadata,
+            "transcript": segments.text if segments is not None else None,
+            "segments": segments,
+            "sponsor_segments": sponsor_segments or [],
+            "definitive": definitive and transcript_definitive,
+        }
+
+    @staticmethod
+    def _wants_sponsor_windows(metadata: Optional[Dict]) -> bool:
+        """Long videos are worth a SponsorBlock lookup to target extraction."""
+        return ((metadata or {}).get("duration") or 0) >= TARGETED_MIN_DURATION
+
+    def _extract_from_video(self, fetched: Dict) -> Optional[Dict]:
+        """
+        Steps 3-4: codes with context and brand indicators (CPU only).
+        Returns fetched plus codes/brand_indicators, or None if no codes.
+
+        With sponsor segments and a timed transcript, only the title,
+        description and transcript text around the sponsor reads are
+        scanned; the full text is scanned when that finds nothing.
+        Transcript codes carry the "timestamp" (seconds) they were said at.
+        """
+        with self.metrics.timer("extraction"):
+            metadata = fetched["metadata"]
             description = metadata.get("description", "") or ""
             title = metadata.get("title", "") or ""
+            segments = fetched.get("segments")
+            sponsor_windows = [
+                (seg["start"], seg["end"]) for seg in fetched.get("sponsor_segments") or []
+            ]
+
+            # Step 3: Extract codes with context
+            codes_with_context = []
+            if segments is not None and sponsor_windows:
+                codes_with_context = extract_codes_with_context(
+                    "\n\n".join(filter(None, [title, description]))
+                )
+                seen = {c["code"] for c in codes_with_context}
+                codes_with_context += [
+                    c for c in extract_codes_in_windows(segments, sponsor_windows)
+                    if c["code"] not in seen
+                ]
+                if codes_with_context:
+                    self._bump("transcripts_targeted")
 
-            # Step 2: Get transcript
-            transcript = self.transcript_svc.get_transcript(video_id)
-
-            # Step 3: Combine all text sources
-            combined_text = "\n\n".join(
-                filter(None, [title, description, transcript])
-            )
+            if not codes_with_context:
+                # Combine all text sources
+                header = "\n\n".join(filter(None, [title, description]))
+                combined_text = "\n\n".join(filter(None, [header, fetched["transcript"]]))
+                if not combined_text.strip():
+                    return None
 
-            if not combined_text.strip():
-                return None
+                transcript_base = len(header) + 2 if header else 0
+                for code_info, offset in iter_codes_with_context(combined_text):
+                    if segments is not None and offset >= transcript_base:
+                        code_info["timestamp"] = segments.time_at(offset - transcript_base)
+                    codes_with_context.append(code_info)
 
-            # Step 4: Extract codes with context
-            codes_with_context = extract_codes_with_context(combined_text)
             if not codes_with_context:
+                if fetched.get("definitive"):
+                    self._mark_processed([fetched["video_id"]])
                 return None
 
-            self.stats["codes_found"] += len(codes_with_context)
+            self._bump("codes_found", len(codes_with_context))
 
-            # Step 5: Extract brand indicators from description
-            brand_indicators = extract_brand_indicators(description)
+            # Step 4: Extract brand indicators from description
+            return {
+                **fetched,
+                "codes": codes_with_context,
+                "brand_indicators": extract_brand_indicators(description),
+            }
 
-            # Step 6: Match codes to brands
-            known_brands = self._load_known_brands()
+    def _match_video_codes(self, extracted: Dict) -> Dict:
+        """Step 5: match codes to known brands and build the discovery dict."""
+        brand_index = self._load_brand_index()
+        with self.metrics.timer("brand_matching"):
             matched_codes = []
-            for code_info in codes_with_context:
+            for code_info in extracted["codes"]:
                 brand = match_code_to_brand(
                     code_info["code"],
                     code_info["context"],
-                    known_brands,
+                    brand_index,
                 )
                 matched_codes.append({
                     "code": code_info["code"],
                     "context": code_info["context"],
                     "probable_brand": code_info.get("probable_brand"),
                     "matched_brand": brand,
+                    "timestamp": code_info.get("timestamp"),
                 })
 
             # Build discovery result
+            video_id = extracted["video_id"]
+            metadata = extracted["metadata"]
             creator_name = metadata.get("channel_name", "") or ""
             channel_id = metadata.get("channel_id", "") or ""
 
             if creator_name:
-                self.stats["creators_found"] += 1
+                self._bump("creators_found")
 
-            return {
+            return self.registry.attach(video_id, {
                 "video_id": video_id,
-                "video_title": title,
+                "video_title": metadata.get("title", "") or "",
                 "video_url": f"https://www.youtube.com/watch?v={video_id}",
                 "creator_name": creator_name,
                 "creator_channel_id": channel_id,
@@ -481,23 +928,22 @@ class CreatorDiscovery:
                 "upload_date": metadata.get("upload_date", ""),
                 "view_count": metadata.get("view_count", 0),
                 "codes": matched_codes,
-                "brand_indicators": brand_indicators,
-                "had_transcript": transcript is not None,
-                "had_sponsor_segments": False,  # Set by caller if applicable
-            }
-
-        except Exception as e:
-            print(f"    Error processing video {video_id}: {e}")
-            self.stats["errors"] += 1
-            return None
+                "brand_indicators": extracted["brand_indicators"],
+                "had_transcript": extracted["transcript"] is not None,
+                "had_sponsor_segments": extracted.get("had_sponsor_segments", False),
+                "definitive": extracted.get("definitive", False),
+            })
 
     # ==================================================================
     # DATABASE PERSISTENCE
     # ==================================================================
     def save_discoveries(self, discoveries: List[Dict]) -> Dict[str, int]:
         """
-        Save discovery results to Supabase.
-        Upserts creators, resolves brands, creates offers.
+        Save discovery results to Supabase in bulk.
+        Creators, brands and offers from the whole run are deduped in
+        memory and written in batches of SAVE_BATCH_SIZE, so round-trips
+        grow with the number of batches rather than the number of offers.
+        A failed batch falls back to row-by-row writes.
 
         Returns summary stats dict.
         """
@@ -507,247 +953,506 @@ class CreatorDiscovery:
 
         saved_stats = {
             "creators_upserted": 0,
+            "creators_created": 0,
             "brands_resolved": 0,
             "brands_created": 0,
             "offers_created": 0,
             "offers_updated": 0,
+            "offer_lookups_failed": 0,
         }
 
-        for disc in discoveries:
-            try:
-                # 1. Upsert creator
-                creator_id = self._upsert_creator(
-                    channel_id=disc.get("creator_channel_id"),
-                    channel_name=disc.get("creator_name"),
-                    channel_url=disc.get("creator_channel_url"),
-                    discovery_source="creator_discovery",
-                )
-                if creator_id:
-                    saved_stats["creators_upserted"] += 1
-
-                # 2. Process each code
-                for code_info in disc.get("codes", []):
-                    code = code_info["code"]
-                    matched_brand = code_info.get("matched_brand")
-
-                    # Resolve brand
-                    brand_id = None
-                    if matched_brand:
-                        brand_id = matched_brand.get("id")
-                        saved_stats["brands_resolved"] += 1
-                    else:
-                        # Try to create brand from indicators
-                        brand_id = self._resolve_brand_from_context(
-                            code_info, disc.get("brand_indicators", [])
-                        )
-                        if brand_id:
-                            saved_stats["brands_created"] += 1
-
-                    if not creator_id:
-                        continue
-
-                    # 3. Upsert offer
-                    result = self._upsert_offer(
-                        creator_id=creator_id,
-                        brand_id=brand_id,
-                        code=code,
-                        source_video_id=disc.get("video_id"),
-                    )
-                    if result == "created":
-                        saved_stats["offers_created"] += 1
-                    elif result == "updated":
-                        saved_stats["offers_updated"] += 1
+        # 1. Creators
+        creator_ids = self._save_creators(discoveries, saved_stats)
 
-            except Exception as e:
-                print(f"  Error saving discovery for {disc.get('creator_name')}: {e}")
-                self.stats["errors"] += 1
+        # 2. Brands: matched during processing, or resolved from context
+        offer_refs: List[Tuple[Optional[str], Dict, Dict]] = []
+        unresolved: List[Tuple[Dict, List[Dict]]] = []
+        for disc in discoveries:
+            creator_id = creator_ids.get(_creator_key(disc))
+            for code_info in disc.get("codes", []):
+                matched_brand = code_info.get("matched_brand")
+                if matched_brand:
+                    saved_stats["brands_resolved"] += 1
+                else:
+                    unresolved.append((code_info, disc.get("brand_indicators", [])))
+                offer_refs.append((creator_id, code_info, disc))
+
+        resolved_ids = self._resolve_brands_from_context(unresolved)
+        saved_stats["brands_created"] = sum(1 for bid in resolved_ids if bid)
+        resolved = iter(resolved_ids)
+
+        # 3. Offers, deduped on (creator_id, brand_id, code)
+        offers: Dict[Tuple[str, Optional[str], str], Optional[str]] = {}
+        video_offers: Dict[str, Set[Tuple]] = {}
+        unsaved_videos: Set[str] = set()  # creator write failed
+        for creator_id, code_info, disc in offer_refs:
+            matched_brand = code_info.get("matched_brand")
+            brand_id = matched_brand.get("id") if matched_brand else next(resolved)
+            video_id = disc.get("video_id")
+            if not creator_id:
+                if disc.get("creator_name") or disc.get("creator_channel_id"):
+                    unsaved_videos.add(video_id)
+                continue
+            key = (creator_id, brand_id, code_info["code"])
+            offers.setdefault(key, video_id)
+            video_offers.setdefault(video_id, set()).add(key)
+
+        written = self._save_offers(offers, saved_stats)
+
+        # Checkpoint only videos that were fetched in full and whose offers
+        # all made it to the database; the rest are retried next run
+        self._mark_processed(
+            [
+                disc["video_id"] for disc in discoveries
+                if disc.get("video_id") and disc.get("definitive")
+                and disc["video_id"] not in unsaved_videos
+                and video_offers.get(disc["video_id"], set()) <= written
+            ],
+            had_codes=True,
+        )
 
-        self.stats["codes_saved"] = saved_stats["offers_created"]
-        self.stats["creators_new"] = saved_stats["creators_upserted"]
-        self.stats["brands_matched"] = saved_stats["brands_resolved"]
-        self.stats["brands_created"] = saved_stats["brands_created"]
+        # Accumulate: the streaming pipeline saves in several batches
+        self._bump("codes_saved", saved_stats["offers_created"])
+        self._bump("creators_new", saved_stats["creators_created"])
+        self._bump("brands_matched", saved_stats["brands_resolved"])
+        self._bump("brands_created", saved_stats["brands_created"])
 
-        print(f"\n  Creators upserted: {saved_stats['creators_upserted']}")
+        print(f"\n  Creators upserted: {saved_stats['creators_upserted']} "
+              f"({saved_stats['creators_created']} new)")
         print(f"  Brands resolved:   {saved_stats['brands_resolved']}")
         print(f"  Brands created:    {saved_stats['brands_created']}")
         print(f"  Offers created:    {saved_stats['offers_created']}")
         print(f"  Offers updated:    {saved_stats['offers_updated']}")
+        if saved_stats["offer_lookups_failed"]:
+            print(f"  Offer lookups failed: {saved_stats['offer_lookups_failed']} batches "
+                  f"(saved row by row)")
 
         return saved_stats
 
+    def _select_paged(self, stage: str, build_query) -> List[Dict]:
+        """Run a select built by build_query() page by page (PostgREST caps rows per response)."""
+        rows: List[Dict] = []
+        start = 0
+        while True:
+            result = self._execute(
+                f"{stage}.select", build_query().range(start, start + SELECT_PAGE_SIZE - 1)
+            )
+            page = result.data or []
+            rows.extend(page)
+            if len(page) < SELECT_PAGE_SIZE:
+                return rows
+            start += SELECT_PAGE_SIZE
+
+    # ------------------------------------------------------------------
+    # Bulk persistence: creators
+    # ------------------------------------------------------------------
+    def _save_creators(
+        self,
+        discoveries: List[Dict],
+        saved_stats: Dict[str, int],
+    ) -> Dict[str, str]:
+        """
+        Find or create every creator referenced by discoveries.
+        Returns {creator key: creator_id} (see _creator_key).
+        """
+        creators: Dict[str, Dict] = {}
+        for disc in discoveries:
+            if not disc.get("creator_name") and not disc.get("creator_channel_id"):
+                continue
+            creators.setdefault(_creator_key(disc), {
+                "channel_id": disc.get("creator_channel_id"),
+                "channel_name": disc.get("creator_name"),
+                "channel_url": disc.get("creator_channel_url"),
+            })
+
+        creator_ids: Dict[str, str] = {}
+        missing: Dict[str, Dict] = {}
+        for key, creator in creators.items():
+            creator_id = self._match_creator(
+                creator["channel_id"],
+                creator["channel_name"],
+                _username_from_url(creator["channel_url"]),
+            )
+            if creator_id:
+                creator_ids[key] = creator_id
+            else:
+                missing[key] = creator
+
+        # One batched touch instead of an update per hit
+        now = datetime.now().isoformat()
+        for chunk in _chunks(sorted(set(creator_ids.values())), SAVE_BATCH_SIZE):
+            try:
+                self._execute("creators.update", self.supabase.table("creators").update({
+                    "updated_at": now,
+                }).in_("id", chunk))
+            except Exception:
+                pass  # Column might not exist yet
+
+        # Create the rest in batches
+        for chunk in _chunks(list(missing.items()), SAVE_BATCH_SIZE):
+            rows = [
+                _new_creator_row(c["channel_id"], c["channel_name"], c["channel_url"])
+                for _, c in chunk
+            ]
+            try:
+                result = self._execute(
+                    "creators.insert", self.supabase.table("creators").insert(rows)
+                )
+                creator_index = self._load_creator_index()
+                for (key, _), row in zip(chunk, result.data or []):
+                    creator_ids[key] = row["id"]
+                    creator_index.add(row)
+                    saved_stats["creators_created"] += 1
+                    print(f"    + New creator: {row.get('display_name')} ({row['id'][:8]}...)")
+            except Exception as e:
+                # e.g. a duplicate affiliate_ref_code — retry one by one
+                print(f"    Warning creating {len(rows)} creators in bulk: {e}")
+                for key, creator in chunk:
+                    creator_id, created = self._upsert_creator(
+                        channel_id=creator["channel_id"],
+                        channel_name=creator["channel_name"],
+                        channel_url=creator["channel_url"],
+                        discovery_source="creator_discovery",
+                    )
+                    if creator_id:
+                        creator_ids[key] = creator_id
+                    if created:
+                        saved_stats["creators_created"] += 1
+
+        saved_stats["creators_upserted"] = len(creator_ids)
+        return creator_ids
+
     def _upsert_creator(
         self,
         channel_id: Optional[str],
         channel_name: Optional[str],
         channel_url: Optional[str] = None,
         discovery_source: str = "creator_discovery",
-    ) -> Optional[str]:
+    ) -> Tuple[Optional[str], bool]:
         """
-        Find or create a creator in the database.
-        Returns creator_id or None.
+        Find or create a single creator in the database.
+        Row-by-row fallback for _save_creators.
+        Returns (creator_id or None, whether it was created).
         """
         if not channel_name and not channel_id:
-            return None
+            return None, False
 
         try:
             # Try to find existing creator
-            existing_id = self._match_creator(channel_id, channel_name)
+            existing_id = self._match_creator(
+                channel_id, channel_name, _username_from_url(channel_url),
+            )
             if existing_id:
-                # Update last_scraped_at if the column exists
-                try:
-                    self.supabase.table("creators").update({
-                        "updated_at": datetime.now().isoformat(),
-                    }).eq("id", existing_id).execute()
-                except Exception:
-                    pass  # Column might not exist yet
-                return existing_id
-
-            # Create new creator
-            display_name = channel_name or "Unknown"
-
-            # Generate ref code from channel name
-            ref_code = re.sub(r"[^a-z0-9]", "", display_name.lower())[:20]
-
-            # Extract username from channel URL (@username)
-            username = None
-            if channel_url:
-                username_match = re.search(r"@([A-Za-z0-9_-]+)", channel_url)
-                if username_match:
-                    username = username_match.group(1)
-
-            creator_data = {
-                "display_name": display_name,
-                "youtube_channel_id": channel_id or None,
-                "youtube_username": username,
-                "youtube_channel_url": channel_url or None,
-                "affiliate_ref_code": ref_code,
-            }
+                return existing_id, False
+
+            creator_data = _new_creator_row(channel_id, channel_name, channel_url)
             # Remove None values (Supabase doesn't like explicit nulls on insert)
             creator_data = {k: v for k, v in creator_data.items() if v is not None}
+            return self._insert_creator(creator_data)
 
-            result = (
-                self.supabase.table("creators").insert(creator_data).execute()
-            )
-            if result.data:
-                new_id = result.data[0]["id"]
-                print(f"    + New creator: {display_name} ({new_id[:8]}...)")
-                return new_id
+        except Exception as e:
+            # If insert fails (e.g. created since the index was loaded),
+            # ask the database directly
+            print(f"    Warning creating creator '{channel_name}': {e}")
 
+        try:
+            existing_id = self._fetch_creator(channel_id, channel_name)
+            if existing_id:
+                return existing_id, False
+            # Not in the database either: the insert collided with another
+            # channel's affiliate_ref_code ("TECH TIPS" vs "Tech Tips")
+            creator_data = _new_creator_row(channel_id, channel_name, channel_url)
+            creator_data = {k: v for k, v in creator_data.items() if v is not None}
+            creator_data["affiliate_ref_code"] = _disambiguated_ref_code(
+                creator_data["affiliate_ref_code"], channel_id or channel_name,
+            )
+            return self._insert_creator(creator_data)
         except Exception as e:
-            # If insert fails (e.g. duplicate), try to find again
             print(f"    Warning creating creator '{channel_name}': {e}")
-            try:
-                existing_id = self._match_creator(channel_id, channel_name)
-                if existing_id:
-                    return existing_id
-            except Exception:
-                pass
 
-        return None
+        return None, False
+
+    def _insert_creator(self, creator_data: Dict) -> Tuple[Optional[str], bool]:
+        """Insert one creator row and index it. Returns (creator_id, True) or (None, False)."""
+        result = self._execute(
+            "creators.insert", self.supabase.table("creators").insert(creator_data)
+        )
+        if not result.data:
+            return None, False
+        new_id = result.data[0]["id"]
+        self._load_creator_index().add(result.data[0])
+        print(f"    + New creator: {creator_data['display_name']} ({new_id[:8]}...)")
+        return new_id, True
 
     def _match_creator(
         self,
         channel_id: Optional[str],
         display_name: Optional[str],
+        username: Optional[str] = None,
     ) -> Optional[str]:
-        """Match an existing creator by channel_id or display_name."""
+        """
+        Match an existing creator by channel_id, username or display_name
+        against the in-memory CreatorIndex (no network after the first load).
+        """
+        return self._load_creator_index().match(channel_id, username, display_name)
+
+    def _fetch_creator(
+        self,
+        channel_id: Optional[str],
+        display_name: Optional[str],
+    ) -> Optional[str]:
+        """Query the database for a creator missing from the index."""
         # Try by channel ID (most reliable)
         if channel_id:
-            result = (
+            result = self._execute(
+                "creators.select",
                 self.supabase.table("creators")
-                .select("id")
-                .eq("youtube_channel_id", channel_id)
-                .execute()
+                .select("id, display_name, youtube_channel_id, youtube_username")
+                .eq("youtube_channel_id", channel_id),
             )
             if result.data:
+                self._load_creator_index().add(result.data[0])
                 return result.data[0]["id"]
 
-        # Try by display name (fuzzy)
-        if display_name and len(display_name) >= 3:
-            result = (
+        # Try by display name: ilike narrows the candidates, CreatorIndex
+        # keeps only an exact normalized match that isn't another channel
+        if len(normalize_creator_name(display_name)) >= MIN_NAME_LENGTH:
+            result = self._execute(
+                "creators.select",
                 self.supabase.table("creators")
-                .select("id")
-                .ilike("display_name", f"%{display_name}%")
-                .execute()
+                .select("id, display_name, youtube_channel_id, youtube_username")
+                .ilike("display_name", f"%{display_name}%"),
             )
-            if result.data:
-                return result.data[0]["id"]
+            rows = result.data or []
+            creator_id = CreatorIndex(rows).match(channel_id, display_name=display_name)
+            if creator_id:
+                self._load_creator_index().add(next(r for r in rows if r["id"] == creator_id))
+                return creator_id
 
         return None
 
-    def _resolve_brand_from_context(
+    # ------------------------------------------------------------------
+    # Bulk persistence: brands
+    # ------------------------------------------------------------------
+    def _resolve_brands_from_context(
         self,
-        code_info: Dict,
-        brand_indicators: List[Dict],
-    ) -> Optional[str]:
+        items: List[Tuple[Dict, List[Dict]]],
+    ) -> List[Optional[str]]:
         """
-        Try to resolve a brand from code context and brand indicators.
-        If we're confident enough, auto-create the brand.
+        Resolve a brand for each (code_info, brand_indicators) pair from
+        the code's probable_brand. Known brands are looked up in the
+        in-memory brand index. Unknown brands with a matching URL indicator
+        (higher confidence) are auto-created with one batched upsert on
+        domain_pattern.
 
-        Returns brand_id or None.
+        Returns one brand_id (or None) per item.
         """
-        probable = code_info.get("probable_brand")
-        if not probable:
-            return None
+        brand_index = self._load_brand_index()
+        by_name: Dict[str, Optional[str]] = {}
+        to_create: Dict[str, Dict[str, str]] = {}
+        pending: List[Tuple[Optional[str], Optional[str]]] = []  # (brand_id, domain)
+
+        for code_info, brand_indicators in items:
+            probable = code_info.get("probable_brand")
+            if not probable:
+                pending.append((None, None))
+                continue
+
+            # Check if brand already exists by name
+            key = probable.lower()
+            if key not in by_name:
+                by_name[key] = next(
+                    (
+                        brand.get("id") for brand in brand_index.brands
+                        if key in (brand.get("name") or "").lower()
+                    ),
+                    None,
+                )
+            if by_name[key]:
+                pending.append((by_name[key], None))
+                continue
+
+            # Look for a matching brand indicator (URL) for higher confidence
+            matching_indicator = None
+            for indicator in brand_indicators:
+                if key in indicator.get("name", "").lower():
+                    matching_indicator = indicator
+                    break
+                if key in indicator.get("domain", "").lower():
+                    matching_indicator = indicator
+                    break
+
+            # Only auto-create if we have a domain indicator (higher confidence)
+            if matching_indicator and matching_indicator.get("domain"):
+                domain = matching_indicator["domain"]
+                to_create.setdefault(domain, {
+                    "name": matching_indicator.get("name", probable),
+                    "domain_pattern": domain,
+                })
+                pending.append((None, domain))
+            else:
+                pending.append((None, None))
 
-        # Check if brand already exists by name
-        try:
-            result = (
-                self.supabase.table("brands")
-                .select("id")
-                .ilike("name", f"%{probable}%")
-                .execute()
+        domain_ids: Dict[str, str] = {}
+        for chunk in _chunks(list(to_create.values()), SAVE_BATCH_SIZE):
+            domains = [row["domain_pattern"] for row in chunk]
+            try:
+                # ignore_duplicates keeps existing brands' names untouched;
+                # the select below picks up their ids either way
+                self._execute("brands.upsert", self.supabase.table("brands").upsert(
+                    chunk, on_conflict="domain_pattern", ignore_duplicates=True,
+                ))
+                rows = self._execute(
+                    "brands.select",
+                    self.supabase.table("brands")
+                    .select("id, name, domain_pattern")
+                    .in_("domain_pattern", domains),
+                ).data or []
+            except Exception as e:
+                print(f"    Warning creating {len(chunk)} brands: {e}")
+                continue
+            with self._brands_lock:
+                known_ids = {brand.get("id") for brand in brand_index.brands}
+                for row in rows:
+                    domain_ids[row["domain_pattern"]] = row["id"]
+                    if row["id"] not in known_ids:
+                        print(f"    + New brand: {row['name']} ({row['domain_pattern']})")
+                        # Make it matchable for the rest of the run
+                        brand_index.add(row)
+
+        return [
+            brand_id or (domain_ids.get(domain) if domain else None)
+            for brand_id, domain in pending
+        ]
+
+    # ------------------------------------------------------------------
+    # Bulk persistence: offers
+    # ------------------------------------------------------------------
+    def _save_offers(
+        self,
+        offers: Dict[Tuple[str, Optional[str], str], Optional[str]],
+        saved_stats: Dict[str, int],
+    ) -> Set[Tuple[str, Optional[str], str]]:
+        """
+        Write deduped offers keyed by (creator_id, brand_id, code).
+        Returns the keys that were written (created or re-activated).
+
+        Existing offers are prefetched per creator batch to report
+        created vs updated. Existing ones are re-activated with one update
+        per batch. New branded offers are upserted on the
+        UNIQUE(creator_id, brand_id, code) constraint. New unbranded ones
+        are inserted, since NULL brand_ids never conflict.
+
+        Offers whose prefetch failed, and batches whose write failed, go
+        through _upsert_offer one by one so they are still counted right.
+        """
+        written: Set[Tuple[str, Optional[str], str]] = set()
+        if not offers:
+            return written
+
+        # Prefetch existing offers for the creators/codes we touch
+        existing_rows: List[Dict] = []
+        unchecked: Set[str] = set()  # creators whose lookup failed
+        creator_ids = sorted({creator_id for creator_id, _, _ in offers})
+        for chunk in _chunks(creator_ids, SAVE_BATCH_SIZE):
+            chunk_set = set(chunk)
+            codes = sorted({code for cid, _, code in offers if cid in chunk_set})
+            try:
+                existing_rows.extend(self._select_paged(
+                    "offers",
+                    lambda: self.supabase.table("offers")
+                    .select("id, creator_id, brand_id, code")
+                    .in_("creator_id", chunk)
+                    .in_("code", codes)
+                ))
+            except Exception as e:
+                print(f"    Warning looking up offers: {e}")
+                saved_stats["offer_lookups_failed"] += 1
+                self._bump("errors")
+                unchecked.update(chunk)
+
+        by_key: Dict[Tuple, str] = {}
+        by_creator_code: Dict[Tuple[str, str], str] = {}
+        for row in existing_rows:
+            by_key.setdefault((row["creator_id"], row.get("brand_id"), row["code"]), row["id"])
+            by_creator_code.setdefault((row["creator_id"], row["code"]), row["id"])
+
+        to_touch: Dict[str, List[Tuple]] = {}  # existing offer id -> keys
+        new_branded: List[Dict] = []
+        new_unbranded: List[Dict] = []
+        row_by_row: List[Dict] = []
+        source_videos: Dict[Tuple, Optional[str]] = {}
+        for (creator_id, brand_id, code), video_id in offers.items():
+            # Unbranded codes match any existing offer for the creator + code
+            existing_id = (
+                by_key.get((creator_id, brand_id, code)) if brand_id
+                else by_creator_code.get((creator_id, code))
             )
-            if result.data:
-                return result.data[0]["id"]
-        except Exception:
-            pass
-
-        # Look for a matching brand indicator (URL) for higher confidence
-        matching_indicator = None
-        for indicator in brand_indicators:
-            if probable.lower() in indicator.get("name", "").lower():
-                matching_indicator = indicator
-                break
-            if probable.lower() in indicator.get("domain", "").lower():
-                matching_indicator = indicator
-                break
+            if existing_id:
+                to_touch.setdefault(existing_id, []).append((creator_id, brand_id, code))
+                continue
+            offer_data = {
+                "creator_id": creator_id,
+                "code": code,
+                "discount_amount": "Found on YouTube",
+                "discount_type": "percentage",
+                "is_active": True,
+            }
+            source_videos[(creator_id, brand_id, code)] = video_id
+            if brand_id:
+                offer_data["brand_id"] = brand_id
+            if creator_id in unchecked:
+                # Unknown whether it exists: let the row path look it up
+                row_by_row.append(offer_data)
+            elif brand_id:
+                new_branded.append(offer_data)
+            else:
+                new_unbranded.append(offer_data)
 
-        # Only auto-create if we have a domain indicator (higher confidence)
-        if matching_indicator:
-            domain = matching_indicator.get("domain", "")
-            brand_name = matching_indicator.get("name", probable)
+        now = datetime.now().isoformat()
+        for chunk in _chunks(sorted(to_touch), SAVE_BATCH_SIZE):
             try:
-                result = (
-                    self.supabase.table("brands")
-                    .insert({
-                        "name": brand_name,
-                        "domain_pattern": domain,
-                    })
-                    .execute()
-                )
-                if result.data:
-                    new_id = result.data[0]["id"]
-                    print(f"    + New brand: {brand_name} ({domain})")
-                    # Refresh brand cache
-                    self._known_brands_cache = None
-                    return new_id
+                self._execute("offers.update", self.supabase.table("offers").update({
+                    "is_active": True,
+                    "updated_at": now,
+                }).in_("id", chunk))
+                saved_stats["offers_updated"] += len(chunk)
+                written.update(key for offer_id in chunk for key in to_touch[offer_id])
             except Exception as e:
-                print(f"    Warning creating brand '{brand_name}': {e}")
-                # Might already exist (race condition), try to find it
+                print(f"    Warning updating {len(chunk)} offers: {e}")
+                self._bump("errors")
+
+        for rows, op, write in (
+            (new_branded, "offers.upsert", lambda chunk: self.supabase.table("offers").upsert(
+                chunk, on_conflict="creator_id,brand_id,code",
+            )),
+            (new_unbranded, "offers.insert", lambda chunk: self.supabase.table("offers").insert(chunk)),
+        ):
+            for chunk in _chunks(rows, SAVE_BATCH_SIZE):
                 try:
-                    result = (
-                        self.supabase.table("brands")
-                        .select("id")
-                        .ilike("name", f"%{brand_name}%")
-                        .execute()
-                    )
-                    if result.data:
-                        return result.data[0]["id"]
-                except Exception:
-                    pass
-
-        return None
+                    self._execute(op, write(chunk))
+                    saved_stats["offers_created"] += len(chunk)
+                    written.update(_offer_key(offer) for offer in chunk)
+                except Exception as e:
+                    print(f"    Warning saving {len(chunk)} offers in bulk: {e}")
+                    row_by_row.extend(chunk)
+
+        for offer in row_by_row:
+            result = self._upsert_offer(
+                creator_id=offer["creator_id"],
+                brand_id=offer.get("brand_id"),
+                code=offer["code"],
+                source_video_id=source_videos.get(_offer_key(offer)),
+            )
+            if result == "created":
+                saved_stats["offers_created"] += 1
+            elif result == "updated":
+                saved_stats["offers_updated"] += 1
+            else:
+                self._bump("errors")
+                continue
+            written.add(_offer_key(offer))
+        return written
 
     def _upsert_offer(
         self,
@@ -757,8 +1462,8 @@ class CreatorDiscovery:
         source_video_id: Optional[str] = None,
     ) -> Optional[str]:
         """
-        Create or update an offer in the database.
-        Returns 'created', 'updated', or None.
+        Create or update a single offer in the database.
+        Row-by-row fallback for _save_offers. Returns 'created', 'updated', or None.
         """
         try:
             # Check if offer already exists (same creator + code)
@@ -771,7 +1476,7 @@ class CreatorDiscovery:
             if brand_id:
                 query = query.eq("brand_id", brand_id)
 
-            existing = query.execute()
+            existing = self._execute("offers.select", query)
 
             if existing.data and len(existing.data) > 0:
                 # Update existing offer
@@ -779,9 +1484,9 @@ class CreatorDiscovery:
                     "is_active": True,
                     "updated_at": datetime.now().isoformat(),
                 }
-                self.supabase.table("offers").update(update_data).eq(
+                self._execute("offers.update", self.supabase.table("offers").update(update_data).eq(
                     "id", existing.data[0]["id"]
-                ).execute()
+                ))
                 return "updated"
             else:
                 # Create new offer
@@ -795,7 +1500,7 @@ class CreatorDiscovery:
                 if brand_id:
                     offer_data["brand_id"] = brand_id
 
-                self.supabase.table("offers").insert(offer_data).execute()
+                self._execute("offers.insert", self.supabase.table("offers").insert(offer_data))
                 return "created"
 
         except Exception as e:
@@ -813,6 +1518,17 @@ class CreatorDiscovery:
         for key, val in self.stats.items():
             label = key.replace("_", " ").title()
             print(f"  {label:.<30} {val}")
+        if self.video_cache is not None:
+            print(f"  Video cache: {self.video_cache.summary()}")
+        if self.checkpoints is not None:
+            print(f"  Checkpoints: {self.checkpoints.summary()}")
+        print(f"  Videos: {self.registry.summary()}")
+        print(f"  HTTP: {self.sponsorblock_svc.transport.summary()}")
+        stage_lines = self.metrics.summary_lines()
+        if stage_lines:
+            print("  Stage timings:")
+            for line in stage_lines:
+                print(line)
         print(f"{'='*60}")
 
 
@@ -823,11 +1539,28 @@ def run_creator_discovery(
     strategies: Optional[List[str]] = None,
     max_results: int = 10,
     max_videos_per_creator: int = 10,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    use_cache: bool = True,
+    cache_path: str = DEFAULT_CACHE_PATH,
+    use_checkpoints: bool = True,
+    checkpoint_path: str = DEFAULT_CHECKPOINT_PATH,
+    metrics_enabled: bool = METRICS_ENABLED,
+    metrics_json: Optional[str] = None,
+    metrics_prom: Optional[str] = None,
+    supabase_client: Optional[Client] = None,
+    rate_limiter: Optional[HostRateLimiter] = None,
 ) -> Dict[str, int]:
     """
     Run creator discovery with specified strategies.
     Returns stats dict.
 
+    Stage timings are printed with the final stats and, if paths are
+    given, written as JSON (metrics_json) and as a Prometheus textfile
+    (metrics_prom).
+
+    supabase_client and rate_limiter default to the environment's Supabase
+    and the standard per-host rates (replay.py passes MemorySupabase).
+
     Strategies:
       - 'search': YouTube search (Strategy A)
       - 'sponsorblock': SponsorBlock pre-filter (Strategy B)
@@ -840,54 +1573,62 @@ def run_creator_discovery(
     print(f"  Strategies: {', '.join(strategies)}")
     print(f"  Max results per query: {max_results}")
     print(f"  Max videos per creator: {max_videos_per_creator}")
+    print(f"  Workers: {max_workers}")
+    print(f"  Video cache: {cache_path if use_cache else 'disabled'}")
+    print(f"  Checkpoints: {checkpoint_path if use_checkpoints else 'disabled'}")
     print("=" * 60)
 
-    engine = CreatorDiscovery()
-    all_discoveries = []
+    video_cache = VideoCache(cache_path) if use_cache else None
+    checkpoints = CheckpointStore(checkpoint_path) if use_checkpoints else None
+    engine = CreatorDiscovery(
+        supabase_client=supabase_client,
+        rate_limiter=rate_limiter,
+        max_workers=max_workers,
+        video_cache=video_cache,
+        checkpoints=checkpoints,
+        metrics=StageMetrics(enabled=metrics_enabled),
+    )
+
+    # Strategies feed one streaming pipeline (see discovery_pipeline.py):
+    # A and C are video sources running side by side, B tags every fetched
+    # video with SponsorBlock data. Results are deduped by video_id before
+    # any fetch and saved in batches as they come in.
+    pipeline = DiscoveryPipeline(
+        engine,
+        check_sponsorblock="sponsorblock" in strategies,
+    )
 
     # Strategy A: YouTube Search
     if "search" in strategies:
-        search_discoveries = engine.discover_via_search(
-            max_results_per_query=max_results,
+        pipeline.add_source(
+            "search",
+            engine.iter_search_videos(max_results_per_query=max_results),
         )
-        all_discoveries.extend(search_discoveries)
-
-    # Strategy B: SponsorBlock (needs video IDs from Strategy A or C)
-    if "sponsorblock" in strategies:
-        # Use video IDs from search results if available
-        video_ids = [d["video_id"] for d in all_discoveries if d.get("video_id")]
-        if video_ids:
-            sb_discoveries = engine.discover_via_sponsorblock(video_ids)
-            # Only add new discoveries (not already found)
-            existing_ids = {d["video_id"] for d in all_discoveries}
-            for disc in sb_discoveries:
-                if disc["video_id"] not in existing_ids:
-                    disc["had_sponsor_segments"] = True
-                    all_discoveries.append(disc)
 
     # Strategy C: Channel Snowball
     if "channel" in strategies:
-        channel_discoveries = engine.discover_from_seed_creators(
-            max_videos_per_creator=max_videos_per_creator,
+        pipeline.add_source(
+            "channel",
+            engine.iter_seed_channel_videos(
+                max_videos_per_creator=max_videos_per_creator,
+            ),
         )
-        all_discoveries.extend(channel_discoveries)
-
-    # Deduplicate by video_id
-    seen_ids = set()
-    unique_discoveries = []
-    for disc in all_discoveries:
-        vid = disc.get("video_id")
-        if vid and vid not in seen_ids:
-            seen_ids.add(vid)
-            unique_discoveries.append(disc)
 
-    print(f"\n  Total unique discoveries: {len(unique_discoveries)}")
-
-    # Save to database
-    if unique_discoveries:
-        engine.save_discoveries(unique_discoveries)
+    pipeline.run()
+    engine.advance_channel_marks()
 
     engine.print_stats()
+    if metrics_enabled and metrics_json:
+        engine.metrics.write_json(metrics_json, counters=engine.stats)
+        print(f"  Stage metrics written to {metrics_json}")
+    if metrics_enabled and metrics_prom:
+        engine.metrics.write_prometheus(metrics_prom, counters=engine.stats)
+        print(f"  Prometheus metrics written to {metrics_prom}")
+    if video_cache is not None:
+        TranscriptService.use_cache(None)
+        video_cache.close()
+    if checkpoints is not None:
+        checkpoints.close()
     return engine.stats
 
 
@@ -916,6 +1657,51 @@ if __name__ == "__main__":
         default=10,
         help="Max videos per creator channel (default: 10)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help=f"Videos processed concurrently (default: {DEFAULT_MAX_WORKERS})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the on-disk metadata/transcript cache",
+    )
+    parser.add_argument(
+        "--cache-path",
+        type=str,
+        default=DEFAULT_CACHE_PATH,
+        help="SQLite file for the video cache (default: scraper/.cache/videos.sqlite3)",
+    )
+    parser.add_argument(
+        "--no-checkpoints",
+        action="store_true",
+        help="Ignore and don't record run progress (reprocess every video)",
+    )
+    parser.add_argument(
+        "--checkpoint-path",
+        type=str,
+        default=DEFAULT_CHECKPOINT_PATH,
+        help="SQLite file for run checkpoints (default: scraper/.cache/checkpoints.sqlite3)",
+    )
+    parser.add_argument(
+        "--no-metrics",
+        action="store_true",
+        help="Don't time pipeline stages (also: DISCOVERY_METRICS=0)",
+    )
+    parser.add_argument(
+        "--metrics-json",
+        type=str,
+        default=None,
+        help="Write per-stage timings and run stats to this JSON file",
+    )
+    parser.add_argument(
+        "--metrics-prom",
+        type=str,
+        default=None,
+        help="Write per-stage timings as a Prometheus textfile (node_exporter collector)",
+    )
     parser.add_argument(
         "--seed-only",
         action="store_true",
@@ -940,4 +1726,12 @@ if __name__ == "__main__":
         strategies=strategy_list,
         max_results=args.max_results,
         max_videos_per_creator=args.max_videos,
+        max_workers=args.workers,
+        use_cache=not args.no_cache,
+        cache_path=args.cache_path,
+        use_checkpoints=not args.no_checkpoints,
+        checkpoint_path=args.checkpoint_path,
+        metrics_enabled=METRICS_ENABLED and not args.no_metrics,
+        metrics_json=args.metrics_json,
+        metrics_prom=args.metrics_prom,
     )
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+backrAI Creator Index
+Run-scoped, in-memory lookup of existing creators.
+
+Loaded once from the creators table and kept up to date as new creators
+are inserted, so matching a discovery to a creator needs no network calls.
+Keys, in order of reliability:
+  - YouTube channel ID
+  - YouTube username (@handle, case-insensitive)
+  - normalized display name (lowercase, letters and digits only)
+"""
+
+import re
+import threading
+from typing import Dict, Iterable, Optional, Set
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]")
+
+# Shorter names are too ambiguous to match on
+MIN_NAME_LENGTH = 3
+
+
+def normalize_creator_name(name: Optional[str]) -> str:
+    """'Dr. Mike Israetel' -> 'drmikeisraetel'"""
+    return _NON_ALNUM_RE.sub("", (name or "").lower())
+
+
+class CreatorIndex:
+    """
+    Maps channel ID, username and normalized display name to creator ID.
+    Thread-safe: workers may match and add concurrently.
+    """
+
+    def __init__(self, creators: Optional[Iterable[Dict]] = None):
+        self._by_channel: Dict[str, str] = {}
+        self._by_username: Dict[str, str] = {}
+        self._by_name: Dict[str, str] = {}
+        self._channel_of: Dict[str, Optional[str]] = {}  # creator_id -> channel_id
+        self._lock = threading.Lock()
+        for creator in creators or []:
+            self.add(creator)
+
+    def __len__(self) -> int:
+        return len(self._channel_of)
+
+    def add(self, creator: Dict):
+        """
+        Index a creator row (id, youtube_channel_id, youtube_username,
+        display_name). Earlier rows win when keys collide, matching the
+        first-row semantics of the old per-call queries.
+        """
+        creator_id = creator.get("id")
+        if not creator_id:
+            return
+        channel_id = creator.get("youtube_channel_id")
+        username = (creator.get("youtube_username") or "").lower()
+        name = normalize_creator_name(creator.get("display_name"))
+        with self._lock:
+            self._channel_of.setdefault(creator_id, channel_id)
+            if channel_id:
+                self._by_channel.setdefault(channel_id, creator_id)
+            if username:
+                self._by_username.setdefault(username, creator_id)
+            if len(name) >= MIN_NAME_LENGTH:
+                self._by_name.setdefault(name, creator_id)
+
+    def match(
+        self,
+        channel_id: Optional[str] = None,
+        username: Optional[str] = None,
+        display_name: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Return the matching creator ID or None.
+
+        Username and name matches are skipped when they point at a creator
+        that has a different channel ID than the one given — two channels
+        with the same display name are different creators.
+        """
+        with self._lock:
+            if channel_id and channel_id in self._by_channel:
+                return self._by_channel[channel_id]
+
+            candidates = []
+            if username:
+                candidates.append(self._by_username.get(username.lower()))
+            name = normalize_creator_name(display_name)
+            if len(name) >= MIN_NAME_LENGTH:
+                candidates.append(self._by_name.get(name))
+
+            for creator_id in candidates:
+                if not creator_id:
+                    continue
+                known_channel = self._channel_of.get(creator_id)
+                if channel_id and known_channel and known_channel != channel_id:
+                    continue
+                return creator_id
+        return None
+
+    def channel_ids(self) -> Set[str]:
+        """Snapshot of every indexed YouTube channel ID."""
+        with self._lock:
+            return set(self._by_channel)
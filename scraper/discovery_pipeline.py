@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+backrAI Discovery Pipeline
+Streaming producer/consumer run for creator discovery.
+
+  sources → dedupe/batch → fetch → extract → match → batched sink
+
+Every stage runs on its own thread(s) and talks to the next one through a
+bounded queue, so:
+  - strategies run side by side (channel listing doesn't wait for search)
+  - a slow stage back-pressures the ones before it instead of buffering
+  - discoveries reach the database every SINK_BATCH_SIZE videos (or
+    SINK_FLUSH_SECONDS), so memory stays flat and a run killed by the
+    Actions timeout keeps everything saved up to that point
+  - a video found by several sources is fetched once: the engine's
+    VideoRegistry keeps the first find and tags the others' strategy names
+    onto the same discovery record, which is released once saved
+  - with a CheckpointStore on the engine, videos finished by an earlier
+    run are dropped before any fetch
+
+Stage logic lives on CreatorDiscovery (_fetch_video, _extract_from_video,
+_match_video_codes, save_discoveries); this module only wires it together.
+"""
+
+import threading
+import time
+from queue import Empty, Queue
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from metrics import StageMetrics
+from video_cache import MISS
+from video_registry import VideoRegistry
+
+# Items buffered between two stages
+DEFAULT_QUEUE_SIZE = 64
+
+# Videos per fetch batch (one yt-dlp call + one SponsorBlock batch each)
+FETCH_BATCH_SIZE = 10
+
+# Seconds the batcher waits for more videos before sending a partial batch
+BATCH_WAIT_SECONDS = 0.5
+
+# Discoveries per save_discoveries() call, and max seconds a partial batch waits
+SINK_BATCH_SIZE = 50
+SINK_FLUSH_SECONDS = 60.0
+
+# End-of-stream marker passed down the queues
+_DONE = object()
+
+VideoItem = Tuple[str, Optional[Dict]]  # (video_id, search_metadata)
+
+
+class DiscoveryPipeline:
+    """
+    Runs video sources through CreatorDiscovery's processing steps as a
+    staged pipeline. Add sources with add_source(), then call run().
+    """
+
+    def __init__(
+        self,
+        engine,
+        check_sponsorblock: bool = False,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        fetch_batch_size: int = FETCH_BATCH_SIZE,
+        sink_batch_size: int = SINK_BATCH_SIZE,
+        flush_seconds: float = SINK_FLUSH_SECONDS,
+    ):
+        self.engine = engine
+        # Stage timings go to the engine's StageMetrics when it has one
+        self.metrics = getattr(engine, "metrics", None) or StageMetrics(enabled=False)
+        self.check_sponsorblock = check_sponsorblock
+        self.queue_size = max(1, queue_size)
+        self.fetch_batch_size = max(1, fetch_batch_size)
+        self.sink_batch_size = max(1, sink_batch_size)
+        self.flush_seconds = flush_seconds
+        self._sources: List[Tuple[str, Iterable[VideoItem]]] = []
+        # Run-wide dedupe shared with the engine's other strategies
+        self.registry = getattr(engine, "registry", None)
+        if self.registry is None:
+            self.registry = VideoRegistry()
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "videos_queued": 0,
+            "duplicates_skipped": 0,
+            "already_processed": 0,
+            "discoveries": 0,
+            "batches_saved": 0,
+        }
+
+    def add_source(self, name: str, videos: Iterable[VideoItem]):
+        """
+        Register an iterable of (video_id, search_metadata) pairs.
+        name is the strategy tag recorded for the videos it finds.
+        """
+        self._sources.append((name, videos))
+
+    def run(self) -> Dict[str, int]:
+        """Run every source to exhaustion. Returns pipeline stats."""
+        videos: Queue = Queue(self.queue_size)
+        batches: Queue = Queue(max(1, self.engine.max_workers))
+        fetched: Queue = Queue(self.queue_size)
+        extracted: Queue = Queue(self.queue_size)
+        discoveries: Queue = Queue(self.queue_size)
+
+        threads = []
+        threads += self._start_workers(
+            "source",
+            [lambda src=src: self._run_source(src, videos) for src in self._sources],
+            videos,
+        )
+        threads += self._start_workers(
+            "batch", [lambda: self._dedupe_and_batch(videos, batches)], batches,
+        )
+        threads += self._start_stage(
+            "fetch", self._fetch, batches, fetched, self.engine.max_workers,
+        )
+        threads += self._start_stage(
+            "extract", self._extract, fetched, extracted, 1,
+        )
+        threads += self._start_stage(
+            "match", self._match, extracted, discoveries, 1,
+        )
+        threads += self._start_workers(
+            "sink", [lambda: self._sink(discoveries)], None,
+        )
+
+        for thread in threads:
+            thread.join()
+
+        print(
+            f"\n  Pipeline: {self.stats['videos_queued']} videos queued, "
+            f"{self.stats['duplicates_skipped']} duplicates skipped, "
+            f"{self.stats['already_processed']} already processed, "
+            f"{self.stats['discoveries']} discoveries saved in "
+            f"{self.stats['batches_saved']} batches"
+        )
+        return self.stats
+
+    # ------------------------------------------------------------------
+    # Threading helpers
+    # ------------------------------------------------------------------
+    def _start_workers(
+        self,
+        name: str,
+        targets: List[Callable[[], None]],
+        outbox: Optional[Queue],
+    ) -> List[threading.Thread]:
+        """
+        Start one thread per target. When the last one returns, _DONE is
+        sent to outbox so the next stage knows its input is complete.
+        """
+        remaining = [len(targets)]
+        lock = threading.Lock()
+
+        def wrap(target):
+            def runner():
+                try:
+                    target()
+                finally:
+                    with lock:
+                        remaining[0] -= 1
+                        last = remaining[0] == 0
+                    if last and outbox is not None:
+                        outbox.put(_DONE)
+            return runner
+
+        threads = [
+            threading.Thread(target=wrap(t), name=f"pipeline-{name}-{i}", daemon=True)
+            for i, t in enumerate(targets)
+        ]
+        if not threads and outbox is not None:
+            outbox.put(_DONE)
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def _start_stage(
+        self,
+        name: str,
+        handler: Callable,
+        inbox: Queue,
+        outbox: Queue,
+        workers: int,
+    ) -> List[threading.Thread]:
+        """Run handler(item) -> iterable of outputs on `workers` threads."""
+        def loop():
+            while True:
+                item = inbox.get()
+                if item is _DONE:
+                    inbox.put(_DONE)  # let sibling workers see it too
+                    return
+                try:
+                    for out in handler(item):
+                        outbox.put(out)
+                except Exception as e:
+                    print(f"    Error in {name} stage: {e}")
+                    self.engine._bump("errors")
+                    self.metrics.count_error(name)
+
+        return self._start_workers(name, [loop] * max(1, workers), outbox)
+
+    def _count(self, key: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+    def _run_source(self, source: Tuple[str, Iterable[VideoItem]], outbox: Queue):
+        name, videos = source
+        try:
+            for item in videos:
+                outbox.put((name, item))
+        except Exception as e:
+            print(f"    Error in source '{name}': {e}")
+            self.engine._bump("errors")
+
+    def _dedupe_and_batch(self, inbox: Queue, outbox: Queue):
+        """
+        Drop video IDs already claimed this run (by any source or strategy)
+        and group the rest into fetch batches. A partial batch is sent once the sources go quiet for
+        BATCH_WAIT_SECONDS, so slow sources don't hold videos back.
+        """
+        batch: List[VideoItem] = []
+        while True:
+            try:
+                item = inbox.get(timeout=BATCH_WAIT_SECONDS if batch else None)
+            except Empty:
+                outbox.put(batch)
+                batch = []
+                continue
+            if item is _DONE:
+                break
+            source, item = item
+            video_id = item[0]
+            if not self.registry.claim(video_id, source):
+                self._count("duplicates_skipped")
+                continue
+            checkpoints = getattr(self.engine, "checkpoints", None)
+            if checkpoints is not None and not checkpoints.skip_processed([video_id]):
+                self._count("already_processed")
+                continue
+            self._count("videos_queued")
+            batch.append(item)
+            if len(batch) >= self.fetch_batch_size:
+                outbox.put(batch)
+                batch = []
+        if batch:
+            outbox.put(batch)
+
+    def _fetch(self, batch: List[VideoItem]):
+        """Metadata (one yt-dlp call), SponsorBlock segments, then transcripts."""
+        video_ids = [video_id for video_id, _ in batch]
+        metadata = self.engine._fetch_metadata_chunk(video_ids)
+
+        # Segments tag sponsored videos and target extraction on long ones
+        lookup = [
+            video_id for video_id, search_metadata in batch
+            if self.check_sponsorblock or self.engine._wants_sponsor_windows(
+                metadata.get(video_id) or search_metadata
+            )
+        ]
+        segments: Dict[str, List[Dict]] = {}
+        if lookup:
+            with self.metrics.timer("sponsorblock"):
+                segments = self.engine.sponsorblock_svc.batch_get_segments(lookup)
+
+        for video_id, search_metadata in batch:
+            try:
+                item = self.engine._fetch_video(
+                    video_id, search_metadata, metadata.get(video_id, MISS),
+                    segments.get(video_id),
+                )
+            except Exception as e:
+                print(f"    Error fetching video {video_id}: {e}")
+                self.engine._bump("errors")
+                self.metrics.count_error("fetch")
+                continue
+            if item:
+                item["had_sponsor_segments"] = bool(item.get("sponsor_segments"))
+                yield item
+
+    def _extract(self, item: Dict):
+        extracted = self.engine._extract_from_video(item)
+        if extracted:
+            yield extracted
+
+    def _match(self, item: Dict):
+        yield self.engine._match_video_codes(item)
+
+    def _sink(self, inbox: Queue):
+        """Save discoveries in batches: by size, or after flush_seconds."""
+        batch: List[Dict] = []
+        started = 0.0
+        while True:
+            timeout = None
+            if batch:
+                timeout = max(0.0, self.flush_seconds - (time.monotonic() - started))
+            try:
+                item = inbox.get(timeout=timeout)
+            except Empty:
+                item = None
+            if item is _DONE:
+                break
+            if item is not None:
+                if not batch:
+                    started = time.monotonic()
+                batch.append(item)
+                self._count("discoveries")
+                codes_str = ", ".join(c["code"] for c in item["codes"][:5])
+                print(f"    ✅ {item['creator_name'] or item['video_id']}: "
+                      f"{len(item['codes'])} codes: {codes_str}")
+            if batch and (
+                len(batch) >= self.sink_batch_size
+                or time.monotonic() - started >= self.flush_seconds
+            ):
+                self._flush(batch)
+                batch = []
+        if batch:
+            self._flush(batch)
+
+    def _flush(self, batch: List[Dict]):
+        try:
+            with self.metrics.timer("save"):
+                self.engine.save_discoveries(batch)
+            self._count("batches_saved")
+            # Saved: the registry keeps only the tags and flags
+            for discovery in batch:
+                self.registry.release(discovery["video_id"])
+        except Exception as e:
+            print(f"    Error saving {len(batch)} discoveries: {e}")
+            self.engine._bump("errors")
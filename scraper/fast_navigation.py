@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+backrAI Fast Navigation
+Shared page-loading helper for the Playwright scrapers.
+
+The scrapers only read text and links, so in fast mode:
+  - images, media and fonts are aborted via request routing
+  - requests to known ad/analytics/tracker hosts are aborted
+  - navigation waits for DOMContentLoaded plus the selector the caller
+    actually needs, instead of networkidle and a fixed sleep
+
+Every navigation reports bytes downloaded (response body sizes, as
+received), request counts, blocked requests and wall time, aggregated per scraper by
+NavigationMetrics. Set SCRAPER_FAST_NAV=0 to fall back to the old
+networkidle behaviour with the same metrics, to compare the two.
+"""
+
+import asyncio
+import os
+import time
+import weakref
+from typing import Dict, List, Optional, Union
+
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+
+FAST_NAVIGATION = os.getenv("SCRAPER_FAST_NAV", "1") != "0"
+
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+# Hosts (and their subdomains) serving ads, analytics and trackers
+BLOCKED_HOSTS = (
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googletagservices.com",
+    "adservice.google.com",
+    "facebook.net",
+    "connect.facebook.com",
+    "amazon-adsystem.com",
+    "adnxs.com",
+    "criteo.com",
+    "criteo.net",
+    "taboola.com",
+    "outbrain.com",
+    "scorecardresearch.com",
+    "quantserve.com",
+    "hotjar.com",
+    "segment.io",
+    "segment.com",
+    "mixpanel.com",
+    "optimizely.com",
+    "newrelic.com",
+    "nr-data.net",
+    "bat.bing.com",
+    "tiktok.com",
+    "pinterest.com",
+    "snapchat.com",
+)
+
+# Timeout for goto + selector wait (ms)
+DEFAULT_NAV_TIMEOUT = 15000
+
+# Per-page request counters, set up once per page
+_page_counters: "weakref.WeakKeyDictionary[Page, Dict[str, int]]" = weakref.WeakKeyDictionary()
+
+# Per-page body-size lookups still running (awaited before a navigation reports)
+_pending_sizes: "weakref.WeakKeyDictionary[Page, set]" = weakref.WeakKeyDictionary()
+
+
+def _is_blocked_host(url: str) -> bool:
+    host = url.split("://", 1)[-1].split("/", 1)[0].split(":", 1)[0].lower()
+    return any(host == h or host.endswith("." + h) for h in BLOCKED_HOSTS)
+
+
+class NavigationMetrics:
+    """Aggregated navigation stats for one scraper run."""
+
+    def __init__(self):
+        self.pages = 0
+        self.failures = 0
+        self.selector_misses = 0
+        self.bytes = 0
+        self.requests = 0
+        self.blocked = 0
+        self.seconds = 0.0
+
+    def record(self, nav: Dict):
+        self.pages += 1
+        self.failures += 0 if nav["ok"] else 1
+        self.selector_misses += 0 if nav["selector_found"] else 1
+        self.bytes += nav["bytes"]
+        self.requests += nav["requests"]
+        self.blocked += nav["blocked"]
+        self.seconds += nav["seconds"]
+
+    def summary(self) -> str:
+        """One-line summary for run logs."""
+        if not self.pages:
+            return "no pages loaded"
+        mode = "fast" if FAST_NAVIGATION else "networkidle"
+        return (
+            f"{self.pages} pages ({mode} mode), "
+            f"avg {self.seconds / self.pages * 1000:.0f} ms/page, "
+            f"{self.bytes / 1024 / self.pages:.0f} KB/page, "
+            f"{self.requests} requests, {self.blocked} blocked, "
+            f"{self.failures} failed, {self.selector_misses} selector misses"
+        )
+
+
+async def prepare_page(page: Page) -> Dict[str, int]:
+    """Install request blocking (fast mode) and counters on a page, once."""
+    counters = _page_counters.get(page)
+    if counters is not None:
+        return counters
+    counters = {"bytes": 0, "requests": 0, "blocked": 0}
+    _page_counters[page] = counters
+
+    if FAST_NAVIGATION:
+        async def handle_route(route):
+            request = route.request
+            if (
+                request.resource_type in BLOCKED_RESOURCE_TYPES
+                or _is_blocked_host(request.url)
+            ):
+                counters["blocked"] += 1
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await page.route("**/*", handle_route)
+
+    def on_response(response):
+        counters["requests"] += 1
+
+    # Content-Length is missing on chunked responses, so count the body
+    # size Playwright measured once the request has finished
+    pending = _pending_sizes.setdefault(page, set())
+
+    async def add_body_size(request):
+        try:
+            sizes = await request.sizes()
+            counters["bytes"] += sizes["responseBodySize"]
+        except Exception:
+            pass
+
+    def on_request_finished(request):
+        task = asyncio.ensure_future(add_body_size(request))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    page.on("response", on_response)
+    page.on("requestfinished", on_request_finished)
+    return counters
+
+
+async def fast_goto(
+    page: Page,
+    url: str,
+    wait_for: Optional[Union[str, List[str]]] = None,
+    timeout: int = DEFAULT_NAV_TIMEOUT,
+    settle_ms: int = 2000,
+    metrics: Optional[NavigationMetrics] = None,
+) -> Dict:
+    """
+    Load url and wait until any of the wait_for selectors is attached,
+    all within timeout ms. A missing selector is not an error (the page
+    may simply have no codes); navigation errors are raised as before.
+
+    settle_ms is only used with SCRAPER_FAST_NAV=0 (legacy fixed sleep).
+    Returns this navigation's metrics dict.
+    """
+    counters = await prepare_page(page)
+    before = dict(counters)
+    start = time.perf_counter()
+    nav = {"url": url, "ok": False, "selector_found": True}
+
+    try:
+        if FAST_NAVIGATION:
+            await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+            if wait_for:
+                selector = wait_for if isinstance(wait_for, str) else ", ".join(wait_for)
+                # What goto left of the timeout (at least 1 ms: 0 means no limit)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                remaining = max(1, int(timeout - elapsed_ms))
+                try:
+                    await page.wait_for_selector(selector, state="attached", timeout=remaining)
+                except PlaywrightTimeoutError:
+                    nav["selector_found"] = False
+        else:
+            await page.goto(url, wait_until="networkidle", timeout=timeout)
+            await page.wait_for_timeout(settle_ms)
+        nav["ok"] = True
+        return nav
+    finally:
+        nav["seconds"] = time.perf_counter() - start
+        pending = _pending_sizes.get(page)
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        for key in ("bytes", "requests", "blocked"):
+            nav[key] = counters[key] - before[key]
+        if metrics is not None:
+            metrics.record(nav)
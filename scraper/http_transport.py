@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+backrAI HTTP Transport
+Shared requests layer for the scraper's outbound HTTP.
+
+One HttpTransport (see shared_transport()) gives every service:
+  - a pooled keep-alive requests.Session (connections reused per host)
+  - retries on 429/5xx and requests errors (timeouts, dropped
+    connections, truncated bodies) with jittered exponential backoff,
+    honoring Retry-After
+  - a cap on concurrent requests per host
+  - a per-host circuit breaker: after CIRCUIT_FAILURE_THRESHOLD failed
+    attempts in a row the host is skipped (fast TransportError) for
+    CIRCUIT_COOLDOWN_SECONDS, then a single trial request decides whether
+    it is back
+
+Responses that are final (2xx, 404 and other non-retryable statuses) are
+returned as-is; anything that is still failing after the retries raises
+TransportError, so callers can tell "nothing there" from "couldn't ask".
+Browser traffic (Playwright) and yt-dlp / youtube-transcript-api manage
+their own connections and don't go through here.
+"""
+
+import email.utils
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from rate_limiter import HostRateLimiter
+
+USER_AGENT = "backrAI/1.0 (creator leverage engine)"
+
+# Retries after the first attempt, and the backoff curve (seconds)
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+
+# Longest Retry-After we are willing to wait; longer means give up now
+RETRY_AFTER_MAX = 120.0
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Concurrent requests (and pooled connections) per host
+MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "8"))
+
+# Consecutive failed attempts that open a host's circuit, and for how long
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_COOLDOWN_SECONDS = 30.0
+
+
+class TransportError(Exception):
+    """A request that failed after retries, or was refused by an open circuit."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Retry-After header as seconds (delta-seconds or HTTP-date form)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class CircuitBreaker:
+    """
+    Closed → open after `threshold` consecutive failures; open → half-open
+    after `cooldown` seconds, letting one trial request through; the
+    trial's outcome closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        cooldown: float = CIRCUIT_COOLDOWN_SECONDS,
+    ):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_thread: Optional[int] = None  # ident of the half-open trial's caller
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        """May a request go out now?"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_thread is not None or time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            self._trial_thread = threading.get_ident()  # half-open: this caller is the trial
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_thread = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_thread is not None or self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+            self._trial_thread = None
+
+    def release_trial(self):
+        """
+        End the calling thread's half-open trial without an outcome (it
+        raised something other than a network error); the next caller
+        becomes the trial.
+        """
+        with self._lock:
+            if self._trial_thread == threading.get_ident():
+                self._trial_thread = None
+
+
+class HttpTransport:
+    """Pooled session with retry/backoff, per-host concurrency caps and circuit breakers."""
+
+    def __init__(
+        self,
+        max_retries: int = MAX_RETRIES,
+        backoff_base: float = BACKOFF_BASE,
+        backoff_max: float = BACKOFF_MAX,
+        max_per_host: int = MAX_CONNECTIONS_PER_HOST,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        cooldown: float = CIRCUIT_COOLDOWN_SECONDS,
+    ):
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_per_host = max(1, max_per_host)
+        self._failure_threshold = failure_threshold
+        self._cooldown = cooldown
+
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT})
+        # Retries are ours; the adapter only pools connections
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=self.max_per_host, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "circuit_rejections": 0}
+
+    def _host_state(self, host: str):
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.max_per_host)
+                self._breakers[host] = CircuitBreaker(self._failure_threshold, self._cooldown)
+            return self._slots[host], self._breakers[host]
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        return self._host_state(host)[1]
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for retry number `attempt` (0-based)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        timeout: float = 10,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Send a request with retries. Each attempt is paced by rate_limiter
+        (if given) and holds one of the host's concurrency slots.
+        Returns the final response; raises TransportError when the host's
+        circuit is open or every attempt failed.
+        """
+        host = urlsplit(url).netloc
+        slots, breaker = self._host_state(host)
+        last_error = "recent requests failed"
+        status = None
+
+        for attempt in range(self.max_retries + 1):
+            if not breaker.allow():
+                self._count("circuit_rejections")
+                raise TransportError(f"{host}: circuit open, not sending {method} {url} ({last_error})", status)
+
+            if rate_limiter is not None:
+                rate_limiter.acquire(host)
+            wait = None
+            with slots:
+                self._count("requests")
+                try:
+                    response = self.session.request(method, url, timeout=timeout, **kwargs)
+                except requests.exceptions.RequestException as e:
+                    breaker.record_failure()
+                    last_error, status = f"{type(e).__name__}: {e}", None
+                else:
+                    status = response.status_code
+                    if status not in RETRY_STATUSES:
+                        breaker.record_success()
+                        return response
+                    last_error = f"HTTP {status}"
+                    if status == 429:
+                        # Throttled, not down: don't trip the breaker
+                        breaker.record_success()
+                    else:
+                        breaker.record_failure()
+                    wait = _retry_after_seconds(response.headers.get("Retry-After"))
+                    response.close()
+                finally:
+                    # Anything else must not leave the host stuck half-open
+                    breaker.release_trial()
+
+            if attempt == self.max_retries:
+                break
+            if wait is not None and wait > RETRY_AFTER_MAX:
+                last_error += f" (Retry-After {wait:.0f}s)"
+                break
+            self._count("retries")
+            time.sleep(wait if wait is not None else self.backoff(attempt))
+
+        self._count("failures")
+        raise TransportError(f"{method} {url} failed: {last_error}", status)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def summary(self) -> str:
+        """One-line summary for run logs."""
+        with self._lock:
+            stats = dict(self.stats)
+            open_hosts = [h for h, b in self._breakers.items() if b.is_open]
+        text = (
+            f"{stats['requests']} requests, {stats['retries']} retries, "
+            f"{stats['failures']} failed, {stats['circuit_rejections']} rejected by open circuits"
+        )
+        if open_hosts:
+            text += f" (open: {', '.join(sorted(open_hosts))})"
+        return text
+
+
+_shared: Optional[HttpTransport] = None
+_shared_lock = threading.Lock()
+
+
+def shared_transport() -> HttpTransport:
+    """The process-wide transport (created on first use)."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = HttpTransport()
+        return _shared
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+backrAI Stage Metrics
+Lightweight per-stage timing for discovery runs.
+
+    metrics = StageMetrics()
+    with metrics.timer("transcript"):
+        fetch()
+
+    @metrics.timed("extraction")
+    def extract(...): ...
+
+Each stage keeps its durations (for p50/p95/max) and an error count
+(exceptions raised inside the timer, plus count_error() calls for errors
+the caller swallows). Results go to the run log via summary_lines(), and
+to files via write_json() / write_prometheus() (node_exporter textfile
+format). A disabled StageMetrics hands out one shared no-op timer, so
+instrumented code costs a method call and nothing else.
+"""
+
+import functools
+import json
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+METRICS_ENABLED = os.getenv("DISCOVERY_METRICS", "1") != "0"
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(q * len(sorted_values)) - 1
+    return sorted_values[max(0, min(len(sorted_values) - 1, rank))]
+
+
+class _Timer:
+    __slots__ = ("_metrics", "_stage", "_start")
+
+    def __init__(self, metrics: "StageMetrics", stage: str):
+        self._metrics = metrics
+        self._stage = stage
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._metrics.record(
+            self._stage, time.perf_counter() - self._start, error=exc_type is not None
+        )
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class StageMetrics:
+    """
+    Durations and error counts per named stage.
+    Thread-safe: pipeline workers record concurrently.
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._samples: Dict[str, List[float]] = {}
+        self._errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    def timer(self, stage: str):
+        """Context manager timing the block as one sample of stage."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, stage)
+
+    def timed(self, stage: str) -> Callable:
+        """Decorator form of timer()."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.timer(stage):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, stage: str, seconds: float, error: bool = False):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._samples.setdefault(stage, []).append(seconds)
+            if error:
+                self._errors[stage] = self._errors.get(stage, 0) + 1
+
+    def count_error(self, stage: str, amount: int = 1):
+        """Count an error the caller handled without raising."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._errors[stage] = self._errors.get(stage, 0) + amount
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """{stage: {count, errors, total, p50, p95, max}} (seconds)."""
+        with self._lock:
+            samples = {stage: sorted(values) for stage, values in self._samples.items()}
+            errors = dict(self._errors)
+        stages = {}
+        for stage in sorted(set(samples) | set(errors)):
+            values = samples.get(stage, [])
+            stages[stage] = {
+                "count": len(values),
+                "errors": errors.get(stage, 0),
+                "total": sum(values),
+                "p50": _percentile(values, 0.50),
+                "p95": _percentile(values, 0.95),
+                "max": values[-1] if values else 0.0,
+            }
+        return stages
+
+    def summary_lines(self) -> List[str]:
+        """Table rows for print_stats(), slowest stage (by total) first."""
+        stages = self.snapshot()
+        if not stages:
+            return []
+        lines = [f"  {'stage':<24} {'count':>7} {'err':>5} {'total':>9} {'p50':>8} {'p95':>8} {'max':>8}"]
+        for stage, s in sorted(stages.items(), key=lambda item: -item[1]["total"]):
+            lines.append(
+                f"  {stage:<24} {s['count']:>7} {s['errors']:>5} {s['total']:>8.1f}s "
+                f"{s['p50'] * 1000:>6.0f}ms {s['p95'] * 1000:>6.0f}ms {s['max'] * 1000:>6.0f}ms"
+            )
+        return lines
+
+    def write_json(self, path: str, counters: Optional[Dict[str, int]] = None):
+        """Write stages (and optional run counters) as JSON."""
+        report = {
+            "generated_at": time.time(),
+            "stages": self.snapshot(),
+            "counters": counters or {},
+        }
+        _write_atomic(path, json.dumps(report, indent=2))
+
+    def write_prometheus(
+        self,
+        path: str,
+        counters: Optional[Dict[str, int]] = None,
+        prefix: str = "backrai_discovery",
+    ):
+        """
+        Write a node_exporter textfile: a summary per stage
+        (<prefix>_stage_seconds{stage,quantile}, _sum, _count), per-stage
+        error counts, and run counters as <prefix>_<name>.
+        """
+        stages = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_stage_seconds Time spent per discovery stage.",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for stage, s in stages.items():
+            label = f'stage="{stage}"'
+            lines += [
+                f'{prefix}_stage_seconds{{{label},quantile="0.5"}} {s["p50"]:.6f}',
+                f'{prefix}_stage_seconds{{{label},quantile="0.95"}} {s["p95"]:.6f}',
+                f'{prefix}_stage_seconds{{{label},quantile="1"}} {s["max"]:.6f}',
+                f"{prefix}_stage_seconds_sum{{{label}}} {s['total']:.6f}",
+                f"{prefix}_stage_seconds_count{{{label}}} {s['count']}",
+            ]
+        lines += [
+            f"# HELP {prefix}_stage_errors Errors per discovery stage.",
+            f"# TYPE {prefix}_stage_errors gauge",
+        ]
+        for stage, s in stages.items():
+            lines.append(f'{prefix}_stage_errors{{stage="{stage}"}} {s["errors"]}')
+        for name, value in (counters or {}).items():
+            lines += [f"# TYPE {prefix}_{name} gauge", f"{prefix}_{name} {value}"]
+        _write_atomic(path, "\n".join(lines) + "\n")
+
+
+def _write_atomic(path: str, text: str):
+    """Write via a temp file so scrapers never read a half-written file."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
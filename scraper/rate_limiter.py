@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+backrAI Rate Limiter
+Thread-safe token buckets used to pace outbound requests per host.
+
+Replaces the fixed time.sleep() calls between videos: workers block only
+as long as needed to stay under the configured request rate, so several
+videos can be in flight without increasing the load we put on YouTube.
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# Hosts we pace explicitly. yt-dlp and youtube-transcript-api both hit
+# youtube.com, so they share one bucket.
+YOUTUBE_HOST = "www.youtube.com"
+SPONSORBLOCK_HOST = "sponsor.ajay.app"
+
+# Default (requests/second, burst) per host
+DEFAULT_HOST_RATES: Dict[str, Tuple[float, float]] = {
+    YOUTUBE_HOST: (2.0, 4.0),
+    SPONSORBLOCK_HOST: (10.0, 10.0),
+}
+
+
+class TokenBucket:
+    """
+    Classic token bucket: refills at `rate` tokens per second up to
+    `capacity`. acquire() reserves tokens immediately and sleeps outside
+    the lock, so concurrent callers are served in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = max(float(capacity), 1.0)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take `tokens` from the bucket, blocking if needed. Returns seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._last) * self.rate
+            )
+            self._last = now
+            # Reserve now; a negative balance is the queue of pending callers
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """
+    One TokenBucket per host. Hosts without an explicit rate share the
+    default (rate, burst).
+    """
+
+    def __init__(
+        self,
+        rates: Optional[Dict[str, Tuple[float, float]]] = None,
+        default_rate: Tuple[float, float] = (2.0, 2.0),
+    ):
+        self._rates = dict(DEFAULT_HOST_RATES)
+        if rates:
+            self._rates.update(rates)
+        self._default_rate = default_rate
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self._rates.get(host, self._default_rate)
+                bucket = TokenBucket(rate, burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, host: str, tokens: float = 1.0) -> float:
+        """Block until a request to `host` is allowed. Returns seconds waited."""
+        return self._bucket(host).acquire(tokens)
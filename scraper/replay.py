@@ -0,0 +1,596 @@
+#!/usr/bin/env python3
+"""
+backrAI Record / Replay
+Offline fixtures for the creator discovery pipeline.
+
+Record a real run once:
+
+    python replay.py record fixtures/run.jsonl.gz --strategies search,channel
+
+then replay it as often as needed, without YouTube, SponsorBlock or
+Supabase:
+
+    python replay.py replay fixtures/run.jsonl.gz --workers 8
+    python replay.py replay fixtures/run.jsonl.gz --latency transcript=0.2,db=0.01
+
+Recording hooks the services at their network boundary, so caching,
+batching, dedupe and the pipeline all run for real during replay:
+  - yt-dlp: metadata batches (per video), search results, channel listings
+  - youtube-transcript-api: timed transcripts (and "no transcript" answers)
+  - SponsorBlock: /skipSegments prefix responses
+  - Supabase: the brands/creators/offers tables as they were when the
+    recording started; replay loads them into MemorySupabase, an in-memory
+    stand-in for the table API, so writes behave like a fresh run against
+    the same database
+
+Each fixture stores how long the real call took. Replay sleeps for that
+long (times --latency-scale) unless the kind has an explicit --latency, so
+concurrency and batching changes can be measured reproducibly. Fixtures
+missing from the archive behave like a transient failure and are counted.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from sponsorblock_service import SponsorBlockService
+from transcript_service import TranscriptService
+from transcript_segments import TranscriptSegments
+
+FORMAT_VERSION = 1
+
+# Fixture kinds (also the names accepted by --latency)
+KINDS = ("metadata", "transcript", "search", "listing", "sponsorblock", "db")
+
+# Tables snapshotted at record start and loaded into MemorySupabase on replay
+SNAPSHOT_TABLES = ("brands", "creators", "offers")
+
+# Unique keys MemorySupabase enforces on insert (mirrors database/schema.sql;
+# like Postgres, a NULL in any column never conflicts)
+UNIQUE_KEYS = {
+    "brands": [("domain_pattern",)],
+    "creators": [("email",), ("affiliate_ref_code",)],
+    "offers": [("creator_id", "brand_id", "code")],
+}
+
+# Rows per page when snapshotting tables (PostgREST caps response size)
+SNAPSHOT_PAGE_SIZE = 1000
+
+
+# ---------------------------------------------------------------------------
+# Fixture archive
+# ---------------------------------------------------------------------------
+class FixtureArchive:
+    """
+    Recorded responses keyed by (kind, key), stored as gzipped JSON lines:
+    {"kind", "key", "value", "seconds"} per fixture, plus table snapshots.
+    Thread-safe: pipeline workers record concurrently.
+    """
+
+    def __init__(self):
+        self.fixtures: Dict[Tuple[str, str], Dict] = {}
+        self.tables: Dict[str, List[Dict]] = {}
+        self.misses: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.fixtures)
+
+    def put(self, kind: str, key: str, value, seconds: float = 0.0):
+        with self._lock:
+            self.fixtures[(kind, key)] = {"value": value, "seconds": seconds}
+
+    def get(self, kind: str, key: str) -> Optional[Dict]:
+        """The fixture dict ({value, seconds}), or None (counted as a miss)."""
+        fixture = self.fixtures.get((kind, key))
+        if fixture is None:
+            with self._lock:
+                self.misses[kind] = self.misses.get(kind, 0) + 1
+        return fixture
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._lock:
+            fixtures = sorted(self.fixtures.items())
+            tables = dict(self.tables)
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({"format": "backrai-fixtures", "version": FORMAT_VERSION}) + "\n")
+            for name, rows in tables.items():
+                f.write(json.dumps({"table": name, "rows": rows}) + "\n")
+            for (kind, key), fixture in fixtures:
+                f.write(json.dumps({"kind": kind, "key": key, **fixture}) + "\n")
+
+    @classmethod
+    def load(cls, path: str) -> "FixtureArchive":
+        archive = cls()
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("format") != "backrai-fixtures":
+                raise ValueError(f"{path} is not a fixture archive")
+            if header.get("version") != FORMAT_VERSION:
+                raise ValueError(f"{path}: unsupported fixture version {header.get('version')}")
+            for line in f:
+                entry = json.loads(line)
+                if "table" in entry:
+                    archive.tables[entry["table"]] = entry["rows"]
+                else:
+                    archive.fixtures[(entry["kind"], entry["key"])] = {
+                        "value": entry["value"],
+                        "seconds": entry.get("seconds", 0.0),
+                    }
+        return archive
+
+    def summary(self) -> str:
+        counts: Dict[str, int] = {}
+        for kind, _ in self.fixtures:
+            counts[kind] = counts.get(kind, 0) + 1
+        parts = [f"{counts[kind]} {kind}" for kind in KINDS if kind in counts]
+        parts += [f"{len(rows)} {name} rows" for name, rows in self.tables.items()]
+        text = ", ".join(parts) or "empty"
+        if self.misses:
+            text += " | misses: " + ", ".join(f"{n} {k}" for k, n in sorted(self.misses.items()))
+        return text
+
+
+# ---------------------------------------------------------------------------
+# In-memory Supabase
+# ---------------------------------------------------------------------------
+class _Result:
+    def __init__(self, data: List[Dict]):
+        self.data = data
+
+
+class _MemoryQuery:
+    """The subset of the postgrest query builder the scrapers use."""
+
+    def __init__(self, db: "MemorySupabase", table: str):
+        self._db = db
+        self._table = table
+        self._op = "select"
+        self._payload = None
+        self._columns: Optional[List[str]] = None
+        self._filters: List[Callable[[Dict], bool]] = []
+        self._order: List[Tuple[str, bool]] = []
+        self._range: Optional[Tuple[int, int]] = None
+        self._on_conflict: List[str] = []
+        self._ignore_duplicates = False
+
+    # Operations
+    def select(self, columns: str = "*", **kwargs):
+        self._op = "select"
+        if columns.strip() != "*":
+            self._columns = [c.strip() for c in columns.split(",")]
+        return self
+
+    def insert(self, json, **kwargs):
+        self._op, self._payload = "insert", json
+        return self
+
+    def upsert(self, json, on_conflict: str = "", ignore_duplicates: bool = False, **kwargs):
+        self._op, self._payload = "upsert", json
+        self._on_conflict = [c for c in on_conflict.split(",") if c] or ["id"]
+        self._ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, json, **kwargs):
+        self._op, self._payload = "update", json
+        return self
+
+    def delete(self, **kwargs):
+        self._op = "delete"
+        return self
+
+    # Filters and modifiers
+    def eq(self, column: str, value):
+        self._filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def neq(self, column: str, value):
+        self._filters.append(lambda row: row.get(column) != value)
+        return self
+
+    def in_(self, column: str, values):
+        values = set(values)
+        self._filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def ilike(self, column: str, pattern: str):
+        # Only the %substring% form is used in the scrapers
+        needle = pattern.strip("%").lower()
+        self._filters.append(lambda row: needle in str(row.get(column) or "").lower())
+        return self
+
+    def order(self, column: str, desc: bool = False, **kwargs):
+        self._order.append((column, desc))
+        return self
+
+    def range(self, start: int, end: int):
+        self._range = (start, end)
+        return self
+
+    def limit(self, size: int, **kwargs):
+        self._range = (0, size - 1)
+        return self
+
+    def execute(self) -> _Result:
+        self._db._sleep()
+        with self._db._lock:
+            self._db.stats[self._op] = self._db.stats.get(self._op, 0) + 1
+            rows = self._db.tables.setdefault(self._table, [])
+            data = getattr(self, f"_{self._op}")(rows)
+        return _Result([dict(row) for row in data])
+
+    # Implementations (called with the DB lock held)
+    def _matching(self, rows: List[Dict]) -> List[Dict]:
+        return [row for row in rows if all(f(row) for f in self._filters)]
+
+    def _select(self, rows: List[Dict]) -> List[Dict]:
+        out = self._matching(rows)
+        for column, desc in reversed(self._order):
+            out.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+        if self._range:
+            out = out[self._range[0]:self._range[1] + 1]
+        if self._columns:
+            out = [{c: row.get(c) for c in self._columns} for row in out]
+        return out
+
+    def _update(self, rows: List[Dict]) -> List[Dict]:
+        out = self._matching(rows)
+        for row in out:
+            row.update(self._payload)
+        return out
+
+    def _delete(self, rows: List[Dict]) -> List[Dict]:
+        out = self._matching(rows)
+        deleted = {id(row) for row in out}
+        rows[:] = [row for row in rows if id(row) not in deleted]
+        return out
+
+    def _insert(self, rows: List[Dict]) -> List[Dict]:
+        return self._write(rows, upsert=False)
+
+    def _upsert(self, rows: List[Dict]) -> List[Dict]:
+        return self._write(rows, upsert=True)
+
+    def _write(self, rows: List[Dict], upsert: bool) -> List[Dict]:
+        payload = self._payload if isinstance(self._payload, list) else [self._payload]
+        unique = UNIQUE_KEYS.get(self._table, [])
+        written, added = [], []
+        for item in payload:
+            if upsert:
+                existing = next((
+                    row for row in rows
+                    if all(row.get(c) == item.get(c) and item.get(c) is not None
+                           for c in self._on_conflict)
+                ), None)
+                if existing is not None:
+                    if not self._ignore_duplicates:
+                        existing.update(item)
+                        written.append(existing)
+                    continue
+            for key in unique:
+                values = [item.get(c) for c in key]
+                if None not in values and any(
+                    [row.get(c) for c in key] == values for row in rows
+                ):
+                    # Like Postgres: the whole statement fails
+                    new = {id(row) for row in added}
+                    rows[:] = [row for row in rows if id(row) not in new]
+                    raise Exception(
+                        f'duplicate key value violates unique constraint '
+                        f'"{self._table}_{"_".join(key)}_key"'
+                    )
+            row = {"id": str(uuid.uuid4()), **item}
+            rows.append(row)
+            added.append(row)
+            written.append(row)
+        return written
+
+
+class MemorySupabase:
+    """
+    In-memory stand-in for the Supabase client's table API
+    (client.table(name).select(...).eq(...).execute().data).
+    Optionally sleeps `latency` seconds per execute() to mimic round-trips.
+    """
+
+    def __init__(
+        self,
+        tables: Optional[Dict[str, List[Dict]]] = None,
+        latency: float = 0.0,
+    ):
+        self.tables: Dict[str, List[Dict]] = {
+            name: [dict(row) for row in rows] for name, rows in (tables or {}).items()
+        }
+        self.latency = latency
+        self.stats: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def table(self, name: str) -> _MemoryQuery:
+        return _MemoryQuery(self, name)
+
+    def _sleep(self):
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def summary(self) -> str:
+        rows = ", ".join(f"{len(r)} {name}" for name, r in sorted(self.tables.items()))
+        calls = ", ".join(f"{n} {op}" for op, n in sorted(self.stats.items()))
+        return f"{rows or 'no rows'} | {calls or 'no calls'}"
+
+
+def snapshot_tables(client, tables=SNAPSHOT_TABLES) -> Dict[str, List[Dict]]:
+    """Read whole tables (paged) from a Supabase client."""
+    snapshot = {}
+    for name in tables:
+        rows: List[Dict] = []
+        start = 0
+        while True:
+            page = (
+                client.table(name).select("*").order("id")
+                .range(start, start + SNAPSHOT_PAGE_SIZE - 1).execute()
+            ).data or []
+            rows.extend(page)
+            if len(page) < SNAPSHOT_PAGE_SIZE:
+                break
+            start += SNAPSHOT_PAGE_SIZE
+        snapshot[name] = rows
+    return snapshot
+
+
+# ---------------------------------------------------------------------------
+# Service hooks
+# ---------------------------------------------------------------------------
+class FixtureSession:
+    """
+    Swaps the network calls of TranscriptService and SponsorBlockService
+    for recording or replaying versions. Use as a context manager:
+
+        with FixtureSession(archive, mode="record"):
+            run_creator_discovery(...)
+
+    In replay mode each call sleeps for its recorded duration times
+    latency_scale, or latency[kind] seconds when given.
+    """
+
+    def __init__(
+        self,
+        archive: FixtureArchive,
+        mode: str = "replay",
+        latency: Optional[Dict[str, float]] = None,
+        latency_scale: float = 1.0,
+    ):
+        if mode not in ("record", "replay"):
+            raise ValueError("mode must be 'record' or 'replay'")
+        self.archive = archive
+        self.mode = mode
+        self.latency = latency or {}
+        self.latency_scale = latency_scale
+        self._originals: List[Tuple[type, str, object]] = []
+
+    def __enter__(self) -> "FixtureSession":
+        self.install()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.uninstall()
+        return False
+
+    def install(self):
+        hooks = self._recorders() if self.mode == "record" else self._replayers()
+        for owner, name, replacement in hooks:
+            self._originals.append((owner, name, owner.__dict__[name]))
+            setattr(owner, name, replacement)
+
+    def uninstall(self):
+        while self._originals:
+            owner, name, original = self._originals.pop()
+            setattr(owner, name, original)
+
+    def _delay(self, kind: str, recorded: float):
+        seconds = self.latency.get(kind, recorded * self.latency_scale)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    # ------------------------------------------------------------------
+    # Record
+    # ------------------------------------------------------------------
+    def _recorders(self):
+        archive = self.archive
+        run_batch = TranscriptService._run_metadata_batch.__func__
+        fetch_transcript = TranscriptService._fetch_transcript
+        search = TranscriptService.search_videos
+        list_channel = TranscriptService.iter_channel_video_ids
+        fetch_prefix = SponsorBlockService._fetch_prefix
+
+        def record_metadata_batch(cls, video_ids, item_timeout):
+            start = time.perf_counter()
+            fetched, unavailable, failed, stalled = run_batch(cls, video_ids, item_timeout)
+            per_video = (time.perf_counter() - start) / max(1, len(video_ids))
+            for video_id, metadata in fetched.items():
+                archive.put("metadata", video_id, metadata, per_video)
+            for video_id in unavailable:
+                archive.put("metadata", video_id, None, per_video)
+            return fetched, unavailable, failed, stalled
+
+        def record_transcript(video_id):
+            start = time.perf_counter()
+            segments, definitive = fetch_transcript(video_id)
+            if segments is not None or definitive:
+                archive.put(
+                    "transcript", video_id,
+                    segments.to_dict() if segments is not None else None,
+                    time.perf_counter() - start,
+                )
+            return segments, definitive
+
+        def record_search(query, max_results=20):
+            start = time.perf_counter()
+            videos = search(query, max_results=max_results)
+            archive.put("search", f"{max_results}:{query}", videos, time.perf_counter() - start)
+            return videos
+
+        def record_listing(channel_url, max_videos=50, timeout=60):
+            start = time.perf_counter()
+            video_ids = []
+            try:
+                for video_id in list_channel(channel_url, max_videos=max_videos, timeout=timeout):
+                    video_ids.append(video_id)
+                    yield video_id
+            finally:
+                # Callers stop at their checkpoint mark: keep what was listed
+                archive.put(
+                    "listing", f"{max_videos}:{channel_url}", video_ids,
+                    time.perf_counter() - start,
+                )
+
+        def record_prefix(service, prefix):
+            start = time.perf_counter()
+            videos = fetch_prefix(service, prefix)
+            if videos is not None:
+                archive.put("sponsorblock", prefix, videos, time.perf_counter() - start)
+            return videos
+
+        return [
+            (TranscriptService, "_run_metadata_batch", classmethod(record_metadata_batch)),
+            (TranscriptService, "_fetch_transcript", staticmethod(record_transcript)),
+            (TranscriptService, "search_videos", staticmethod(record_search)),
+            (TranscriptService, "iter_channel_video_ids", staticmethod(record_listing)),
+            (SponsorBlockService, "_fetch_prefix", record_prefix),
+        ]
+
+    # ------------------------------------------------------------------
+    # Replay
+    # ------------------------------------------------------------------
+    def _replayers(self):
+        archive = self.archive
+        delay = self._delay
+
+        def replay_metadata_batch(cls, video_ids, item_timeout):
+            fetched, unavailable, failed = {}, set(), set()
+            for video_id in video_ids:
+                fixture = archive.get("metadata", video_id)
+                if fixture is None:
+                    failed.add(video_id)
+                    continue
+                delay("metadata", fixture["seconds"])
+                if fixture["value"] is None:
+                    unavailable.add(video_id)
+                else:
+                    fetched[video_id] = fixture["value"]
+            return fetched, unavailable, failed, None
+
+        def replay_transcript(video_id):
+            fixture = archive.get("transcript", video_id)
+            if fixture is None:
+                return None, False
+            delay("transcript", fixture["seconds"])
+            if fixture["value"] is None:
+                return None, True
+            return TranscriptSegments.from_dict(fixture["value"]), True
+
+        def replay_search(query, max_results=20):
+            fixture = archive.get("search", f"{max_results}:{query}")
+            if fixture is None:
+                return []
+            delay("search", fixture["seconds"])
+            return [dict(video) for video in fixture["value"]]
+
+        def replay_listing(channel_url, max_videos=50, timeout=60) -> Iterator[str]:
+            fixture = archive.get("listing", f"{max_videos}:{channel_url}")
+            if fixture is None:
+                return
+            delay("listing", fixture["seconds"])
+            yield from fixture["value"]
+
+        def replay_prefix(service, prefix):
+            fixture = archive.get("sponsorblock", prefix)
+            if fixture is None:
+                return None
+            delay("sponsorblock", fixture["seconds"])
+            return fixture["value"]
+
+        return [
+            (TranscriptService, "_run_metadata_batch", classmethod(replay_metadata_batch)),
+            (TranscriptService, "_fetch_transcript", staticmethod(replay_transcript)),
+            (TranscriptService, "search_videos", staticmethod(replay_search)),
+            (TranscriptService, "iter_channel_video_ids", staticmethod(replay_listing)),
+            (SponsorBlockService, "_fetch_prefix", replay_prefix),
+        ]
+
+
+def _parse_latency(text: str) -> Dict[str, float]:
+    """"transcript=0.2,db=0.01" -> {"transcript": 0.2, "db": 0.01}"""
+    latency = {}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        kind, _, seconds = part.partition("=")
+        if kind not in KINDS:
+            raise argparse.ArgumentTypeError(f"unknown latency kind '{kind}' (one of {', '.join(KINDS)})")
+        latency[kind] = float(seconds)
+    return latency
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record or replay creator discovery fixtures")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("archive", help="Fixture archive (.jsonl.gz)")
+    parser.add_argument("--strategies", type=str, default="search,channel", help="Comma-separated strategies (default: search,channel)")
+    parser.add_argument("--max-results", type=int, default=10, help="Max results per search query (default: 10)")
+    parser.add_argument("--max-videos", type=int, default=10, help="Max videos per creator channel (default: 10)")
+    parser.add_argument("--workers", type=int, default=4, help="Videos processed concurrently (default: 4)")
+    parser.add_argument("--latency", type=_parse_latency, default={}, help=f"Fixed seconds per call, e.g. transcript=0.2,db=0.01 ({', '.join(KINDS)})")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiplier on recorded latencies (default: 1.0, 0 for none)")
+    parser.add_argument("--no-rate-limit", action="store_true", help="Replay without per-host pacing")
+    parser.add_argument("--metrics-json", type=str, default=None, help="Write per-stage timings to this JSON file")
+    args = parser.parse_args()
+
+    from creator_discovery import _get_supabase, run_creator_discovery
+    from rate_limiter import DEFAULT_HOST_RATES, HostRateLimiter
+
+    strategies = [s.strip() for s in args.strategies.split(",")]
+    run_args = dict(
+        strategies=strategies,
+        max_results=args.max_results,
+        max_videos_per_creator=args.max_videos,
+        max_workers=args.workers,
+        # Every video must reach the network hooks: no cache, no checkpoints
+        use_cache=False,
+        use_checkpoints=False,
+        metrics_json=args.metrics_json,
+    )
+
+    if args.mode == "record":
+        archive = FixtureArchive()
+        client = _get_supabase()
+        print("📼 Snapshotting tables...")
+        archive.tables = snapshot_tables(client)
+        with FixtureSession(archive, mode="record"):
+            run_creator_discovery(supabase_client=client, **run_args)
+        archive.save(args.archive)
+        print(f"📼 Recorded {args.archive}: {archive.summary()}")
+    else:
+        archive = FixtureArchive.load(args.archive)
+        print(f"▶️  Replaying {args.archive}: {archive.summary()}")
+        db_latency = args.latency.get("db", 0.0)
+        client = MemorySupabase(archive.tables, latency=db_latency)
+        rate_limiter = None
+        if args.no_rate_limit:
+            unlimited = (1e9, 1e9)
+            rate_limiter = HostRateLimiter(
+                rates={host: unlimited for host in DEFAULT_HOST_RATES},
+                default_rate=unlimited,
+            )
+        start = time.perf_counter()
+        with FixtureSession(archive, latency=args.latency, latency_scale=args.latency_scale):
+            run_creator_discovery(supabase_client=client, rate_limiter=rate_limiter, **run_args)
+        print(f"▶️  Replay took {time.perf_counter() - start:.1f}s")
+        print(f"   Fixtures: {archive.summary()}")
+        print(f"   Database: {client.summary()}")
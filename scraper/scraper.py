@@ -10,11 +10,13 @@ import re
 from datetime import datetime
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
-from playwright.async_api import async_playwright, Browser, Page
+from playwright.async_api import Page
 from supabase import create_client, Client
-import requests
 from bs4 import BeautifulSoup
 
+from browser_pool import PagePool, DEFAULT_POOL_SIZE
+from fast_navigation import fast_goto, NavigationMetrics
+
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
@@ -25,24 +27,42 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
+# Code validation: pages working one brand's codes at once, and time caps
+VALIDATE_BRAND_CONCURRENCY = int(os.getenv("VALIDATE_BRAND_CONCURRENCY", "2"))
+VALIDATE_CODE_TIMEOUT = float(os.getenv("VALIDATE_CODE_TIMEOUT", "45"))
+VALIDATE_BRAND_TIMEOUT = float(os.getenv("VALIDATE_BRAND_TIMEOUT", "600"))
+
+COUPON_INPUT_SELECTORS = [
+    'input[name*="coupon" i]',
+    'input[name*="code" i]',
+    'input[name*="promo" i]',
+    'input[id*="coupon" i]',
+    'input[id*="code" i]',
+]
+ERROR_INDICATORS = ["invalid", "expired", "not found", "does not exist"]
+SUCCESS_INDICATORS = ["applied", "valid", "discount", "saved"]
+
 
 class CouponScraper:
-    """Scrapes and validates coupon codes from various sources"""
+    """
+    Scrapes and validates coupon codes from various sources.
+    Pages come from a PagePool, so sites and brands are scraped
+    concurrently (pool_size pages at a time), each on an isolated page.
+    """
 
-    def __init__(self):
-        self.browser: Optional[Browser] = None
-        self.page: Optional[Page] = None
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        self.pool = PagePool(size=pool_size)
+        self.nav_metrics = NavigationMetrics()
 
     async def initialize(self):
-        """Initialize browser and page"""
-        playwright = await async_playwright().start()
-        self.browser = await playwright.chromium.launch(headless=True)
-        self.page = await self.browser.new_page()
+        """Initialize browser and page pool"""
+        await self.pool.start()
 
     async def close(self):
         """Close browser"""
-        if self.browser:
-            await self.browser.close()
+        print(f"Page pool: {self.pool.summary()}")
+        print(f"Navigation: {self.nav_metrics.summary()}")
+        await self.pool.close()
 
     async def scrape_coupon_sites(self, brand_domain: str) -> List[Dict[str, str]]:
         """
@@ -58,24 +78,24 @@ class CouponScraper:
             f"https://www.honey.com/coupons/{brand_domain}",
         ]
 
-        for site_url in coupon_sites:
-            try:
-                site_codes = await self._scrape_site(site_url, brand_domain)
-                codes.extend(site_codes)
-            except Exception as e:
-                print(f"Error scraping {site_url}: {e}")
+        # Sites are scraped concurrently, each on its own pooled page
+        results = await self.pool.map(
+            lambda page, site_url: self._scrape_site(page, site_url, brand_domain),
+            coupon_sites,
+        )
+        for site_url, site_codes in zip(coupon_sites, results):
+            if isinstance(site_codes, BaseException):
+                print(f"Error scraping {site_url}: {site_codes!r}")
                 continue
+            codes.extend(site_codes)
 
         return codes
 
-    async def _scrape_site(self, url: str, brand: str) -> List[Dict[str, str]]:
+    async def _scrape_site(self, page: Page, url: str, brand: str) -> List[Dict[str, str]]:
         """Scrape a specific coupon site"""
         codes = []
 
         try:
-            await self.page.goto(url, wait_until="networkidle", timeout=10000)
-            await self.page.wait_for_timeout(2000)  # Wait for JS to load
-
             # Look for coupon code elements
             # Common selectors for coupon codes
             selectors = [
@@ -86,8 +106,13 @@ class CouponScraper:
                 '.promo-code',
             ]
 
+            # Ready once any code element is rendered (not on networkidle)
+            await fast_goto(
+                page, url, wait_for=selectors, timeout=10000, metrics=self.nav_metrics,
+            )
+
             for selector in selectors:
-                elements = await self.page.query_selector_all(selector)
+                elements = await page.query_selector_all(selector)
                 for element in elements:
                     code = await element.get_attribute("value") or await element.inner_text()
                     if code and self._is_valid_code(code):
@@ -99,7 +124,7 @@ class CouponScraper:
                         })
 
             # Also try to extract from page text
-            page_text = await self.page.inner_text("body")
+            page_text = await page.inner_text("body")
             text_codes = self._extract_codes_from_text(page_text)
             for code in text_codes:
                 codes.append({
@@ -178,65 +203,163 @@ class CouponScraper:
         Returns True if code appears to be valid
         """
         try:
-            # Navigate to brand's checkout or cart page
-            await self.page.goto(brand_url, wait_until="networkidle")
-
-            # Try to find and fill coupon input
-            coupon_selectors = [
-                'input[name*="coupon" i]',
-                'input[name*="code" i]',
-                'input[name*="promo" i]',
-                'input[id*="coupon" i]',
-                'input[id*="code" i]',
-            ]
-
-            for selector in coupon_selectors:
-                try:
-                    input_field = await self.page.query_selector(selector)
-                    if input_field:
-                        await input_field.fill(code)
-                        await input_field.press("Enter")
-                        await self.page.wait_for_timeout(2000)
-
-                        # Check for success/error messages
-                        page_text = await self.page.inner_text("body")
-                        error_indicators = [
-                            "invalid",
-                            "expired",
-                            "not found",
-                            "does not exist",
-                        ]
-                        success_indicators = [
-                            "applied",
-                            "valid",
-                            "discount",
-                            "saved",
-                        ]
-
-                        # If we see error indicators, code is invalid
-                        if any(
-                            indicator in page_text.lower()
-                            for indicator in error_indicators
-                        ):
-                            return False
-
-                        # If we see success indicators, code might be valid
-                        if any(
-                            indicator in page_text.lower()
-                            for indicator in success_indicators
-                        ):
-                            return True
-
-                except:
-                    continue
+            return await self.pool.run(
+                lambda page: self._validate_code_on_page(page, brand_url, code)
+            )
+        except Exception as e:
+            print(f"Error validating code {code} for {brand_url}: {e!r}")
+            return False
 
+    async def _validate_code_on_page(self, page: Page, brand_url: str, code: str) -> bool:
+        """validate_code() on a borrowed page"""
+        try:
+            verdict = await self._validate_on_entry_page(page, brand_url, code, {})
             # If we can't validate, assume it might be valid (conservative)
-            return True
-
+            return True if verdict is None else verdict
         except Exception as e:
             print(f"Error validating code {code} for {brand_url}: {e}")
             return False
 
+    async def validate_brand_codes(
+        self,
+        brand_url: str,
+        codes: List[str],
+        concurrency: int = VALIDATE_BRAND_CONCURRENCY,
+        code_timeout: float = VALIDATE_CODE_TIMEOUT,
+        brand_timeout: float = VALIDATE_BRAND_TIMEOUT,
+    ) -> Dict[str, bool]:
+        """
+        Validate all of one brand's codes.
+
+        Up to `concurrency` pooled pages each reach the coupon-entry state
+        once and then try codes back to back from a shared queue. Each code
+        is capped at code_timeout seconds; once brand_timeout seconds have
+        passed since the brand got its first page, remaining codes are
+        skipped. Returns {code: is_valid} for the codes that were checked —
+        timed-out, failed or skipped codes are left out.
+        """
+        codes = list(dict.fromkeys(c for c in codes if c))
+        results: Dict[str, bool] = {}
+        if not codes:
+            return results
+
+        pending = iter(codes)
+        loop = asyncio.get_running_loop()
+        deadline: List[Optional[float]] = [None]
+
+        async def run_lane():
+            async with self.pool.page() as page:
+                if deadline[0] is None:
+                    deadline[0] = loop.time() + brand_timeout
+                await self._validate_lane(page, brand_url, pending, results, code_timeout, deadline[0])
+
+        lanes = await asyncio.gather(
+            *(run_lane() for _ in range(max(1, min(concurrency, len(codes))))),
+            return_exceptions=True,
+        )
+        for error in lanes:
+            if isinstance(error, BaseException):
+                print(f"Error validating codes for {brand_url}: {error!r}")
+
+        skipped = len(codes) - len(results)
+        if skipped:
+            print(f"  ⏱️  {brand_url}: {skipped}/{len(codes)} codes not validated")
+        return results
+
+    async def _validate_lane(
+        self,
+        page: Page,
+        brand_url: str,
+        pending,
+        results: Dict[str, bool],
+        code_timeout: float,
+        deadline: float,
+    ):
+        """Try codes from `pending` on one page until the queue or the brand deadline runs out"""
+        loop = asyncio.get_running_loop()
+        state: Dict = {}
+        for code in pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                verdict = await asyncio.wait_for(
+                    self._validate_on_entry_page(page, brand_url, code, state),
+                    min(code_timeout, remaining),
+                )
+            except Exception as e:
+                print(f"Error validating code {code} for {brand_url}: {e!r}")
+                state.clear()  # page is in an unknown state, reload for the next code
+                continue
+
+            if verdict is None and not state.get("selector"):
+                # No coupon input on this site: assume valid (conservative)
+                results[code] = True
+                for rest in pending:
+                    results[rest] = True
+                return
+            results[code] = True if verdict is None else verdict
+
+    async def _validate_on_entry_page(
+        self, page: Page, brand_url: str, code: str, state: Dict,
+    ) -> Optional[bool]:
+        """
+        Try one code, loading brand_url only when the page is not already
+        at a coupon input. `state` carries the input selector and whether
+        the page shows a verdict from an earlier code between calls.
+        Returns True/False from the site's response, None if inconclusive.
+        """
+        verdict = None
+        for attempt in range(2):
+            selector = state.get("selector")
+            if attempt or not selector or not await page.query_selector(selector):
+                selector = await self._open_coupon_entry(page, brand_url)
+                state["selector"] = selector
+                state["dirty"] = False
+                if not selector:
+                    return None
+            verdict = await self._try_code(page, selector, code)
+            # An inconclusive result on a page still showing an earlier
+            # code's message is retried once on a fresh load
+            if verdict is not None or not state.get("dirty"):
+                break
+        state["dirty"] = state.get("dirty") or verdict is not None
+        return verdict
+
+    async def _open_coupon_entry(self, page: Page, brand_url: str) -> Optional[str]:
+        """Load the brand page; return the selector of its coupon input, if any"""
+        # Navigate to brand's checkout or cart page
+        await fast_goto(
+            page, brand_url, wait_for=COUPON_INPUT_SELECTORS, timeout=15000,
+            settle_ms=0, metrics=self.nav_metrics,
+        )
+        for selector in COUPON_INPUT_SELECTORS:
+            if await page.query_selector(selector):
+                return selector
+        return None
+
+    async def _try_code(self, page: Page, selector: str, code: str) -> Optional[bool]:
+        """Enter a code; judge it by indicator messages that appeared afterwards"""
+        input_field = await page.query_selector(selector)
+        if not input_field:
+            return None
+        before = (await page.inner_text("body")).lower()
+        await input_field.fill(code)
+        await input_field.press("Enter")
+        await page.wait_for_timeout(2000)
+        after = (await page.inner_text("body")).lower()
+
+        def appeared(indicators: List[str]) -> bool:
+            return any(after.count(i) > before.count(i) for i in indicators)
+
+        # If we see error indicators, code is invalid
+        if appeared(ERROR_INDICATORS):
+            return False
+        # If we see success indicators, code might be valid
+        if appeared(SUCCESS_INDICATORS):
+            return True
+        return None
+
 
 async def update_offers_from_scraped_codes(
     creator_id: str, brand_id: str, codes: List[Dict[str, str]]
@@ -391,17 +514,16 @@ async def scrape_all_brands():
         brands_response = supabase.table("brands").select("id, name, domain_pattern").execute()
         brands = brands_response.data
 
-        print(f"Found {len(brands)} brands to scrape")
-
-        for brand in brands:
-            print(f"\nScraping codes for {brand['name']} ({brand['domain_pattern']})")
+        print(f"Found {len(brands)} brands to scrape ({scraper.pool.size} pages in parallel)")
 
+        async def scrape_brand(brand: Dict) -> List[Dict[str, str]]:
             # Extract domain from pattern
             domain = brand["domain_pattern"].replace("https://", "").replace("http://", "").split("/")[0]
 
-            # Scrape codes
+            # Scrape codes (site visits are scheduled across the page pool)
             codes = await scraper.scrape_coupon_sites(domain)
-            print(f"Found {len(codes)} potential codes")
+            print(f"\n{brand['name']} ({brand['domain_pattern']}): "
+                  f"found {len(codes)} potential codes")
 
             # Validate codes (optional - can be slow)
             # For MVP, we'll skip validation and let the extension handle it
@@ -409,18 +531,29 @@ async def scrape_all_brands():
             # for code_data in codes:
             #     if await scraper.validate_code(f"https://{domain}", code_data["code"]):
             #         validated_codes.append(code_data)
+            return codes
 
-            # For now, we'll create offers for a default creator or skip
-            # In production, this would be more sophisticated
-            print(f"Note: Codes found but not automatically assigned to creators")
-            print(f"   Manual assignment required via dashboard")
+        await asyncio.gather(*(scrape_brand(brand) for brand in brands))
+
+        # For now, we'll create offers for a default creator or skip
+        # In production, this would be more sophisticated
+        print(f"\nNote: Codes found but not automatically assigned to creators")
+        print(f"   Manual assignment required via dashboard")
 
     finally:
         await scraper.close()
 
 
-async def validate_existing_offers():
-    """Validate existing offers in database and mark expired ones as inactive"""
+async def validate_existing_offers(
+    brand_concurrency: int = VALIDATE_BRAND_CONCURRENCY,
+    code_timeout: float = VALIDATE_CODE_TIMEOUT,
+    brand_timeout: float = VALIDATE_BRAND_TIMEOUT,
+):
+    """
+    Validate existing offers in database and mark expired ones as inactive.
+    Offers are grouped by brand and brands are validated in parallel
+    across the page pool (see CouponScraper.validate_brand_codes).
+    """
     scraper = CouponScraper()
     await scraper.initialize()
 
@@ -434,10 +567,10 @@ async def validate_existing_offers():
         )
         offers = offers_response.data
 
-        print(f"Validating {len(offers)} active offers")
-
+        # Group by brand base URL
+        by_brand: Dict[str, List[Dict]] = {}
         for offer in offers:
-            brand = offer.get("brand", {})
+            brand = offer.get("brand") or {}
             domain_pattern = brand.get("domain_pattern", "")
 
             if not domain_pattern:
@@ -447,15 +580,43 @@ async def validate_existing_offers():
             base_url = domain_pattern
             if not base_url.startswith("http"):
                 base_url = f"https://{base_url}"
-
-            # Validate code
-            is_valid = await scraper.validate_code(base_url, offer["code"])
-
-            if not is_valid:
-                print(f"Marking offer {offer['code']} as inactive (invalid)")
-                supabase.table("offers").update({"is_active": False}).eq(
-                    "id", offer["id"]
-                ).execute()
+            by_brand.setdefault(base_url, []).append(offer)
+
+        print(f"Validating {len(offers)} active offers across {len(by_brand)} brands")
+        started = datetime.now()
+
+        brand_results = await asyncio.gather(*(
+            scraper.validate_brand_codes(
+                base_url,
+                [offer["code"] for offer in brand_offers],
+                concurrency=brand_concurrency,
+                code_timeout=code_timeout,
+                brand_timeout=brand_timeout,
+            )
+            for base_url, brand_offers in by_brand.items()
+        ))
+
+        invalid_ids = []
+        checked = 0
+        for brand_offers, results in zip(by_brand.values(), brand_results):
+            for offer in brand_offers:
+                if offer["code"] not in results:
+                    continue
+                checked += 1
+                if not results[offer["code"]]:
+                    print(f"Marking offer {offer['code']} as inactive (invalid)")
+                    invalid_ids.append(offer["id"])
+
+        for i in range(0, len(invalid_ids), 100):
+            supabase.table("offers").update({"is_active": False}).in_(
+                "id", invalid_ids[i:i + 100]
+            ).execute()
+
+        elapsed = (datetime.now() - started).total_seconds()
+        print(
+            f"Validated {checked}/{sum(len(o) for o in by_brand.values())} offers "
+            f"in {elapsed:.0f}s: {len(invalid_ids)} marked inactive"
+        )
 
     finally:
         await scraper.close()
@@ -468,7 +629,21 @@ if __name__ == "__main__":
         command = sys.argv[1]
 
         if command == "validate":
-            asyncio.run(validate_existing_offers())
+            kwargs = {}
+            i = 2
+            while i < len(sys.argv):
+                if sys.argv[i] == "--brand-concurrency" and i + 1 < len(sys.argv):
+                    kwargs["brand_concurrency"] = int(sys.argv[i + 1])
+                    i += 2
+                elif sys.argv[i] == "--code-timeout" and i + 1 < len(sys.argv):
+                    kwargs["code_timeout"] = float(sys.argv[i + 1])
+                    i += 2
+                elif sys.argv[i] == "--brand-timeout" and i + 1 < len(sys.argv):
+                    kwargs["brand_timeout"] = float(sys.argv[i + 1])
+                    i += 2
+                else:
+                    i += 1
+            asyncio.run(validate_existing_offers(**kwargs))
 
         elif command == "--brand-id" and len(sys.argv) > 2:
             # Scrape specific brand by ID
@@ -494,6 +669,9 @@ if __name__ == "__main__":
             strategies = "search,channel"
             max_results = 10
             max_videos = 10
+            workers = None
+            use_cache = True
+            use_checkpoints = True
             i = 2
             while i < len(sys.argv):
                 if sys.argv[i] == "--strategies" and i + 1 < len(sys.argv):
@@ -505,6 +683,15 @@ if __name__ == "__main__":
                 elif sys.argv[i] == "--max-videos" and i + 1 < len(sys.argv):
                     max_videos = int(sys.argv[i + 1])
                     i += 2
+                elif sys.argv[i] == "--workers" and i + 1 < len(sys.argv):
+                    workers = int(sys.argv[i + 1])
+                    i += 2
+                elif sys.argv[i] == "--no-cache":
+                    use_cache = False
+                    i += 1
+                elif sys.argv[i] == "--no-checkpoints":
+                    use_checkpoints = False
+                    i += 1
                 elif sys.argv[i] == "--search-only":
                     strategies = "search"
                     i += 1
@@ -515,10 +702,14 @@ if __name__ == "__main__":
                     i += 1
 
             strategy_list = [s.strip() for s in strategies.split(",")]
+            kwargs = {"max_workers": workers} if workers else {}
+            kwargs["use_cache"] = use_cache
+            kwargs["use_checkpoints"] = use_checkpoints
             run_creator_discovery(
                 strategies=strategy_list,
                 max_results=max_results,
                 max_videos_per_creator=max_videos,
+                **kwargs,
             )
 
         elif command == "scrape-creator":
@@ -541,6 +732,7 @@ if __name__ == "__main__":
             print("Usage:")
             print("  python scraper.py                              # Scrape all brands")
             print("  python scraper.py validate                     # Validate existing offers")
+            print("  python scraper.py validate --brand-concurrency 3 --code-timeout 30 --brand-timeout 900")
             print("  python scraper.py --brand-id <id>              # Scrape specific brand")
             print("  python scraper.py discover                     # Discover new brands (legacy)")
             print("  python scraper.py full-pipeline                # Discover brands + scrape all")
@@ -550,6 +742,9 @@ if __name__ == "__main__":
             print("  python scraper.py discover-creators --search-only")
             print("  python scraper.py discover-creators --seed-only")
             print("  python scraper.py discover-creators --strategies search,channel --max-results 15")
+            print("  python scraper.py discover-creators --workers 8   # Concurrent video workers")
+            print("  python scraper.py discover-creators --no-cache    # Skip on-disk video cache")
+            print("  python scraper.py discover-creators --no-checkpoints  # Reprocess already-seen videos")
             print("  python scraper.py scrape-creator <channel_url> # Scrape a specific channel")
     else:
         asyncio.run(scrape_all_brands())
@@ -10,14 +10,28 @@ API docs: https://wiki.sponsor.ajay.app/w/API_Docs
 """
 
 import hashlib
-import time
-from typing import List, Dict
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
 
-import requests
+from http_transport import HttpTransport, TransportError, shared_transport
+from rate_limiter import HostRateLimiter
 
 
 SPONSORBLOCK_API = "https://sponsor.ajay.app/api"
 
+# Concurrent prefix requests in batch_check_videos (the transport also caps per host)
+DEFAULT_CONCURRENCY = 8
+
+# Prefix responses kept in memory (each covers every video sharing the prefix)
+PREFIX_CACHE_SIZE = 4096
+
+
+def hash_prefix(video_id: str) -> str:
+    """SponsorBlock's privacy-preserving lookup key: first 4 hex chars of SHA-256."""
+    return hashlib.sha256(video_id.encode()).hexdigest()[:4]
+
 
 class SponsorBlockService:
     """
@@ -28,13 +42,28 @@ class SponsorBlockService:
     crowdsource-label sponsor segments in YouTube videos. Their API
     lets us check if a video has known sponsor content — which means
     the creator was paid to promote something and likely shared a code.
+
+    Every /skipSegments/{prefix} response lists all videos sharing that
+    hash prefix, so responses are cached per prefix (LRU) and batch
+    lookups fetch each prefix once. Requests go through the shared
+    HttpTransport (pooling, retries, circuit breaker).
     """
 
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "backrAI/1.0 (creator leverage engine)",
-        })
+    def __init__(
+        self,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        cache_size: int = PREFIX_CACHE_SIZE,
+        transport: Optional[HttpTransport] = None,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.transport = transport or shared_transport()
+
+        self._cache_size = cache_size
+        self._prefix_cache: "OrderedDict[str, Dict[str, List[Dict]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.stats = {"requests": 0, "cache_hits": 0, "failed_prefixes": 0}
 
     def has_sponsor_segments(self, video_id: str) -> bool:
         """Check if a video has known sponsor segments."""
@@ -53,61 +82,53 @@ class SponsorBlockService:
 
         Uses SponsorBlock's privacy-preserving hash prefix lookup.
         """
-        try:
-            # SponsorBlock uses SHA-256 hash prefix for privacy
-            video_hash = hashlib.sha256(video_id.encode()).hexdigest()
-            hash_prefix = video_hash[:4]
-
-            response = self.session.get(
-                f"{SPONSORBLOCK_API}/skipSegments/{hash_prefix}",
-                params={
-                    "categories": '["sponsor","selfpromo"]',
-                },
-                timeout=10,
-            )
+        videos = self._get_prefix(hash_prefix(video_id))
+        return list((videos or {}).get(video_id, []))
 
-            if response.status_code == 200:
-                results = response.json()
-                # Filter to our specific video (hash prefix may match multiple)
-                for result in results:
-                    if result.get("videoID") == video_id:
-                        return [
-                            {
-                                "start": seg["segment"][0],
-                                "end": seg["segment"][1],
-                                "category": seg.get("category", "sponsor"),
-                                "duration": seg["segment"][1] - seg["segment"][0],
-                            }
-                            for seg in result.get("segments", [])
-                        ]
+    def batch_get_segments(
+        self,
+        video_ids: List[str],
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, List[Dict]]:
+        """
+        Get sponsor segments for many videos.
+        Returns {video_id: segments} mapping. Videos whose lookup failed
+        (after the transport's retries) are left out, so callers can tell
+        "no segments" from "unknown".
+
+        Video IDs are grouped by hash prefix and each prefix is fetched
+        once, on a bounded pool. Requests are paced by the shared
+        SponsorBlock rate limit to be a good API citizen (SponsorBlock is
+        a community project — be respectful).
+        """
+        by_prefix: Dict[str, List[str]] = {}
+        for vid in video_ids:
+            by_prefix.setdefault(hash_prefix(vid), []).append(vid)
 
-            # 404 = no segments found (normal, not an error)
-            return []
+        prefixes = list(by_prefix)
+        workers = min(max_workers or self.concurrency, len(prefixes)) or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            responses = list(pool.map(self._get_prefix, prefixes))
 
-        except requests.exceptions.Timeout:
-            return []
-        except requests.exceptions.ConnectionError:
-            return []
-        except Exception:
-            return []
+        results = {}
+        for prefix, videos in zip(prefixes, responses):
+            if videos is None:
+                continue
+            for vid in by_prefix[prefix]:
+                results[vid] = list((videos or {}).get(vid, []))
+        return results
 
     def batch_check_videos(
         self,
         video_ids: List[str],
-        rate_limit_delay: float = 0.1,
+        max_workers: Optional[int] = None,
     ) -> Dict[str, bool]:
         """
         Check multiple videos for sponsor segments.
-        Returns {video_id: has_sponsors} mapping.
-
-        Rate-limited to be a good API citizen (SponsorBlock is a
-        community project — be respectful).
+        Returns {video_id: has_sponsors} mapping (failed lookups left out).
         """
-        results = {}
-        for vid in video_ids:
-            results[vid] = self.has_sponsor_segments(vid)
-            time.sleep(rate_limit_delay)
-        return results
+        segments = self.batch_get_segments(video_ids, max_workers=max_workers)
+        return {vid: len(segs) > 0 for vid, segs in segments.items()}
 
     def get_total_sponsor_time(self, video_id: str) -> float:
         """
@@ -116,3 +137,75 @@ class SponsorBlockService:
         """
         segments = self.get_sponsor_segments(video_id)
         return sum(seg.get("duration", 0) for seg in segments)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _get_prefix(self, prefix: str) -> Optional[Dict[str, List[Dict]]]:
+        """Segments for every video under a hash prefix, from the LRU or the API."""
+        with self._cache_lock:
+            videos = self._prefix_cache.get(prefix)
+            if videos is not None:
+                self._prefix_cache.move_to_end(prefix)
+                self.stats["cache_hits"] += 1
+                return videos
+
+        videos = self._fetch_prefix(prefix)
+        if videos is None:
+            return None  # transient failure — don't cache
+
+        with self._cache_lock:
+            self._prefix_cache[prefix] = videos
+            self._prefix_cache.move_to_end(prefix)
+            while len(self._prefix_cache) > self._cache_size:
+                self._prefix_cache.popitem(last=False)
+        return videos
+
+    def _fetch_prefix(self, prefix: str) -> Optional[Dict[str, List[Dict]]]:
+        """
+        GET /skipSegments/{prefix}. Returns {video_id: segments} ({} when
+        nothing is known), or None if SponsorBlock couldn't be reached.
+        """
+        with self._cache_lock:
+            self.stats["requests"] += 1
+        try:
+            response = self.transport.get(
+                f"{SPONSORBLOCK_API}/skipSegments/{prefix}",
+                params={
+                    "categories": '["sponsor","selfpromo"]',
+                },
+                rate_limiter=self.rate_limiter,
+                timeout=10,
+            )
+
+            # 404 = no segments found (normal, not an error)
+            if response.status_code == 404:
+                return {}
+            if response.status_code != 200:
+                print(f"⚠️  SponsorBlock {prefix}: HTTP {response.status_code}")
+                return self._failed()
+
+            return {
+                result.get("videoID"): [
+                    {
+                        "start": seg["segment"][0],
+                        "end": seg["segment"][1],
+                        "category": seg.get("category", "sponsor"),
+                        "duration": seg["segment"][1] - seg["segment"][0],
+                    }
+                    for seg in result.get("segments", [])
+                ]
+                for result in response.json()
+            }
+
+        except TransportError as e:
+            print(f"⚠️  SponsorBlock {prefix}: {e}")
+            return self._failed()
+        except Exception as e:
+            print(f"⚠️  SponsorBlock {prefix}: bad response ({e})")
+            return self._failed()
+
+    def _failed(self) -> None:
+        with self._cache_lock:
+            self.stats["failed_prefixes"] += 1
+        return None
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+backrAI Synthetic Corpus
+Deterministic test data for the scraper text pipeline benchmarks.
+
+Every generator takes a seed, so the same arguments always produce the
+same text — timings from different commits are measured on identical
+input. Generates:
+  - long podcast-style transcripts with periodic sponsor reads
+  - video descriptions (links, timestamps, socials, affiliate codes)
+  - adversarial text full of hash-like tokens (IDs, tracking params,
+    base64) that must not be reported as codes
+  - brand tables from tens to 100k+ rows, plus (code, context) pairs
+"""
+
+import base64
+import random
+import string
+from typing import Dict, List, Tuple
+
+# ---------------------------------------------------------------------------
+# Transcripts
+# ---------------------------------------------------------------------------
+FILLER_WORDS = (
+    "so yeah I mean that was honestly the thing we were talking about "
+    "before the break and you know it kind of depends on how you look at "
+    "it because people always ask me what I eat in a day and the answer is "
+    "basically the same every single week which sounds boring but it works "
+    "for me and my training right now"
+).split()
+
+SPONSOR_READS = [
+    "this episode is brought to you by {brand} use code {code} for 20% off",
+    "head over to {domain}/{code} and get 15% off your first order",
+    "get 10% off with {code} at {brand} that's {code} at checkout",
+    "my promo code {code} still works at {domain}",
+    "enter {code} when you sign up and {brand} will give you a free month",
+    "shout out to {brand} {code} gets you a discount",
+    "discount code: {code} for {brand} members",
+]
+
+BRANDS = [
+    ("Gymshark", "gymshark.com"), ("NordVPN", "nordvpn.com"),
+    ("HelloFresh", "hellofresh.com"), ("Squarespace", "squarespace.com"),
+    ("Manscaped", "manscaped.com"), ("Athletic Greens", "drinkag1.com"),
+    ("Ridge", "ridge.com"), ("BetterHelp", "betterhelp.com"),
+]
+
+CREATOR_CODE_NAMES = ["ALEX", "PODCAST", "CHRIS", "SAM", "JEN"]
+
+
+def _creator_code(rng: random.Random) -> str:
+    return rng.choice(CREATOR_CODE_NAMES) + str(rng.randint(10, 60))
+
+
+def make_transcript(hours: float, seed: int = 42) -> str:
+    """~150 spoken words per minute, with a sponsor read every ~10 minutes."""
+    rng = random.Random(seed)
+    total_words = int(hours * 60 * 150)
+    words: List[str] = []
+    while len(words) < total_words:
+        words.extend(rng.choice(FILLER_WORDS) for _ in range(1500))
+        brand, domain = rng.choice(BRANDS)
+        code = _creator_code(rng)
+        words.extend(
+            rng.choice(SPONSOR_READS).format(brand=brand, domain=domain, code=code).split()
+        )
+    return " ".join(words)
+
+
+# ---------------------------------------------------------------------------
+# Descriptions
+# ---------------------------------------------------------------------------
+DESCRIPTION_LINES = [
+    "Thanks for watching! Don't forget to like and subscribe.",
+    "Follow me on Instagram: @{handle}",
+    "Twitter: https://twitter.com/{handle}",
+    "Business inquiries: {handle}@gmail.com",
+    "Music by Epidemic Sound: https://www.epidemicsound.com/referral/{token}",
+    "My camera gear: https://amzn.to/{token}",
+    "00:00 Intro",
+    "03:12 What I eat in a day",
+    "12:45 Training split",
+    "Some links are affiliate links, I may earn a small commission.",
+]
+
+SPONSOR_LINES = [
+    "Get 20% off {brand} with code {code}: https://{domain}/{code}",
+    "{brand}: use code {code} at https://www.{domain}",
+    "Try {brand} free for a month → https://{domain}?ref={handle}",
+    "Discount code {code} works on everything at {domain}",
+]
+
+
+def make_description(seed: int = 0) -> str:
+    """A typical creator description: socials, chapters, 1-3 sponsor lines."""
+    rng = random.Random(seed)
+    handle = rng.choice(CREATOR_CODE_NAMES).lower() + rng.choice(["fit", "eats", "lifts", "talks"])
+    lines = [
+        line.format(handle=handle, token=make_hash_token(rng, 10))
+        for line in rng.sample(DESCRIPTION_LINES, rng.randint(5, len(DESCRIPTION_LINES)))
+    ]
+    for _ in range(rng.randint(1, 3)):
+        brand, domain = rng.choice(BRANDS)
+        lines.insert(
+            rng.randint(0, len(lines)),
+            rng.choice(SPONSOR_LINES).format(
+                brand=brand, domain=domain, code=_creator_code(rng), handle=handle,
+            ),
+        )
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Adversarial text
+# ---------------------------------------------------------------------------
+def make_hash_token(rng: random.Random, length: int) -> str:
+    """Random uppercase alphanumeric ID (looks like a code to a naive regex)."""
+    return "".join(rng.choice(string.ascii_uppercase + string.digits) for _ in range(length))
+
+
+def make_adversarial_text(chars: int, seed: int = 13) -> str:
+    """
+    Text dense with hash-like tokens: video/tracking IDs, query strings,
+    base64 blobs, hex digests and all-caps words next to code keywords.
+    """
+    rng = random.Random(seed)
+    templates = [
+        lambda: f"https://youtu.be/{make_hash_token(rng, 11)}",
+        lambda: f"https://shop.example.com/p/{make_hash_token(rng, 8)}?utm_source={make_hash_token(rng, 6)}",
+        lambda: f"code {make_hash_token(rng, rng.randint(6, 17))}",
+        lambda: f"order #{make_hash_token(rng, 12)} shipped",
+        lambda: base64.b64encode(rng.randbytes(24)).decode(),
+        lambda: "%032x" % rng.getrandbits(128),
+        lambda: f"use {rng.choice(['THE', 'THIS', 'CODE', 'LINK', 'VIDEO'])} below",
+        lambda: f"{make_hash_token(rng, 2)}{rng.randint(100, 99999)}{make_hash_token(rng, 3)}",
+        lambda: " ".join(rng.choice(FILLER_WORDS) for _ in range(8)),
+    ]
+    parts: List[str] = []
+    size = 0
+    while size < chars:
+        part = rng.choice(templates)()
+        parts.append(part)
+        size += len(part) + 1
+    return " ".join(parts)[:chars]
+
+
+# ---------------------------------------------------------------------------
+# Videos
+# ---------------------------------------------------------------------------
+def make_videos(count: int, transcript_minutes: float = 20.0, seed: int = 3) -> List[Dict[str, str]]:
+    """Videos with title, description and a transcript of varying length."""
+    rng = random.Random(seed)
+    videos = []
+    for i in range(count):
+        brand, _ = rng.choice(BRANDS)
+        minutes = transcript_minutes * rng.uniform(0.25, 1.75)
+        videos.append({
+            "video_id": make_hash_token(rng, 11),
+            "title": f"What I Eat In A Day ft. {brand} #{i}",
+            "description": make_description(seed * 100_003 + i),
+            "transcript": make_transcript(minutes / 60, seed=seed * 100_003 + i),
+        })
+    return videos
+
+
+# ---------------------------------------------------------------------------
+# Brand tables
+# ---------------------------------------------------------------------------
+SYLLABLES = [
+    "ka", "lo", "ri", "ven", "tor", "mi", "sha", "bel", "dro", "fin",
+    "gal", "zen", "pro", "lux", "nor", "vit", "ora", "sun", "fit", "max",
+]
+
+
+def make_brands(count: int, seed: int = 7) -> List[Dict[str, str]]:
+    """Synthetic brands with realistic-looking names and domains."""
+    rng = random.Random(seed)
+    brands = []
+    seen = set()
+    # Two-syllable names run out first; allow longer names for big tables
+    max_syllables = 4 if count <= 50_000 else 5
+    while len(brands) < count:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, max_syllables)))
+        if name in seen:
+            continue
+        seen.add(name)
+        display = name.title() if rng.random() < 0.7 else f"{name.title()} Co"
+        brands.append({
+            "id": str(len(brands)),
+            "name": display,
+            "domain_pattern": f"{name}.com",
+        })
+    return brands
+
+
+def make_codes(brands: List[Dict[str, str]], count: int, seed: int = 11) -> List[Tuple[str, str]]:
+    """(code, context) pairs: some contain a brand name, some only mention it, some match nothing."""
+    rng = random.Random(seed)
+    filler = "use my code at checkout for a discount on your first order link below".split()
+    pairs = []
+    for _ in range(count):
+        brand = rng.choice(brands)
+        name = brand["name"].split()[0]
+        kind = rng.random()
+        words = [rng.choice(filler) for _ in range(40)]
+        if kind < 0.3:
+            code = f"{name.upper()}{rng.randint(10, 50)}"
+        elif kind < 0.6:
+            code = f"ALEX{rng.randint(10, 50)}"
+            words.insert(rng.randint(0, 40), brand["domain_pattern"])
+        elif kind < 0.8:
+            code = f"SAM{rng.randint(10, 50)}"
+            words.insert(rng.randint(0, 40), name)
+        else:
+            code = f"JEN{rng.randint(10, 50)}"
+        pairs.append((code, " ".join(words)))
+    return pairs
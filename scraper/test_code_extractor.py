@@ -5,8 +5,9 @@ Pure-function tests — no network, no DB, no Playwright.
 Should run in CI on every push.
 """
 
-import sys
 import os
+import random
+import sys
 
 # Ensure scraper directory is in path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -16,7 +17,11 @@ from code_extractor import (
     extract_codes_with_context,
     extract_brand_indicators,
     match_code_to_brand,
+    iter_code_matches,
+    BrandIndex,
 )
+from benchmark_code_extractor import legacy_extract_codes_from_text
+from synthetic_corpus import make_adversarial_text, make_description, make_transcript
 
 
 def test_pattern_code_colon():
@@ -72,6 +77,58 @@ def test_deduplication():
     print("  ✅ Deduplication: PASS")
 
 
+def test_overlapping_patterns():
+    """Codes hidden inside another pattern's match are still found."""
+    assert "PROMO2025" in extract_codes_from_text("try PROMO2025 today")
+    assert "CODE500" in extract_codes_from_text("use CODE500 at checkout")
+    assert "ABC12" in extract_codes_from_text("codeABC12")
+    assert "DRINKAG1" in extract_codes_from_text("drinkag1.com/JEN20")
+    assert "JEN20" in extract_codes_from_text("drinkag1.com/JEN20")
+    print("  ✅ Overlapping patterns: PASS")
+
+
+def test_no_codes_from_keyword_overlaps():
+    """A keyword-led match doesn't re-read a code already captured whole."""
+    assert extract_codes_from_text("discount codeABC12") == ["CODEABC12"]
+    assert extract_codes_from_text("code code Squarespace") == []
+    print("  ✅ No codes from keyword overlaps: PASS")
+
+
+def test_parity_with_original_extractor():
+    """Same codes, in the same order, as the original five-regex extractor."""
+    texts = [make_transcript(0.5)]
+    texts += [make_description(seed) for seed in range(50)]
+    texts += [make_adversarial_text(4000, seed) for seed in range(10)]
+
+    # Fuzz: fragments that make the patterns overlap, including non-ASCII
+    pieces = [
+        "code", "Code", "promo", "discount", "coupon", "use", "enter", "try",
+        "apply", "redeem", "my code", "with", "using", "off", "20% off",
+        "ABC12", "alex15", "NIKE20", "PROMO2025", "Squarespace", "codeABC12",
+        "drinkag1.com", "co.uk/", "https://", "www.", "/", "/JEN20", ".", "-",
+        ":", '"', "'", " ", "\n", "x", "12", "é", "İ", "ß", "_",
+    ]
+    rng = random.Random(4)
+    texts += [
+        "".join(rng.choice(pieces) + rng.choice(["", " "]) for _ in range(rng.randint(1, 14)))
+        for _ in range(5000)
+    ]
+    for text in texts:
+        assert extract_codes_from_text(text) == legacy_extract_codes_from_text(text), text[:200]
+    print("  ✅ Parity with original extractor: PASS")
+
+
+def test_match_offsets():
+    """iter_code_matches yields offsets pointing at the code in the text."""
+    text = "Intro... use code alex15 for 15% off, or NIKE20 at nike.com/Summer25"
+    matches = list(iter_code_matches(text))
+    codes = [code for code, _, _ in matches]
+    assert codes == ["ALEX15", "NIKE20", "SUMMER25"], codes
+    for code, start, end in matches:
+        assert text[start:end].upper() == code
+    print("  ✅ Match offsets: PASS")
+
+
 def test_context_extraction():
     """extract_codes_with_context returns surrounding text."""
     text = "Hey everyone! I partnered with Gymshark and my code ALEX15 gets you 15% off everything on gymshark.com"
@@ -161,6 +218,40 @@ def test_brand_matching_no_match():
     print("  ✅ Brand matching (no match): PASS")
 
 
+def test_brand_index_matches_linear_scan():
+    """BrandIndex returns the same brand as the list-based lookup, in priority order."""
+    known_brands = [
+        {"id": "1", "name": "Nike", "domain_pattern": "nike.com"},
+        {"id": "2", "name": "Gymshark", "domain_pattern": "gymshark.com"},
+        {"id": "3", "name": "Athletic Greens", "domain_pattern": "drinkag1.com"},
+        {"id": "4", "name": "Shark", "domain_pattern": "shark.com"},
+    ]
+    index = BrandIndex(known_brands)
+    cases = [
+        ("GYMSHARK15", ""),                       # name in code (first brand wins)
+        ("ATHLETICGREENS", ""),                    # cleaned name in code
+        ("ALEX15", "get it at drinkag1.com"),      # domain in context
+        ("ALEX15", "thanks to Athletic Greens"),   # name in context
+        ("RANDOM123", "nothing relevant here"),
+    ]
+    for code, context in cases:
+        assert index.match(code, context) is match_code_to_brand(code, context, known_brands)
+        assert match_code_to_brand(code, context, index) is index.match(code, context)
+    assert index.match("GYMSHARK15", "")["name"] == "Gymshark"
+    print("  ✅ BrandIndex matches linear scan: PASS")
+
+
+def test_brand_index_incremental_add():
+    """Brands added after build are matched, behind existing ones."""
+    index = BrandIndex([{"id": "1", "name": "Nike", "domain_pattern": "nike.com"}])
+    assert index.match("COOK50", "order at hellofresh.com") is None
+    index.add({"id": "2", "name": "HelloFresh", "domain_pattern": "hellofresh.com"})
+    assert index.match("COOK50", "order at hellofresh.com")["id"] == "2"
+    assert index.match("NIKE20", "hellofresh.com")["id"] == "1"
+    assert len(index) == 2
+    print("  ✅ BrandIndex incremental add: PASS")
+
+
 def test_empty_input():
     """All functions handle empty input gracefully."""
     assert extract_codes_from_text("") == []
@@ -168,6 +259,7 @@ def test_empty_input():
     assert extract_codes_with_context("") == []
     assert extract_brand_indicators("") == []
     assert match_code_to_brand("CODE", "", []) is None
+    assert match_code_to_brand("CODE", "", BrandIndex()) is None
     print("  ✅ Empty input handling: PASS")
 
 
@@ -223,12 +315,18 @@ if __name__ == "__main__":
         test_pattern_standalone,
         test_false_positive_rejection,
         test_deduplication,
+        test_overlapping_patterns,
+        test_no_codes_from_keyword_overlaps,
+        test_parity_with_original_extractor,
+        test_match_offsets,
         test_context_extraction,
         test_brand_indicators,
         test_brand_matching_code_contains_name,
         test_brand_matching_context_domain,
         test_brand_matching_context_name,
         test_brand_matching_no_match,
+        test_brand_index_matches_linear_scan,
+        test_brand_index_incremental_add,
         test_empty_input,
         test_real_world_description,
     ]
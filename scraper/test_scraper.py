@@ -134,6 +134,7 @@ def test_transcript_service():
         # Check that static methods exist
         assert hasattr(TranscriptService, 'get_transcript')
         assert hasattr(TranscriptService, 'get_video_metadata')
+        assert hasattr(TranscriptService, 'get_video_metadata_many')
         assert hasattr(TranscriptService, 'search_videos')
         assert hasattr(TranscriptService, 'extract_video_id')
         # Quick check: extract_video_id
@@ -141,6 +142,36 @@ def test_transcript_service():
             "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
         )
         assert vid == "dQw4w9WgXcQ", f"Expected dQw4w9WgXcQ, got {vid}"
+
+        # Batched metadata: a stall kills the process, the rest is retried
+        from video_cache import VideoCache
+        calls = []
+        batches = iter([
+            ({"v1": {"title": "One"}}, {"v2"}, {"v3"}, "v4"),
+            ({"v5": {"title": "Five"}}, set(), set(), None),
+        ])
+
+        def fake_batch(ids, item_timeout):
+            calls.append(list(ids))
+            return next(batches)
+
+        original = TranscriptService.__dict__["_run_metadata_batch"]
+        cache = VideoCache(":memory:")
+        TranscriptService.use_cache(cache)
+        TranscriptService._run_metadata_batch = staticmethod(fake_batch)
+        try:
+            metadata = TranscriptService.get_video_metadata_many(["v1", "v2", "v3", "v1", "v4", "v5"])
+            assert calls == [["v1", "v2", "v3", "v4", "v5"], ["v5"]], calls
+            assert metadata == {"v1": {"title": "One"}, "v2": None, "v3": None, "v4": None,
+                                "v5": {"title": "Five"}}
+            # Fetched and unavailable are cached; failed and stalled are not
+            assert TranscriptService.is_cached("v1", "metadata") and TranscriptService.is_cached("v2", "metadata")
+            assert not TranscriptService.is_cached("v3", "metadata")
+            assert not TranscriptService.is_cached("v4", "metadata")
+        finally:
+            TranscriptService._run_metadata_batch = original
+            TranscriptService.use_cache(None)
+            cache.close()
         print("✅ transcript_service module works correctly")
         return True
     except Exception as e:
@@ -152,11 +183,59 @@ def test_sponsorblock_service():
     """Test sponsorblock_service module import"""
     print("\n🔍 Testing sponsorblock_service module...")
     try:
-        from sponsorblock_service import SponsorBlockService
+        from sponsorblock_service import SponsorBlockService, hash_prefix
         svc = SponsorBlockService()
         assert hasattr(svc, 'has_sponsor_segments')
         assert hasattr(svc, 'get_sponsor_segments')
         assert hasattr(svc, 'batch_check_videos')
+        assert hasattr(svc, 'batch_get_segments')
+        assert len(hash_prefix("dQw4w9WgXcQ")) == 4
+
+        # Prefix batching against a fake transport
+        from http_transport import TransportError
+        from rate_limiter import HostRateLimiter, SPONSORBLOCK_HOST
+        a1, a2, b, c = "vid00000009", "vid00001568", "vid00000017", "vid00000040"
+        assert hash_prefix(a1) == hash_prefix(a2)
+        bodies = {
+            hash_prefix(a1): [{"videoID": a1, "segments": [{"segment": [10.0, 40.0], "category": "sponsor"}]},
+                              {"videoID": "someoneelse", "segments": []}],
+            hash_prefix(b): None,  # 404: nothing known
+        }
+
+        class Response:
+            def __init__(self, body):
+                self.status_code = 404 if body is None else 200
+                self._body = body
+            def json(self):
+                return self._body
+
+        class Transport:
+            requests = []
+            failing = {hash_prefix(c)}
+            def get(self, url, **kwargs):
+                prefix = url.rsplit("/", 1)[-1]
+                self.requests.append(prefix)
+                if prefix in self.failing:
+                    raise TransportError(f"{prefix}: circuit open")
+                return Response(bodies.get(prefix))
+
+        transport = Transport()
+        svc = SponsorBlockService(
+            rate_limiter=HostRateLimiter(rates={SPONSORBLOCK_HOST: (1000.0, 1000.0)}),
+            cache_size=2,
+            transport=transport,
+        )
+        segments = svc.batch_get_segments([a1, a2, b, c], max_workers=1)
+        assert segments == {a1: [{"start": 10.0, "end": 40.0, "category": "sponsor", "duration": 30.0}],
+                            a2: [], b: []}, segments  # failed prefix left out
+        assert transport.requests == [hash_prefix(a1), hash_prefix(b), hash_prefix(c)]
+        assert svc.batch_check_videos([a1, b], max_workers=1) == {a1: True, b: False}
+        assert len(transport.requests) == 3 and svc.stats["cache_hits"] == 2
+        transport.failing.clear()
+        assert svc.get_sponsor_segments(c) == []  # not cached as failed: fetched again
+        assert transport.requests[-1] == hash_prefix(c) and svc.stats["failed_prefixes"] == 1
+        assert svc.has_sponsor_segments(a1)  # least recently used: evicted by c
+        assert transport.requests[-1] == hash_prefix(a1) and len(transport.requests) == 5
         print("✅ sponsorblock_service module imported successfully")
         return True
     except Exception as e:
@@ -164,6 +243,619 @@ def test_sponsorblock_service():
         return False
 
 
+def test_http_transport():
+    """Test http_transport backoff, Retry-After parsing and circuit breaker"""
+    print("\n🔍 Testing http_transport module...")
+    try:
+        import time
+        from http_transport import CircuitBreaker, HttpTransport, _retry_after_seconds
+        transport = HttpTransport(backoff_base=0.5, backoff_max=4.0)
+        assert all(0 <= transport.backoff(attempt) <= 4.0 for attempt in range(10))
+        assert _retry_after_seconds("7") == 7.0
+        assert _retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+        assert _retry_after_seconds("soon") is None
+        breaker = CircuitBreaker(threshold=2, cooldown=0.05)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.is_open and not breaker.allow()
+        time.sleep(0.06)
+        assert breaker.allow() and not breaker.allow()  # one half-open trial at a time
+        breaker.record_success()
+        assert not breaker.is_open and breaker.allow()
+
+        # Any requests error on the half-open trial re-opens the circuit;
+        # a non-network exception frees the trial instead of wedging it
+        import requests
+        from http_transport import TransportError
+
+        class Session:
+            def __init__(self, outcomes):
+                self.outcomes = outcomes
+                self.sent = 0
+
+            def request(self, method, url, **kwargs):
+                self.sent += 1
+                outcome = self.outcomes.pop(0)
+                if isinstance(outcome, Exception):
+                    raise outcome
+                return outcome
+
+        ok = requests.Response()
+        ok.status_code = 200
+        transport = HttpTransport(max_retries=0, failure_threshold=1, cooldown=0.05)
+        transport.session = Session([
+            requests.exceptions.ConnectionError("refused"),
+            requests.exceptions.ChunkedEncodingError("truncated"),
+            ValueError("bug in a hook"),
+            ok,
+        ])
+        url = "https://api.example.com/x"
+        for expected in ("ConnectionError", "circuit open"):
+            try:
+                transport.get(url)
+                raise AssertionError("expected TransportError")
+            except TransportError as e:
+                assert expected in str(e), e
+        time.sleep(0.06)
+        try:
+            transport.get(url)  # trial: raw requests errors come back as TransportError
+            raise AssertionError("expected TransportError")
+        except TransportError as e:
+            assert "ChunkedEncodingError" in str(e), e
+        assert transport.breaker("api.example.com").is_open
+        time.sleep(0.06)
+        try:
+            transport.get(url)
+            raise AssertionError("expected ValueError")
+        except ValueError:
+            pass
+        assert transport.get(url) is ok and transport.session.sent == 4
+        assert not transport.breaker("api.example.com").is_open
+        print("✅ http_transport module works correctly")
+        return True
+    except Exception as e:
+        print(f"❌ http_transport test failed: {e}")
+        return False
+
+
+def test_rate_limiter():
+    """Test rate_limiter token buckets"""
+    print("\n🔍 Testing rate_limiter module...")
+    try:
+        from rate_limiter import HostRateLimiter, TokenBucket
+        bucket = TokenBucket(rate=100.0, capacity=2)
+        # Burst is free, the next token has to wait ~1/rate seconds
+        assert bucket.acquire() == 0.0
+        assert bucket.acquire() == 0.0
+        assert bucket.acquire() > 0.0
+        limiter = HostRateLimiter(rates={"example.com": (100.0, 1)})
+        assert limiter.acquire("example.com") == 0.0
+        print("✅ rate_limiter module works correctly")
+        return True
+    except Exception as e:
+        print(f"❌ rate_limiter test failed: {e}")
+        return False
+
+
+def test_video_cache():
+    """Test video_cache round-trip, negative entries and eviction"""
+    print("\n🔍 Testing video_cache module...")
+    try:
+        from video_cache import VideoCache, MISS
+        cache = VideoCache(":memory:", max_bytes=200)
+        assert cache.get("abc", "metadata") is MISS
+        cache.put("abc", "metadata", {"title": "Test"})
+        assert cache.get("abc", "metadata") == {"title": "Test"}
+        cache.put("nocaps", "transcript", None)
+        assert cache.get("nocaps", "transcript") is None
+        for i in range(20):
+            cache.put(f"vid{i}", "transcript", "use code SAVE20 " * 5 + str(i))
+        assert cache.stats["evictions"] > 0
+        cache.close()
+        print("✅ video_cache module works correctly")
+        return True
+    except Exception as e:
+        print(f"❌ video_cache test failed: {e}")
+        return False
+
+
+def test_checkpoint_store():
+    """Test checkpoint_store processed videos, channel marks and query cursors"""
+    print("\n🔍 Testing checkpoint_store module...")
+    try:
+        from checkpoint_store import CheckpointStore
+        store = CheckpointStore(":memory:")
+        store.mark_processed(["vid1", "vid2"])
+        assert store.is_processed("vid1") and not store.is_processed("vid3")
+        assert store.skip_processed(["vid1", "vid3", "vid2"]) == ["vid3"]
+        store.set_channel_mark("https://www.youtube.com/@test", "vid2")
+        assert store.get_channel_mark("https://www.youtube.com/@test") == "vid2"
+        store.mark_query_done("promo code")
+        assert store.order_queries(["promo code", "discount code"]) == ["discount code", "promo code"]
+        store.close()
+        print("✅ checkpoint_store module works correctly")
+        return True
+    except Exception as e:
+        print(f"❌ checkpoint_store test failed: {e}")
+        return False
+
+
+def test_creator_index():
+    """Test creator_index matching by channel ID, username and name"""
+    print("\n🔍 Testing creator_index module...")
+    try:
+        from creator_index import CreatorIndex
+        index = CreatorIndex([
+            {"id": "c1", "display_name": "Dr. Mike", "youtube_channel_id": "UC1", "youtube_username": "DrMike"},
+            {"id": "c2", "display_name": "Jeff Nippard", "youtube_channel_id": None, "youtube_username": None},
+        ])
+        assert index.match("UC1") == "c1"
+        assert index.match(username="drmike") == "c1"
+        assert index.match(display_name="jeff nippard") == "c2"
+        assert index.match("UC9", display_name="Dr Mike") is None  # same name, other channel
+        index.add({"id": "c3", "display_name": "New Creator", "youtube_channel_id": "UC3"})
+        assert index.match("UC3") == "c3"
+        assert index.channel_ids() == {"UC1", "UC3"}
+        print("✅ creator_index module works correctly")
+        return True
+    except Exception as e:
+        print(f"❌ creator_index test failed: {e}")
+        return False
+
+
+def test_discovery_pipeline():
+    """Test discovery_pipeline dedupes sources (VideoRegistry) and saves in batches"""
+    print("\n🔍 Testing discovery_pipeline module...")
+    try:
+        from discovery_pipeline import DiscoveryPipeline
+        from video_registry import VideoRegistry
+
+        class Engine:
+            max_workers = 2
+            saved = []
+            registry = VideoRegistry()
+            def _bump(self, key, amount=1): pass
+            def _fetch_metadata_chunk(self, ids): return {}
+            def _wants_sponsor_windows(self, meta): return False
+            def _fetch_video(self, vid, meta, prefetched, sponsor_segments): return {"video_id": vid}
+            def _extract_from_video(self, item):
+                return item if int(item["video_id"][1:]) % 2 == 0 else None
+            def _match_video_codes(self, item):
+                return self.registry.attach(item["video_id"], {
+                    **item, "creator_name": "", "codes": [{"code": "SAVE20"}],
+                })
+            def save_discoveries(self, batch): self.saved.append(len(batch))
+
+        engine = Engine()
+        pipeline = DiscoveryPipeline(engine, sink_batch_size=3)
+        pipeline.add_source("a", ((f"v{i}", None) for i in range(10)))
+        pipeline.add_source("b", ((f"v{i}", None) for i in range(5, 15)))
+        stats = pipeline.run()
+        assert stats["videos_queued"] == 15 and stats["duplicates_skipped"] == 5
+        assert sum(engine.saved) == 8 and max(engine.saved) <= 3
+        assert pipeline.registry.strategies("v7") == ["a", "b"]
+        # Saved records are released; tags stay for deduping
+        assert all(pipeline.registry.discovery(f"v{i}") is None for i in range(15))
+        assert pipeline.registry.strategies("v8") == ["a", "b"]
+
+        registry = VideoRegistry()
+        assert registry.claim("v1", "search") and not registry.claim("v1", "channel")
+        record = registry.attach("v1", {"video_id": "v1", "had_sponsor_segments": False})
+        registry.claim("v1", "sponsorblock")
+        registry.flag("v1", "had_sponsor_segments")
+        registry.flag("v2", "had_sponsor_segments")  # never claimed: ignored
+        assert record["strategies"] == ["search", "channel", "sponsorblock"]
+        assert record["had_sponsor_segments"] and registry.claim("v2", "search")
+        registry.release("v1")
+        registry.flag("v1", "late_flag")
+        assert registry.discovery("v1") is None and "late_flag" not in record
+        assert not registry.claim("v1", "search")
+        print("✅ discovery_pipeline module works correctly")
+        return True
+    except Exception as e:
+        print(f"❌ discovery_pipeline test failed: {e}")
+        return False
+
+
+class _FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.url = "about:blank"
+        self.closed = False
+        self._handlers = {}
+
+    def on(self, event, handler):
+        self._handlers[event] = handler
+
+    def is_closed(self):
+        return self.closed
+
+    def crash(self):
+        self._handlers["crash"](self)
+
+    async def goto(self, url, **kwargs):
+        self.url = url
+
+    async def query_selector(self, selector):
+        return self if selector == getattr(self, "coupon_input", None) else None
+
+
+class _FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.pages = []
+
+    async def new_page(self):
+        self.pages.append(_FakePage(self))
+        return self.pages[-1]
+
+    async def close(self):
+        for page in self.pages:
+            page.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.contexts = []
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        self.contexts.append(_FakeContext(self))
+        return self.contexts[-1]
+
+    async def close(self):
+        self.connected = False
+
+
+class _FakePlaywright:
+    """Stand-in for async_playwright(): .start() -> .chromium.launch() -> _FakeBrowser."""
+
+    def __init__(self):
+        self.chromium = self
+        self.browsers = []
+
+    async def start(self):
+        return self
+
+    async def launch(self, **kwargs):
+        self.browsers.append(_FakeBrowser())
+        return self.browsers[-1]
+
+    async def stop(self):
+        pass
+
+
+def test_browser_pool():
+    """Test browser_pool slot limits, crash recycling, timeouts and relaunch"""
+    print("\n🔍 Testing browser_pool module...")
+    try:
+        import browser_pool
+        from browser_pool import PagePool
+
+        playwright = _FakePlaywright()
+        original = browser_pool.async_playwright
+        browser_pool.async_playwright = lambda: playwright
+
+        async def scenario():
+            pool = PagePool(size=2, max_uses=3, task_timeout=0.2)
+            await pool.start()
+            running, peak = 0, 0
+
+            async def visit(page, url):
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                try:
+                    if url == "slow":
+                        await asyncio.sleep(5)
+                    if url == "boom":
+                        raise ValueError("bad page")
+                    await asyncio.sleep(0.01)
+                    await page.goto(url)
+                    return url, page
+                finally:
+                    running -= 1
+
+            # Never more pages in use than slots; input order kept
+            results = await pool.map(visit, [f"u{i}" for i in range(6)])
+            assert peak == 2 and [url for url, _ in results] == [f"u{i}" for i in range(6)]
+            assert len({id(page) for _, page in results}) == 2
+            assert pool.stats["pages_recycled"] == 2  # max_uses=3: both retired after this batch
+            assert all(page.closed for _, page in results)
+
+            # A slow site times out on its own slot while the others finish
+            results = await pool.map(visit, ["slow", "a", "boom", "b", "c"])
+            assert isinstance(results[0], asyncio.TimeoutError)
+            assert isinstance(results[2], ValueError)
+            assert [results[i][0] for i in (1, 3, 4)] == ["a", "b", "c"]
+            assert pool.stats["timeouts"] == 1 and pool.stats["errors"] == 1
+            assert pool.stats["pages_recycled"] == 4  # the slow and the failing page
+
+            # A crashed page is replaced before its slot is used again
+            async def crash(page):
+                page.crash()
+                return page
+            crashed = await pool.run(crash)
+            assert crashed.closed
+            fresh = await asyncio.gather(pool.run(lambda page: asyncio.sleep(0, page)),
+                                         pool.run(lambda page: asyncio.sleep(0, page)))
+            assert crashed not in fresh and not any(p.closed for p in fresh)
+
+            # A disconnected browser is relaunched on the next borrow
+            pool.browser.connected = False
+            page = await pool.run(lambda page: asyncio.sleep(0, page))
+            assert pool.stats["browser_restarts"] == 1 and len(playwright.browsers) == 2
+            assert page.context.browser is playwright.browsers[1]
+            await pool.close()
+            return pool
+
+        try:
+            pool = asyncio.run(scenario())
+        finally:
+            browser_pool.async_playwright = original
+        print(f"✅ browser_pool module works correctly ({pool.summary()})")
+        return True
+    except Exception as e:
+        print(f"❌ browser_pool test failed: {e!r}")
+        return False
+
+
+def test_validate_brand_codes():
+    """Test CouponScraper.validate_brand_codes lanes, deadlines and the no-input drain"""
+    print("\n🔍 Testing brand code validation...")
+    placeholders = {"SUPABASE_URL": "https://placeholder.supabase.co",
+                    "SUPABASE_SERVICE_ROLE_KEY": "placeholder.placeholder.placeholder"}
+    added = [name for name in placeholders if not os.environ.get(name)]
+    try:
+        import browser_pool
+        for name in added:  # scraper.py needs a (never used) client at import
+            os.environ[name] = placeholders[name]
+        from scraper import CouponScraper
+
+        class Site:
+            """Fake brand site: codes starting with BAD are rejected, HANG never answers."""
+            def __init__(self, has_input=True, delay=0.01):
+                self.has_input = has_input
+                self.delay = delay
+                self.opens = 0
+                self.tries = []
+
+            async def open_entry(self, page, brand_url):
+                self.opens += 1
+                page.coupon_input = 'input[name*="coupon" i]' if self.has_input else None
+                return page.coupon_input
+
+            async def try_code(self, page, selector, code):
+                self.tries.append((page, code))
+                await asyncio.sleep(5 if code == "HANG" else self.delay)
+                return not code.startswith("BAD")
+
+        playwright = _FakePlaywright()
+        original = browser_pool.async_playwright
+        browser_pool.async_playwright = lambda: playwright
+
+        async def validate(site, codes, **kwargs):
+            scraper._open_coupon_entry = site.open_entry
+            scraper._try_code = site.try_code
+            return await scraper.validate_brand_codes("https://brand.example", codes, **kwargs)
+
+        async def scenario():
+            await scraper.initialize()
+
+            # Two lanes share one queue: every code tried once, one page load per lane
+            site = Site()
+            codes = ["A", "B", "BAD1", "C", "D", "BAD2", "A"]
+            results = await validate(site, codes, concurrency=2)
+            assert results == {"A": True, "B": True, "BAD1": False, "C": True, "D": True, "BAD2": False}
+            assert sorted(code for _, code in site.tries) == sorted(set(codes))
+            assert len({id(page) for page, _ in site.tries}) == 2 and site.opens == 2
+
+            # A hung code is cut off at code_timeout and left out; the page reloads
+            site = Site()
+            results = await validate(site, ["A", "HANG", "B"], concurrency=1, code_timeout=0.1)
+            assert results == {"A": True, "B": True} and site.opens == 2
+
+            # The brand deadline stops the lane and skips the rest
+            site = Site(delay=0.05)
+            codes = [f"CODE{i}" for i in range(20)]
+            results = await validate(site, codes, concurrency=1, brand_timeout=0.2)
+            assert 0 < len(results) < len(codes) and all(results.values())
+            assert list(results) == codes[:len(results)]
+
+            # No coupon input: the remaining queue is drained as valid
+            site = Site(has_input=False)
+            results = await validate(site, ["A", "B", "C", "D", "E"], concurrency=2)
+            assert results == dict.fromkeys(["A", "B", "C", "D", "E"], True)
+            assert site.tries == [] and site.opens <= 2
+            await scraper.pool.close()
+
+        scraper = CouponScraper(pool_size=4)
+        try:
+            asyncio.run(scenario())
+        finally:
+            browser_pool.async_playwright = original
+        print("✅ brand code validation works correctly")
+        return True
+    except Exception as e:
+        print(f"❌ brand code validation test failed: {e!r}")
+        return False
+    finally:
+        for name in added:
+            os.environ.pop(name, None)
+
+
+def test_fast_navigation():
+    """Test fast_navigation host blocking and metrics"""
+    print("\n🔍 Testing fast_navigation module...")
+    try:
+        from fast_navigation import _is_blocked_host, NavigationMetrics
+        assert _is_blocked_host("https://www.google-analytics.com/analytics.js")
+        assert _is_blocked_host("https://securepubads.g.doubleclick.net/tag/js/gpt.js")
+        assert not _is_blocked_host("https://www.retailmenot.com/view/gymshark.com")
+        metrics = NavigationMetrics()
+        metrics.record({"ok": True, "selector_found": False, "bytes": 2048,
+                        "requests": 3, "blocked": 5, "seconds": 0.5})
+        assert metrics.pages == 1 and metrics.blocked == 5 and metrics.selector_misses == 1
+
+        # One timeout covers goto + selector wait; bytes are body sizes
+        import fast_navigation
+        from fast_navigation import fast_goto
+
+        class Request:
+            def __init__(self, size):
+                self.size = size
+
+            async def sizes(self):
+                await asyncio.sleep(0.01)
+                return {"responseBodySize": self.size}
+
+        class Page:
+            def __init__(self):
+                self.handlers = {}
+                self.selector_timeouts = []
+
+            async def route(self, pattern, handler):
+                pass
+
+            def on(self, event, handler):
+                self.handlers[event] = handler
+
+            async def goto(self, url, wait_until=None, timeout=None):
+                await asyncio.sleep(0.3)
+                for size in (1000, 2500):  # chunked: no Content-Length header
+                    self.handlers["response"](object())
+                    self.handlers["requestfinished"](Request(size))
+
+            async def wait_for_selector(self, selector, state=None, timeout=None):
+                self.selector_timeouts.append(timeout)
+
+        if fast_navigation.FAST_NAVIGATION:
+            page = Page()
+            nav = asyncio.run(fast_goto(page, "https://shop.example.com", wait_for=".code",
+                                        timeout=1000))
+            assert nav["ok"] and nav["bytes"] == 3500 and nav["requests"] == 2, nav
+            assert 0 < page.selector_timeouts[0] <= 700, page.selector_timeouts
+        print(f"✅ fast_navigation module works correctly ({metrics.summary()})")
+        return True
+    except Exception as e:
+        print(f"❌ fast_navigation test failed: {e}")
+        return False
+
+
+def test_transcript_segments():
+    """Test transcript_segments windows, timestamps and sponsor-window extraction"""
+    print("\n🔍 Testing transcript_segments module...")
+    try:
+        from transcript_segments import TranscriptSegments, extract_codes_in_windows
+        segments = TranscriptSegments.from_api([
+            {"text": "welcome back to the channel", "start": 0.0, "duration": 4.0},
+            {"text": "today's video is sponsored by gymshark", "start": 300.0, "duration": 4.0},
+            {"text": "use code ALEX20 for 20% off", "start": 304.0, "duration": 4.0},
+            {"text": "my friend uses code MIKE15", "start": 3000.0, "duration": 4.0},
+        ])
+        assert segments.text.startswith("welcome back") and len(segments) == 4
+        assert TranscriptSegments.from_dict(segments.to_dict()).text == segments.text
+        codes = extract_codes_in_windows(segments, [(300.0, 308.0)])
+        assert [(c["code"], c["timestamp"]) for c in codes] == [("ALEX20", 304.0)]
+        assert segments.time_at(segments.text.index("MIKE15")) == 3000.0
+        print("✅ transcript_segments module works correctly")
+        return True
+    except Exception as e:
+        print(f"❌ transcript_segments test failed: {e}")
+        return False
+
+
+def test_metrics():
+    """Test metrics stage timers, percentiles and exports"""
+    print("\n🔍 Testing metrics module...")
+    try:
+        import json
+        import tempfile
+        from metrics import StageMetrics
+        metrics = StageMetrics(enabled=True)
+        for ms in range(1, 101):
+            metrics.record("transcript", ms / 1000)
+        try:
+            with metrics.timer("db.offers.upsert"):
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+        metrics.count_error("metadata")
+        stages = metrics.snapshot()
+        assert stages["transcript"]["count"] == 100
+        assert stages["transcript"]["p50"] == 0.05 and stages["transcript"]["p95"] == 0.095
+        assert stages["transcript"]["max"] == 0.1
+        assert stages["db.offers.upsert"]["errors"] == 1
+        assert stages["metadata"] == {"count": 0, "errors": 1, "total": 0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+        with tempfile.TemporaryDirectory() as tmp:
+            metrics.write_json(f"{tmp}/m.json", counters={"errors": 2})
+            with open(f"{tmp}/m.json") as f:
+                assert json.load(f)["counters"]["errors"] == 2
+            metrics.write_prometheus(f"{tmp}/m.prom", counters={"errors": 2})
+            with open(f"{tmp}/m.prom") as f:
+                prom = f.read()
+            assert 'backrai_discovery_stage_seconds{stage="transcript",quantile="0.95"} 0.095000' in prom
+            assert "backrai_discovery_errors 2" in prom
+        disabled = StageMetrics(enabled=False)
+        with disabled.timer("transcript"):
+            pass
+        assert disabled.snapshot() == {} and disabled.summary_lines() == []
+        print("✅ metrics module works correctly")
+        return True
+    except Exception as e:
+        print(f"❌ metrics test failed: {e}")
+        return False
+
+
+def test_replay():
+    """Test replay fixture archive, MemorySupabase and service hooks"""
+    print("\n🔍 Testing replay module...")
+    try:
+        import tempfile
+        from replay import FixtureArchive, FixtureSession, MemorySupabase
+        from transcript_service import TranscriptService
+
+        db = MemorySupabase({"brands": [{"id": "b1", "name": "Gymshark", "domain_pattern": "gymshark.com"}]})
+        db.table("brands").upsert(
+            [{"name": "Gym", "domain_pattern": "gymshark.com"}, {"name": "Ridge", "domain_pattern": "ridge.com"}],
+            on_conflict="domain_pattern", ignore_duplicates=True,
+        ).execute()
+        rows = db.table("brands").select("id, domain_pattern").order("domain_pattern").execute().data
+        assert [r["domain_pattern"] for r in rows] == ["gymshark.com", "ridge.com"]
+        try:
+            db.table("brands").insert({"name": "Dup", "domain_pattern": "ridge.com"}).execute()
+            raise AssertionError("duplicate domain_pattern was accepted")
+        except Exception as e:
+            assert "duplicate key" in str(e)
+        db.table("brands").update({"name": "Ridge Wallet"}).in_("domain_pattern", ["ridge.com"]).execute()
+        assert db.table("brands").select("name").ilike("name", "%wallet%").execute().data == [{"name": "Ridge Wallet"}]
+
+        archive = FixtureArchive()
+        archive.put("metadata", "vid00000001", {"title": "T", "duration": 60}, 0.0)
+        archive.put("metadata", "vid00000002", None, 0.0)
+        archive.put("transcript", "vid00000001", {"start": [0.0], "duration": [2.0], "text": ["use code ALEX20"]}, 0.0)
+        with tempfile.TemporaryDirectory() as tmp:
+            archive.save(f"{tmp}/fixtures.jsonl.gz")
+            archive = FixtureArchive.load(f"{tmp}/fixtures.jsonl.gz")
+        original = TranscriptService.__dict__["_fetch_transcript"]
+        with FixtureSession(archive, mode="replay"):
+            metadata = TranscriptService.get_video_metadata_many(["vid00000001", "vid00000002", "vid00000003"])
+            segments = TranscriptService.get_transcript_segments("vid00000001")
+        assert metadata == {"vid00000001": {"title": "T", "duration": 60}, "vid00000002": None, "vid00000003": None}
+        assert segments.text == "use code ALEX20"
+        assert archive.misses == {"metadata": 1}
+        assert TranscriptService.__dict__["_fetch_transcript"] is original
+        print(f"✅ replay module works correctly ({archive.summary()})")
+        return True
+    except Exception as e:
+        print(f"❌ replay test failed: {e}")
+        return False
+
+
 def test_creator_discovery():
     """Test creator_discovery module import"""
     print("\n🔍 Testing creator_discovery module...")
@@ -183,6 +875,234 @@ def test_creator_discovery():
         return False
 
 
+def _flaky_supabase(tables, failures):
+    """MemorySupabase whose first N executes per (table, op) raise, e.g. {("offers", "upsert"): 1}."""
+    from replay import MemorySupabase
+    db = MemorySupabase(tables)
+    make_query = db.table
+
+    def table(name):
+        query = make_query(name)
+        execute = query.execute
+
+        def flaky_execute():
+            key = (name, query._op)
+            if failures.get(key):
+                failures[key] -= 1
+                raise Exception(f"simulated {name} {query._op} failure")
+            return execute()
+        query.execute = flaky_execute
+        return query
+    db.table = table
+    return db
+
+
+def _discovery(video_id, channel_id, name, codes):
+    """Discovery dict as _match_video_codes builds it; codes are (code, brand_id or None)."""
+    return {
+        "video_id": video_id,
+        "creator_name": name,
+        "creator_channel_id": channel_id,
+        "creator_channel_url": "",
+        "codes": [
+            {"code": code, "context": "", "probable_brand": None,
+             "matched_brand": {"id": brand_id} if brand_id else None}
+            for code, brand_id in codes
+        ],
+        "brand_indicators": [],
+    }
+
+
+def test_creator_discovery_saves():
+    """Test CreatorDiscovery.save_discoveries counts against MemorySupabase"""
+    print("\n🔍 Testing creator_discovery saves...")
+    try:
+        from creator_discovery import CreatorDiscovery
+        tables = {
+            "brands": [{"id": "b1", "name": "Gymshark", "domain_pattern": "gymshark.com"}],
+            "creators": [{"id": "c1", "display_name": "Old Creator", "youtube_channel_id": "UC1",
+                          "affiliate_ref_code": "oldcreator"}],
+            "offers": [{"id": "o1", "creator_id": "c1", "brand_id": "b1", "code": "OLD10", "is_active": False}],
+        }
+
+        # New, existing, unbranded and duplicate-key offers in one save
+        db = _flaky_supabase(tables, {})
+        engine = CreatorDiscovery(supabase_client=db, max_workers=1)
+        saved = engine.save_discoveries([
+            _discovery("v1", "UC1", "Old Creator", [("OLD10", "b1"), ("NEW20", "b1"), ("PLAIN5", None)]),
+            _discovery("v2", "UC2", "New Creator", [("NEW20", "b1")]),
+            _discovery("v3", "UC2", "New Creator", [("NEW20", "b1")]),   # same key again
+            _discovery("v4", "UC1", "Old Creator", [("OLD10", None)]),  # unbranded, matches o1
+        ])
+        assert saved["creators_upserted"] == 2 and saved["creators_created"] == 1, saved
+        assert saved["offers_created"] == 3 and saved["offers_updated"] == 1, saved
+        assert len(db.tables["offers"]) == 4 and db.tables["offers"][0]["is_active"]
+        assert engine.stats["errors"] == 0
+
+        # Failed bulk writes fall back to row-by-row and still count right
+        db = _flaky_supabase(tables, {("creators", "insert"): 1, ("offers", "upsert"): 1})
+        engine = CreatorDiscovery(supabase_client=db, max_workers=1)
+        saved = engine.save_discoveries([
+            _discovery("v1", "UC2", "Second Creator", [("NEW20", "b1")]),
+            _discovery("v2", "UC3", "Third Creator", [("NEW30", "b1")]),
+        ])
+        assert saved["creators_created"] == 2 and saved["offers_created"] == 2, saved
+        assert len(db.tables["creators"]) == 3 and len(db.tables["offers"]) == 3
+
+        # A failed prefetch is counted on its own; existing offers stay "updated"
+        db = _flaky_supabase(tables, {("offers", "select"): 1})
+        engine = CreatorDiscovery(supabase_client=db, max_workers=1)
+        saved = engine.save_discoveries([
+            _discovery("v1", "UC1", "Old Creator", [("OLD10", "b1"), ("NEW20", "b1")]),
+        ])
+        assert saved["offer_lookups_failed"] == 1, saved
+        assert saved["offers_created"] == 1 and saved["offers_updated"] == 1, saved
+        assert engine.stats["errors"] == 1 and len(db.tables["offers"]) == 2
+
+        # affiliate_ref_code collisions: same name on another channel gets its
+        # own creator; rows created after the index loaded are found, not duplicated
+        db = _flaky_supabase({
+            "creators": [{"id": "c1", "display_name": "TECH TIPS", "youtube_channel_id": "UCA",
+                          "affiliate_ref_code": "techtips"}],
+        }, {})
+        engine = CreatorDiscovery(supabase_client=db, max_workers=1)
+        engine._load_creator_index()
+        db.tables["creators"] += [
+            {"id": "c2", "display_name": "Late Creator", "youtube_channel_id": "UCL",
+             "affiliate_ref_code": "latecreator"},
+            {"id": "c3", "display_name": "Name Only", "youtube_channel_id": None,
+             "affiliate_ref_code": "nameonly"},
+        ]
+        saved = engine.save_discoveries([
+            _discovery("v1", "UCB", "Tech Tips", [("TECH10", None)]),
+            _discovery("v2", "UCL", "Late Creator", [("LATE10", None)]),
+            _discovery("v3", "UCN", "Name Only", [("NAME10", None)]),
+        ])
+        owners = {o["code"]: o["creator_id"] for o in db.tables["offers"]}
+        assert owners["LATE10"] == "c2" and owners["NAME10"] == "c3", owners
+        assert owners["TECH10"] not in ("c1", "c2", "c3") and saved["creators_created"] == 1, saved
+        new_creator = next(c for c in db.tables["creators"] if c["id"] == owners["TECH10"])
+        assert new_creator["youtube_channel_id"] == "UCB"
+        assert new_creator["affiliate_ref_code"].startswith("techtips") and len(new_creator["affiliate_ref_code"]) <= 20
+        print("✅ creator_discovery saves work correctly")
+        return True
+    except Exception as e:
+        print(f"❌ creator_discovery saves test failed: {e!r}")
+        return False
+
+
+def test_creator_discovery_checkpoints():
+    """Test that only definitive, fully saved videos are checkpointed"""
+    print("\n🔍 Testing creator_discovery checkpoints...")
+    try:
+        from checkpoint_store import CheckpointStore
+        from creator_discovery import CreatorDiscovery
+        from rate_limiter import HostRateLimiter, YOUTUBE_HOST
+
+        def meta(description=""):
+            return {"title": "Video", "description": description, "channel_id": "UC1",
+                    "channel_name": "Some Creator", "channel_url": "", "duration": 60}
+
+        class Videos:
+            """TranscriptService stand-in: video_id -> (metadata, (segments, definitive))."""
+            videos = {
+                "quiet": (meta(), (None, True)),            # no codes, final answer
+                "flaky": (meta(), (None, False)),           # transcript fetch failed
+                "searchonly": (None, (None, True)),         # metadata fetch failed
+                "coded": (meta("Use code SAVE20 for 20% off"), (None, True)),
+            }
+            def is_cached(self, video_id, field): return False
+            def get_video_metadata(self, video_id): return self.videos[video_id][0]
+            def lookup_transcript_segments(self, video_id): return self.videos[video_id][1]
+
+        db = _flaky_supabase({}, {("offers", "insert"): 2})  # bulk and row-by-row
+        checkpoints = CheckpointStore(":memory:")
+        engine = CreatorDiscovery(
+            supabase_client=db, max_workers=1, checkpoints=checkpoints,
+            rate_limiter=HostRateLimiter(rates={YOUTUBE_HOST: (1000.0, 1000.0)}),
+        )
+        engine.transcript_svc = Videos()
+        search = {"title": "Video", "channel_id": "UC1", "channel_name": "Some Creator"}
+        results = {vid: engine._process_video(vid, search) for vid in Videos.videos}
+        assert [vid for vid, disc in results.items() if disc] == ["coded"]
+        assert checkpoints.skip_processed(list(Videos.videos)) == ["flaky", "searchonly", "coded"]
+
+        # The offer write fails: not checkpointed, so the code isn't lost
+        saved = engine.save_discoveries([results["coded"]])
+        assert saved["offers_created"] == 0 and not checkpoints.is_processed("coded")
+        saved = engine.save_discoveries([results["coded"]])
+        assert saved["offers_created"] == 1 and checkpoints.is_processed("coded")
+        checkpoints.close()
+        print("✅ creator_discovery checkpoints work correctly")
+        return True
+    except Exception as e:
+        print(f"❌ creator_discovery checkpoints test failed: {e!r}")
+        return False
+
+
+def test_channel_marks():
+    """Test channel listings stop at the high-water mark and marks advance over processed runs"""
+    print("\n🔍 Testing channel high-water marks...")
+    try:
+        import tempfile
+        from checkpoint_store import CheckpointStore
+        from creator_discovery import CreatorDiscovery
+        from rate_limiter import HostRateLimiter, YOUTUBE_HOST
+        from replay import MemorySupabase
+
+        channel = "https://www.youtube.com/@example"
+
+        class Listing:
+            """iter_channel_video_ids stand-in: newest upload first, records what was consumed."""
+            uploads = ["v5", "v4", "v3", "v2", "v1"]
+            consumed = []
+            def iter_channel_video_ids(self, channel_url, max_videos=50):
+                self.consumed = []
+                for video_id in self.uploads[:max_videos]:
+                    self.consumed.append(video_id)
+                    yield video_id
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = CheckpointStore(f"{tmp}/checkpoints.sqlite3")
+            engine = CreatorDiscovery(
+                supabase_client=MemorySupabase(), max_workers=1, checkpoints=store,
+                rate_limiter=HostRateLimiter(rates={YOUTUBE_HOST: (1000.0, 1000.0)}),
+            )
+            listing = engine.transcript_svc = Listing()
+
+            # First scan: no mark, everything is new
+            assert engine._list_channel_videos(channel) == ["v5", "v4", "v3", "v2", "v1"]
+            assert store.get_channel_mark(channel) is None
+
+            # v3 wasn't reached: the mark only covers the contiguous run v1-v2
+            store.mark_processed(["v1", "v2", "v4"])
+            engine.advance_channel_marks()
+            assert store.get_channel_mark(channel) == "v2"
+
+            # Next scan stops at the mark without reading further
+            listing.uploads = ["v6"] + listing.uploads
+            assert engine._list_channel_videos(channel) == ["v6", "v5", "v4", "v3"]
+            assert listing.consumed == ["v6", "v5", "v4", "v3", "v2"]
+
+            store.mark_processed(["v3"])
+            engine.advance_channel_marks()
+            assert store.get_channel_mark(channel) == "v4"
+            store.close()
+
+            # A fresh run on the same store: no new uploads costs one item
+            store = CheckpointStore(f"{tmp}/checkpoints.sqlite3")
+            engine.checkpoints = store
+            listing.uploads = ["v4", "v3", "v2", "v1"]
+            assert engine._list_channel_videos(channel) == []
+            assert listing.consumed == ["v4"]
+            store.close()
+        print("✅ channel high-water marks work correctly")
+        return True
+    except Exception as e:
+        print(f"❌ channel high-water marks test failed: {e!r}")
+        return False
+
+
 def main():
     print("=" * 60)
     print("🧪 backrAI Scraper Test Suite")
@@ -196,7 +1116,22 @@ def main():
         "Code Extractor": False,
         "Transcript Service": False,
         "SponsorBlock Service": False,
+        "Rate Limiter": False,
+        "HTTP Transport": False,
+        "Video Cache": False,
+        "Checkpoint Store": False,
+        "Creator Index": False,
+        "Discovery Pipeline": False,
+        "Fast Navigation": False,
+        "Browser Pool": False,
+        "Brand Code Validation": False,
+        "Transcript Segments": False,
+        "Metrics": False,
+        "Replay": False,
         "Creator Discovery": False,
+        "Creator Discovery Saves": False,
+        "Creator Discovery Checkpoints": False,
+        "Channel Marks": False,
     }
 
     # Optional tests (external service dependencies — warn but don't fail CI)
@@ -227,9 +1162,54 @@ def main():
     # Test 7: SponsorBlock Service
     required_results["SponsorBlock Service"] = test_sponsorblock_service()
 
-    # Test 8: Creator Discovery
+    # Test 8: Rate Limiter
+    required_results["Rate Limiter"] = test_rate_limiter()
+
+    # Test 9: HTTP Transport
+    required_results["HTTP Transport"] = test_http_transport()
+
+    # Test 10: Video Cache
+    required_results["Video Cache"] = test_video_cache()
+
+    # Test 11: Checkpoint Store
+    required_results["Checkpoint Store"] = test_checkpoint_store()
+
+    # Test 12: Creator Index
+    required_results["Creator Index"] = test_creator_index()
+
+    # Test 13: Discovery Pipeline
+    required_results["Discovery Pipeline"] = test_discovery_pipeline()
+
+    # Test 14: Fast Navigation
+    required_results["Fast Navigation"] = test_fast_navigation()
+
+    # Test 15: Browser Pool
+    required_results["Browser Pool"] = test_browser_pool()
+
+    # Test 16: Brand Code Validation
+    required_results["Brand Code Validation"] = test_validate_brand_codes()
+
+    # Test 17: Transcript Segments
+    required_results["Transcript Segments"] = test_transcript_segments()
+
+    # Test 18: Metrics
+    required_results["Metrics"] = test_metrics()
+
+    # Test 19: Replay
+    required_results["Replay"] = test_replay()
+
+    # Test 20: Creator Discovery
     required_results["Creator Discovery"] = test_creator_discovery()
 
+    # Test 21: Creator Discovery Saves
+    required_results["Creator Discovery Saves"] = test_creator_discovery_saves()
+
+    # Test 22: Creator Discovery Checkpoints
+    required_results["Creator Discovery Checkpoints"] = test_creator_discovery_checkpoints()
+
+    # Test 23: Channel Marks
+    required_results["Channel Marks"] = test_channel_marks()
+
     # Summary
     print("\n" + "=" * 60)
     print("📊 Test Results Summary")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+backrAI Transcript Segments
+Timed transcript representation and sponsor-window code extraction.
+
+A transcript is kept as parallel compact arrays (segment start, duration,
+character offset into the joined text) plus the joined text itself — the
+same string TranscriptService.get_transcript has always returned. That
+lets extraction:
+  - run only over the text said during SponsorBlock sponsor/selfpromo
+    segments (plus padding) instead of a whole 2-hour podcast
+  - report when each code was said (seconds into the video)
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from code_extractor import iter_codes_with_context
+
+# Seconds of transcript kept on each side of a sponsor segment
+# (segment boundaries are crowd-sourced and often clip the read)
+SPONSOR_PADDING_SECONDS = 30.0
+
+
+class TranscriptSegments:
+    """Timed transcript: compact per-segment arrays plus the joined text."""
+
+    __slots__ = ("starts", "durations", "offsets", "text")
+
+    def __init__(
+        self,
+        starts: Iterable[float],
+        durations: Iterable[float],
+        texts: Sequence[str],
+    ):
+        self.starts = array("d", starts)
+        self.durations = array("d", durations)
+        self.offsets = array("q")
+        pos = 0
+        for text in texts:
+            self.offsets.append(pos)
+            pos += len(text) + 1  # joined with single spaces
+        self.text = " ".join(texts)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @classmethod
+    def from_api(cls, items: List[Dict]) -> "TranscriptSegments":
+        """Build from youtube-transcript-api's [{text, start, duration}, ...]."""
+        return cls(
+            (item.get("start", 0.0) for item in items),
+            (item.get("duration", 0.0) for item in items),
+            [item.get("text", "") for item in items],
+        )
+
+    # ------------------------------------------------------------------
+    # Cache serialization (VideoCache stores JSON)
+    # ------------------------------------------------------------------
+    def to_dict(self) -> Dict:
+        ends = list(self.offsets[1:]) + [len(self.text) + 1]
+        return {
+            "start": [round(t, 2) for t in self.starts],
+            "duration": [round(t, 2) for t in self.durations],
+            "text": [self.text[a:b - 1] for a, b in zip(self.offsets, ends)],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TranscriptSegments":
+        return cls(data["start"], data["duration"], data["text"])
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def time_at(self, offset: int) -> Optional[float]:
+        """Start time (seconds) of the segment containing a text offset."""
+        if not self.offsets or not 0 <= offset < len(self.text):
+            return None
+        return self.starts[bisect_right(self.offsets, offset) - 1]
+
+    def window_spans(
+        self,
+        windows: Iterable[Tuple[float, float]],
+        padding: float = SPONSOR_PADDING_SECONDS,
+    ) -> List[Tuple[int, int]]:
+        """
+        Text spans (start, end offsets) of the segments overlapping any
+        (start, end) time window widened by `padding` seconds, merged and
+        in order.
+        """
+        spans = []
+        for window_start, window_end in windows:
+            lo = max(0, bisect_right(self.starts, window_start - padding) - 1)
+            hi = bisect_left(self.starts, window_end + padding)
+            # The segment before lo only counts if it runs into the window
+            if lo < hi and self.starts[lo] + self.durations[lo] < window_start - padding:
+                lo += 1
+            if lo < hi:
+                end = self.offsets[hi] - 1 if hi < len(self.offsets) else len(self.text)
+                spans.append((self.offsets[lo], end))
+
+        merged: List[Tuple[int, int]] = []
+        for start, end in sorted(spans):
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+
+def extract_codes_in_windows(
+    segments: TranscriptSegments,
+    windows: Iterable[Tuple[float, float]],
+    padding: float = SPONSOR_PADDING_SECONDS,
+) -> List[Dict]:
+    """
+    Run code extraction only on transcript text overlapping the windows.
+    Returns extract_codes_with_context() dicts plus "timestamp" (seconds
+    into the video where the code was said), deduplicated by code.
+    """
+    results = []
+    seen = set()
+    for start, end in segments.window_spans(windows, padding):
+        for code_info, offset in iter_codes_with_context(segments.text[start:end]):
+            if code_info["code"] in seen:
+                continue
+            seen.add(code_info["code"])
+            code_info["timestamp"] = segments.time_at(start + offset)
+            results.append(code_info)
+    return results
@@ -3,17 +3,28 @@
 backrAI Transcript Service
 Fetches YouTube video transcripts and metadata WITHOUT a browser.
 
-Primary: youtube-transcript-api (fastest, no API key, no browser)
-Secondary: yt-dlp for metadata (description, channel info — no browser)
+Primary: youtube-transcript-api (fastest, no API key, no browser);
+         timed segments are kept (see transcript_segments.py)
+Secondary: yt-dlp for metadata (description, channel info — no browser);
+           many videos can share one yt-dlp process (get_video_metadata_many)
+
+Optionally backed by a persistent VideoCache (see video_cache.py) so repeat
+runs skip the network for videos already seen.
 """
 
 import json
 import os
+import queue
 import shutil
 import subprocess
 import sys
 import re
-from typing import Optional, Dict, List
+import threading
+import time
+from typing import Iterator, Optional, Dict, List, Set, Tuple
+
+from transcript_segments import TranscriptSegments
+from video_cache import VideoCache, MISS
 
 
 def _find_ytdlp() -> str:
@@ -33,97 +44,336 @@ def _find_ytdlp() -> str:
 # Resolve once at import time
 _YTDLP_BIN = _find_ytdlp()
 
+# yt-dlp stderr fragments that mean "this video will never have metadata"
+# (safe to negative-cache, unlike timeouts or network errors)
+_UNAVAILABLE_MARKERS = (
+    "Video unavailable",
+    "Private video",
+    "This video has been removed",
+    "This video is no longer available",
+)
+
+# "ERROR: [youtube] VIDEO_ID: reason" — lets us pin batch errors to an ID
+_YTDLP_ERROR_RE = re.compile(r"ERROR: \[[^\]]+\] ([A-Za-z0-9_-]{11}):")
+
+# Seconds to wait for the next result from a batched yt-dlp call
+METADATA_ITEM_TIMEOUT = 30
+
 
 class TranscriptService:
     """
     Fetches YouTube video transcripts and metadata without a browser.
-    All methods are static — no initialization, no cleanup needed.
+    All methods are static/class methods — no initialization needed.
+    Call use_cache() once to enable the persistent VideoCache.
     """
 
-    @staticmethod
-    def get_transcript(video_id: str) -> Optional[str]:
+    _cache: Optional[VideoCache] = None
+
+    @classmethod
+    def use_cache(cls, cache: Optional[VideoCache]):
+        """Enable (or disable, with None) the persistent video cache."""
+        cls._cache = cache
+
+    @classmethod
+    def is_cached(cls, video_id: str, field: str) -> bool:
+        """True if `field` ("metadata" / "transcript") can be served without the network."""
+        if cls._cache is None:
+            return False
+        try:
+            return cls._cache.contains(video_id, field)
+        except Exception:
+            return False
+
+    @classmethod
+    def _cache_get(cls, video_id: str, field: str):
+        if cls._cache is None:
+            return MISS
+        try:
+            return cls._cache.get(video_id, field)
+        except Exception:
+            return MISS
+
+    @classmethod
+    def _cache_put(cls, video_id: str, field: str, value):
+        if cls._cache is None:
+            return
+        try:
+            cls._cache.put(video_id, field, value)
+        except Exception as e:
+            print(f"⚠️  Video cache write failed for {video_id}: {e}")
+
+    @classmethod
+    def get_transcript(cls, video_id: str) -> Optional[str]:
         """
         Get full transcript text for a YouTube video.
         Returns concatenated transcript string or None.
 
         Tries English first, falls back to auto-generated, then any language.
         Uses youtube-transcript-api (no browser, no API key).
+        Cached: definitive "no transcript" results are negative-cached.
+        """
+        # Text-only entries written before segments were cached
+        cached = cls._cache_get(video_id, "transcript")
+        if cached is not MISS:
+            return cached
+
+        segments = cls.get_transcript_segments(video_id)
+        return segments.text if segments is not None else None
+
+    @classmethod
+    def get_transcript_segments(cls, video_id: str) -> Optional[TranscriptSegments]:
+        """
+        Get the timed transcript (start/duration/text per caption segment).
+        Same sources and caching rules as get_transcript().
+        """
+        return cls.lookup_transcript_segments(video_id)[0]
+
+    @classmethod
+    def lookup_transcript_segments(
+        cls, video_id: str
+    ) -> Tuple[Optional[TranscriptSegments], bool]:
+        """
+        get_transcript_segments(), plus whether the answer is definitive:
+        (None, False) means the fetch failed transiently and may succeed
+        on a later run. Cached answers are always definitive.
+        """
+        cached = cls._cache_get(video_id, "segments")
+        if cached is not MISS:
+            return (TranscriptSegments.from_dict(cached) if cached else None), True
+
+        segments, definitive = cls._fetch_transcript(video_id)
+        if segments is not None or definitive:
+            cls._cache_put(
+                video_id, "segments", segments.to_dict() if segments is not None else None
+            )
+        return segments, segments is not None or definitive
+
+    @staticmethod
+    def _fetch_transcript(video_id: str) -> Tuple[Optional[TranscriptSegments], bool]:
+        """
+        Fetch a transcript from YouTube.
+        Returns (segments_or_None, definitive) — definitive is True when the
+        video has no usable transcript (as opposed to a transient failure).
         """
         try:
-            from youtube_transcript_api import YouTubeTranscriptApi
+            from youtube_transcript_api import (
+                YouTubeTranscriptApi,
+                NoTranscriptFound,
+                TranscriptsDisabled,
+                VideoUnavailable,
+            )
+        except ImportError:
+            print("⚠️  youtube-transcript-api not installed. Run: pip install youtube-transcript-api")
+            return None, False
 
+        permanent_errors = (NoTranscriptFound, TranscriptsDisabled, VideoUnavailable)
+        definitive = True
+
+        try:
             # Try English (manual or auto-generated)
             try:
                 transcript_list = YouTubeTranscriptApi.get_transcript(
                     video_id, languages=["en"]
                 )
-                return " ".join(
-                    segment["text"] for segment in transcript_list
-                )
-            except Exception:
+                return TranscriptSegments.from_api(transcript_list), True
+            except permanent_errors:
                 pass
+            except Exception:
+                definitive = False
 
             # Try any available language
             try:
                 transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
-                return " ".join(
-                    segment["text"] for segment in transcript_list
-                )
-            except Exception:
+                return TranscriptSegments.from_api(transcript_list), True
+            except permanent_errors:
                 pass
+            except Exception:
+                definitive = False
 
-            return None
+            return None, definitive
 
-        except ImportError:
-            print("⚠️  youtube-transcript-api not installed. Run: pip install youtube-transcript-api")
-            return None
-        except Exception as e:
+        except Exception:
             # Silently return None — caller will handle missing transcript
-            return None
+            return None, False
 
-    @staticmethod
-    def get_video_metadata(video_id: str) -> Optional[Dict]:
+    @classmethod
+    def get_video_metadata(cls, video_id: str) -> Optional[Dict]:
         """
         Get video metadata using yt-dlp (no browser).
         Returns dict with: title, description, channel_id, channel_name,
                           channel_url, upload_date, view_count, duration, tags.
+        Cached: unavailable/private videos are negative-cached.
+        """
+        return cls.get_video_metadata_many([video_id]).get(video_id)
+
+    @classmethod
+    def get_video_metadata_many(
+        cls,
+        video_ids: List[str],
+        item_timeout: float = METADATA_ITEM_TIMEOUT,
+    ) -> Dict[str, Optional[Dict]]:
         """
+        Get metadata for many videos with a single yt-dlp process.
+        Returns {video_id: metadata_dict_or_None} for every requested ID.
+
+        URLs are passed to one `yt-dlp --dump-json --ignore-errors` call and
+        JSON lines are mapped back to IDs as they stream in. If no result
+        arrives within item_timeout seconds, the process is killed, the
+        stalled video is marked as failed and the rest are retried in a
+        fresh process — one slow video never sinks the batch.
+        """
+        results: Dict[str, Optional[Dict]] = {}
+        pending: List[str] = []
+        for video_id in dict.fromkeys(video_ids):
+            cached = cls._cache_get(video_id, "metadata")
+            if cached is not MISS:
+                results[video_id] = cached
+            else:
+                pending.append(video_id)
+
+        while pending:
+            fetched, unavailable, failed, stalled = cls._run_metadata_batch(
+                pending, item_timeout
+            )
+            for video_id, metadata in fetched.items():
+                results[video_id] = metadata
+                cls._cache_put(video_id, "metadata", metadata)
+            for video_id in unavailable:
+                results[video_id] = None
+                cls._cache_put(video_id, "metadata", None)
+
+            done = set(fetched) | unavailable | failed
+            if stalled is None:
+                # Process finished: anything unresolved failed transiently
+                for video_id in pending:
+                    results.setdefault(video_id, None)
+                break
+
+            results[stalled] = None
+            done.add(stalled)
+            for video_id in failed:
+                results.setdefault(video_id, None)
+            pending = [vid for vid in pending if vid not in done]
+
+        return results
+
+    @staticmethod
+    def _parse_metadata(data: Dict) -> Dict:
+        """Map a yt-dlp info dict to our metadata shape."""
+        return {
+            "title": data.get("title", ""),
+            "description": data.get("description", ""),
+            "channel_id": data.get("channel_id", ""),
+            "channel_name": data.get("channel", "") or data.get("uploader", ""),
+            "channel_url": data.get("channel_url", ""),
+            "uploader_id": data.get("uploader_id", ""),
+            "upload_date": data.get("upload_date", ""),
+            "view_count": data.get("view_count", 0),
+            "duration": data.get("duration", 0),
+            "tags": data.get("tags", []),
+        }
+
+    @classmethod
+    def _run_metadata_batch(
+        cls,
+        video_ids: List[str],
+        item_timeout: float,
+    ) -> Tuple[Dict[str, Dict], Set[str], Set[str], Optional[str]]:
+        """
+        Run one yt-dlp process over video_ids (processed in order).
+        Returns (fetched, unavailable, failed, stalled_id):
+          - fetched: {video_id: metadata} for every JSON line received
+          - unavailable: IDs yt-dlp reported as private/removed/unavailable
+          - failed: IDs with any other yt-dlp error (not cached)
+          - stalled_id: the ID being fetched when item_timeout expired, or
+            None if the process ran to completion
+        """
+        fetched: Dict[str, Dict] = {}
+        unavailable: Set[str] = set()
+        failed: Set[str] = set()
+        wanted = set(video_ids)
+
         try:
-            result = subprocess.run(
+            proc = subprocess.Popen(
                 [
                     _YTDLP_BIN,
                     "--dump-json",
                     "--no-download",
                     "--no-warnings",
                     "--no-check-certificates",
-                    f"https://www.youtube.com/watch?v={video_id}",
+                    "--ignore-errors",
+                    *[f"https://www.youtube.com/watch?v={vid}" for vid in video_ids],
                 ],
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=30,
+                bufsize=1,
             )
-            if result.returncode == 0 and result.stdout.strip():
-                data = json.loads(result.stdout)
-                return {
-                    "title": data.get("title", ""),
-                    "description": data.get("description", ""),
-                    "channel_id": data.get("channel_id", ""),
-                    "channel_name": data.get("channel", "") or data.get("uploader", ""),
-                    "channel_url": data.get("channel_url", ""),
-                    "uploader_id": data.get("uploader_id", ""),
-                    "upload_date": data.get("upload_date", ""),
-                    "view_count": data.get("view_count", 0),
-                    "duration": data.get("duration", 0),
-                    "tags": data.get("tags", []),
-                }
-            return None
-        except subprocess.TimeoutExpired:
-            return None
         except FileNotFoundError:
             print("⚠️  yt-dlp not installed. Run: pip install yt-dlp")
-            return None
+            return fetched, unavailable, failed, None
         except Exception:
-            return None
+            return fetched, unavailable, failed, None
+
+        # Drain stdout/stderr on background threads so we can apply a
+        # per-item deadline without blocking on a pipe read.
+        lines: "queue.Queue[Tuple[str, Optional[str]]]" = queue.Queue()
+
+        def _pump(stream, tag):
+            for line in stream:
+                lines.put((tag, line))
+            lines.put((tag, None))
+
+        for stream, tag in ((proc.stdout, "out"), (proc.stderr, "err")):
+            threading.Thread(target=_pump, args=(stream, tag), daemon=True).start()
+
+        open_streams = 2
+        stalled: Optional[str] = None
+        deadline = time.monotonic() + item_timeout
+        try:
+            while open_streams:
+                try:
+                    tag, line = lines.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    # yt-dlp works through URLs in order: the first
+                    # unresolved ID is the one that hung.
+                    resolved = set(fetched) | unavailable | failed
+                    stalled = next(
+                        (vid for vid in video_ids if vid not in resolved), None
+                    )
+                    break
+
+                if line is None:
+                    open_streams -= 1
+                    continue
+
+                if tag == "out":
+                    try:
+                        data = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    video_id = data.get("id", "")
+                    if video_id in wanted:
+                        fetched[video_id] = cls._parse_metadata(data)
+                        deadline = time.monotonic() + item_timeout
+                else:
+                    match = _YTDLP_ERROR_RE.match(line)
+                    if match and match.group(1) in wanted:
+                        video_id = match.group(1)
+                        if any(marker in line for marker in _UNAVAILABLE_MARKERS):
+                            unavailable.add(video_id)
+                        else:
+                            failed.add(video_id)
+                        deadline = time.monotonic() + item_timeout
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                pass
+
+        return fetched, unavailable, failed, stalled
 
     @staticmethod
     def search_videos(query: str, max_results: int = 20) -> List[Dict]:
@@ -180,21 +430,33 @@ class TranscriptService:
         except Exception:
             return []
 
-    @staticmethod
+    @classmethod
     def get_channel_video_ids(
-        channel_url: str, max_videos: int = 50
+        cls, channel_url: str, max_videos: int = 50
     ) -> List[str]:
         """
         Get recent video IDs from a YouTube channel.
         Uses yt-dlp to list channel uploads without downloading.
         """
+        return list(cls.iter_channel_video_ids(channel_url, max_videos=max_videos))
+
+    @staticmethod
+    def iter_channel_video_ids(
+        channel_url: str, max_videos: int = 50, timeout: float = 60
+    ) -> Iterator[str]:
+        """
+        Stream a channel's upload IDs, newest first, as yt-dlp lists them
+        (--flat-playlist --lazy-playlist: one request per listing page, no
+        per-video requests). Stop iterating to stop the listing; yt-dlp is
+        killed when the generator is closed or after `timeout` seconds.
+        """
         # Ensure URL ends with /videos for upload listing
         url = channel_url.rstrip("/")
         if not url.endswith("/videos"):
             url = f"{url}/videos"
 
         try:
-            result = subprocess.run(
+            proc = subprocess.Popen(
                 [
                     _YTDLP_BIN,
                     "--dump-json",
@@ -202,33 +464,40 @@ class TranscriptService:
                     "--no-warnings",
                     "--no-check-certificates",
                     "--flat-playlist",
+                    "--lazy-playlist",
                     "--playlist-end", str(max_videos),
                     url,
                 ],
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
-                timeout=60,
+                bufsize=1,
             )
-            video_ids = []
-            if result.returncode == 0 and result.stdout.strip():
-                for line in result.stdout.strip().split("\n"):
-                    if not line.strip():
-                        continue
-                    try:
-                        data = json.loads(line)
-                        vid = data.get("id", "")
-                        if vid:
-                            video_ids.append(vid)
-                    except json.JSONDecodeError:
-                        continue
-            return video_ids
-        except subprocess.TimeoutExpired:
-            return []
         except FileNotFoundError:
             print("⚠️  yt-dlp not installed. Run: pip install yt-dlp")
-            return []
+            return
         except Exception:
-            return []
+            return
+
+        killer = threading.Timer(timeout, proc.kill)
+        killer.daemon = True
+        killer.start()
+        try:
+            for line in proc.stdout:
+                if not line.strip():
+                    continue
+                try:
+                    vid = json.loads(line).get("id", "")
+                except json.JSONDecodeError:
+                    continue
+                if vid:
+                    yield vid
+        finally:
+            killer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+            proc.stdout.close()
+            proc.wait()
 
     @staticmethod
     def extract_video_id(url: str) -> Optional[str]:
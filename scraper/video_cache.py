@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+backrAI Video Cache
+Persistent on-disk cache for per-video data (yt-dlp metadata, transcripts).
+
+Backed by a single SQLite file so it can be carried between GitHub Actions
+runs with actions/cache. Entries are keyed by (video_id, field):
+  - each field has its own TTL (metadata changes faster than transcripts)
+  - "not available" results are cached too (negative caching) with a
+    shorter TTL, so videos without captions aren't re-requested every run
+  - total payload size is bounded; least-recently-used entries are evicted
+  - hit/miss counters are kept for the run summary
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_PATH = os.getenv(
+    "VIDEO_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "videos.sqlite3"),
+)
+
+DAY = 24 * 60 * 60
+
+# Positive-result TTLs per field (seconds)
+DEFAULT_TTLS = {
+    "metadata": 3 * DAY,      # view counts / descriptions drift
+    "transcript": 90 * DAY,   # captions almost never change once published
+    "segments": 90 * DAY,     # timed transcript (TranscriptSegments.to_dict)
+}
+
+# TTLs for cached "not available" results (seconds)
+DEFAULT_NEGATIVE_TTLS = {
+    "metadata": 1 * DAY,
+    "transcript": 7 * DAY,    # auto-captions can appear a few days after upload
+    "segments": 7 * DAY,
+}
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Returned by get() when there is no usable entry (None is a valid cached value)
+MISS = object()
+
+
+class VideoCache:
+    """
+    SQLite-backed cache keyed by (video_id, field).
+    Thread-safe: one connection guarded by a lock.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttls: Optional[Dict[str, int]] = None,
+        negative_ttls: Optional[Dict[str, int]] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.path = path
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.negative_ttls = {**DEFAULT_NEGATIVE_TTLS, **(negative_ttls or {})}
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS video_cache (
+                video_id    TEXT NOT NULL,
+                field       TEXT NOT NULL,
+                payload     BLOB,
+                is_negative INTEGER NOT NULL DEFAULT 0,
+                size        INTEGER NOT NULL DEFAULT 0,
+                fetched_at  REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (video_id, field)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_video_cache_accessed "
+            "ON video_cache (accessed_at)"
+        )
+        self._conn.commit()
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM video_cache"
+        ).fetchone()[0]
+
+        self.stats = {
+            "hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "writes": 0,
+            "evictions": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def get(self, video_id: str, field: str) -> Any:
+        """
+        Return the cached value, None for a cached "not available" result,
+        or MISS if there is no fresh entry.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, is_negative, fetched_at FROM video_cache "
+                "WHERE video_id = ? AND field = ?",
+                (video_id, field),
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return MISS
+
+            payload, is_negative, fetched_at = row
+            ttl = (self.negative_ttls if is_negative else self.ttls).get(field, 0)
+            if now - fetched_at > ttl:
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return MISS
+
+            self._conn.execute(
+                "UPDATE video_cache SET accessed_at = ? WHERE video_id = ? AND field = ?",
+                (now, video_id, field),
+            )
+            if is_negative:
+                self.stats["negative_hits"] += 1
+                return None
+            self.stats["hits"] += 1
+
+        return json.loads(zlib.decompress(payload))
+
+    def contains(self, video_id: str, field: str) -> bool:
+        """True if a fresh entry exists. Does not touch stats or LRU order."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT is_negative, fetched_at FROM video_cache "
+                "WHERE video_id = ? AND field = ?",
+                (video_id, field),
+            ).fetchone()
+        if row is None:
+            return False
+        is_negative, fetched_at = row
+        ttl = (self.negative_ttls if is_negative else self.ttls).get(field, 0)
+        return time.time() - fetched_at <= ttl
+
+    def put(self, video_id: str, field: str, value: Any):
+        """Store a value. Passing None records a negative ("not available") entry."""
+        now = time.time()
+        if value is None:
+            payload, is_negative = None, 1
+        else:
+            payload = zlib.compress(json.dumps(value).encode("utf-8"))
+            is_negative = 0
+        size = len(payload) if payload else 0
+
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM video_cache WHERE video_id = ? AND field = ?",
+                (video_id, field),
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO video_cache "
+                "(video_id, field, payload, is_negative, size, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (video_id, field, payload, is_negative, size, now, now),
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+            self.stats["writes"] += 1
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def summary(self) -> str:
+        """One-line hit/miss summary for run logs."""
+        s = self.stats
+        return (
+            f"{s['hits']} hits, {s['negative_hits']} negative hits, "
+            f"{s['misses']} misses ({s['expired']} expired), "
+            f"{s['writes']} writes, {s['evictions']} evictions — "
+            f"hit rate {self.hit_rate:.0%}"
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.stats["hits"] + self.stats["negative_hits"] + self.stats["misses"]
+        if not lookups:
+            return 0.0
+        return (self.stats["hits"] + self.stats["negative_hits"]) / lookups
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _evict(self):
+        """Drop least-recently-used entries until we're at 90% of max_bytes."""
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute(
+            "SELECT video_id, field, size FROM video_cache ORDER BY accessed_at ASC"
+        ).fetchall()
+        victims = []
+        freed = 0
+        for video_id, field, size in rows:
+            if self._total_bytes - freed <= target:
+                break
+            victims.append((video_id, field))
+            freed += size
+        self._conn.executemany(
+            "DELETE FROM video_cache WHERE video_id = ? AND field = ?", victims
+        )
+        self._total_bytes -= freed
+        self.stats["evictions"] += len(victims)
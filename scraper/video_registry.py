@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+backrAI Video Registry
+Run-wide record of every video a discovery run has picked up.
+
+Every strategy claims a video before anything is fetched for it:
+
+    if registry.claim(video_id, "search"):
+        ... fetch and process ...
+
+The first claim wins; later claims (the same video found again by channel
+snowball, or re-checked by the SponsorBlock strategy) only add their
+strategy tag, so no video is fetched twice in one run. Tags land on the
+video's single discovery record ("strategies"), as do flags such as
+had_sponsor_segments, whether they arrive before or after the record
+was built. Once the record is saved, release() drops it so the registry
+only holds tags and flags for the rest of the run.
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+
+class VideoRegistry:
+    """Thread-safe video_id → {strategies, flags, discovery} map for one run."""
+
+    def __init__(self):
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.stats = {"videos": 0, "duplicates": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, video_id: str) -> bool:
+        return video_id in self._entries
+
+    def claim(self, video_id: str, strategy: str) -> bool:
+        """
+        Register video_id for strategy. True if this is the first claim
+        this run (the caller should process it); otherwise the strategy
+        is merged onto the existing entry and False is returned.
+        """
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is None:
+                self._entries[video_id] = self._new_entry([strategy])
+                self.stats["videos"] += 1
+                return True
+            self.stats["duplicates"] += 1
+            if strategy not in entry["strategies"]:
+                entry["strategies"].append(strategy)
+            return False
+
+    def flag(self, video_id: str, name: str):
+        """Set a True flag (e.g. had_sponsor_segments) on a claimed video's record."""
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is None:
+                return
+            entry["flags"].add(name)
+            if entry["discovery"] is not None:
+                entry["discovery"][name] = True
+
+    def strategies(self, video_id: str) -> List[str]:
+        with self._lock:
+            entry = self._entries.get(video_id)
+            return list(entry["strategies"]) if entry else []
+
+    def attach(self, video_id: str, discovery: Dict) -> Dict:
+        """
+        Make discovery the video's record: it gets the (live) "strategies"
+        list and every flag set so far. Returns discovery.
+        """
+        with self._lock:
+            entry = self._entries.setdefault(video_id, self._new_entry([]))
+            entry["discovery"] = discovery
+            discovery["strategies"] = entry["strategies"]
+            for name in entry["flags"]:
+                discovery[name] = True
+        return discovery
+
+    def release(self, video_id: str):
+        """
+        Forget a saved video's discovery record, keeping its strategies and
+        flags (so later claims are still deduped). Flags set after this
+        only reach the registry, not the saved record.
+        """
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is not None:
+                entry["discovery"] = None
+
+    def discovery(self, video_id: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(video_id)
+            return entry["discovery"] if entry else None
+
+    @staticmethod
+    def _new_entry(strategies: List[str]) -> Dict:
+        return {"strategies": strategies, "flags": set(), "discovery": None}
+
+    def summary(self) -> str:
+        return (
+            f"{self.stats['videos']} unique videos, "
+            f"{self.stats['duplicates']} repeat finds merged"
+        )
@@ -48,6 +48,7 @@ class YouTubeScraper:
         self._playwright = None
         self.found_codes: Set[str] = set()
         self.transcript_svc = TranscriptService
+        self.nav_metrics = None
 
     # ------------------------------------------------------------------
     # Browser lifecycle (only used for fallback)
@@ -56,6 +57,8 @@ class YouTubeScraper:
         """Initialize Playwright browser (only needed for fallback scraping)."""
         try:
             from playwright.async_api import async_playwright
+            from fast_navigation import NavigationMetrics
+            self.nav_metrics = self.nav_metrics or NavigationMetrics()
             self._playwright = await async_playwright().start()
             self.browser = await self._playwright.chromium.launch(headless=True)
             self.page = await self.browser.new_page()
@@ -77,6 +80,8 @@ class YouTubeScraper:
 
     async def close(self):
         """Close browser and Playwright."""
+        if self.nav_metrics and self.nav_metrics.pages:
+            print(f"Navigation: {self.nav_metrics.summary()}")
         if self.browser:
             try:
                 await self.browser.close()
@@ -223,8 +228,11 @@ class YouTubeScraper:
         search_url = f"https://www.youtube.com/results?search_query={search_query.replace(' ', '+')}"
 
         try:
-            await self.page.goto(search_url, wait_until="networkidle", timeout=30000)
-            await self.page.wait_for_timeout(3000)
+            from fast_navigation import fast_goto
+            await fast_goto(
+                self.page, search_url, wait_for='a[href*="/watch"]',
+                timeout=30000, settle_ms=3000, metrics=self.nav_metrics,
+            )
 
             for _ in range(3):
                 await self.page.evaluate(
@@ -278,10 +286,14 @@ class YouTubeScraper:
             return None
 
         try:
+            from fast_navigation import fast_goto
             page = await self.browser.new_page()
             try:
-                await page.goto(video_url, wait_until="networkidle", timeout=30000)
-                await page.wait_for_timeout(3000)
+                await fast_goto(
+                    page, video_url,
+                    wait_for=["h1.ytd-watch-metadata yt-formatted-string", "h1.title"],
+                    timeout=30000, settle_ms=3000, metrics=self.nav_metrics,
+                )
 
                 # Extract metadata
                 title = await page.evaluate("""